@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+청크 이어 올리기 종단 확인
+로컬 테스트 서버(benchmark_cloud_upload의 PostgREST/Storage 흉내)가 일정 간격으로 연결을 끊는 상황에서
+큰 파일을 청크 단위로 올립니다.
+1. 재시도 없이 올려서 중간에 실패시키고, 서버에 기록된 청크 수 확인
+2. 다시 올려서 기록된 청크는 건너뛰고 남은 청크만 보내는지 확인
+3. 내려받은 파일이 원본과 같은지, 같은 내용을 다시 올리면 청크를 보내지 않는지 확인
+
+사용법: python benchmark_chunked_upload.py [파일크기MB] [청크크기MB] [동시전송수] [끊김간격]
+"""
+
+import os
+import sys
+import shutil
+import hashlib
+import tempfile
+from excel_cloud_processor import ExcelCloudProcessor, describe_upload
+from benchmark_cloud_upload import start_stub_server, reset
+
+def make_large_file(path, size_mb):
+    """합성 큰 파일 생성 (1MB씩 나눠 써서 메모리를 적게 사용)"""
+    with open(path, "wb") as f:
+        for _ in range(size_mb):
+            f.write(os.urandom(1024 * 1024))
+
+def file_sha256(path):
+    """파일 전체 SHA-256"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def main():
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    chunk_mb = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+    drop_every = int(sys.argv[4]) if len(sys.argv) > 4 else 7
+
+    print("=" * 60)
+    print("⏱️ 청크 이어 올리기 종단 확인")
+    print(f"📊 파일 {size_mb}MB, 청크 {chunk_mb}MB, 동시 전송 {workers}개, {drop_every}번째 요청마다 연결 끊김")
+    print("=" * 60)
+
+    folder = tempfile.mkdtemp(prefix="chunked_upload_")
+    server = start_stub_server(latency=0.005, drop_every=drop_every)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        file_path = os.path.join(folder, "대용량.xlsx")
+        make_large_file(file_path, size_mb)
+        options = dict(pool_size=workers, backoff=0.05, transfer_mode="chunked",
+                       chunk_size=chunk_mb * 1024 * 1024, chunk_workers=workers)
+
+        # 1. 재시도 없이 → 끊긴 청크는 실패로 남음
+        fragile = ExcelCloudProcessor(base_url, "benchmark-key", max_retries=0, **options)
+        first = fragile.upload_excel_files([file_path], "benchmark")
+        attempt = (first["uploaded"] + first["failed"])[0]
+        acknowledged = len(server.rows.get("excel_file_chunks", []))
+        print(f"💥 첫 시도 (재시도 없음): {'성공' if first['success'] else '실패'}, "
+              f"청크 {attempt.get('chunks', 0)}개 중 {acknowledged}개 기록됨, 연결 끊김 {server.drops}회")
+
+        # 2. 다시 올리기 (재시도 포함) → 기록된 청크는 건너뜀
+        reset(server)
+        server.drops = 0
+        processor = ExcelCloudProcessor(base_url, "benchmark-key", max_retries=5, **options)
+        resumed = processor.upload_excel_files([file_path], "benchmark")
+        result = (resumed["uploaded"] + resumed["failed"])[0]
+        print(f"🔁 이어 올리기: {describe_upload(resumed)}")
+        print(f"   - 이어 받은 청크 {result.get('chunks_resumed', 0)}개, 새로 보낸 청크 {result.get('chunks_sent', 0)}개, "
+              f"연결 끊김 {server.drops}회")
+
+        # 3. 내려받아 원본과 비교
+        download_path = os.path.join(folder, "downloaded.xlsx")
+        downloaded = processor.download_excel_file(result.get("file_id"), download_path)
+        same = downloaded["success"] and file_sha256(download_path) == file_sha256(file_path)
+
+        # 4. 같은 내용을 다른 프로젝트로 다시 올리기 → Storage로 청크를 보내지 않음
+        reset(server)
+        server.drop_every = 0
+        again = processor.upload_excel_files([file_path], "benchmark-copy")
+        again_result = again["uploaded"][0] if again["uploaded"] else {}
+        print(f"♻️ 같은 내용 다시 올리기: 보낸 청크 {again_result.get('chunks_sent', '-')}개, "
+              f"서버가 받은 데이터 {server.bytes_received / 1024:.1f}KB")
+
+        unique_chunks = len({row["sha256"] for row in server.rows.get("excel_file_chunks", [])})
+        print("-" * 60)
+        print(f"   - 첫 시도는 중간에 실패: {'✅' if not first['success'] and acknowledged else '❌'}")
+        print(f"   - 이어 올리기 성공: {'✅' if resumed['success'] and result.get('chunks_resumed') else '❌'}")
+        print(f"   - 다운로드 일치: {'✅' if same else '❌'}")
+        print(f"   - 같은 내용 청크 재사용: {'✅' if again['success'] and again_result.get('chunks_sent') == 0 else '❌'}")
+        print(f"   - 저장된 청크 객체 {len(server.objects)}개 = 고유 청크 {unique_chunks}개: "
+              f"{'✅' if len(server.objects) == unique_chunks else '❌'}")
+    finally:
+        server.shutdown()
+        shutil.rmtree(folder, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+클라우드 일괄 업로드 성능 비교
+로컬 PostgREST 호환 테스트 서버를 띄우고, 기존 방식(파일마다 새 연결로 하나씩 업로드)과
+연결 풀 + 동시 업로드 방식을 합성 파일로 비교합니다.
+테스트 서버는 요청마다 지연을 주고 일부 요청에 503을 돌려주어 재시도도 함께 확인합니다.
+Storage 객체 API도 흉내 내므로 Base64 방식과 바이너리 방식의 전송량과 속도도 비교합니다.
+
+사용법: python benchmark_cloud_upload.py [파일수] [파일크기KB] [동시업로드수] [지연ms]
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import base64
+import shutil
+import tempfile
+import threading
+import requests
+from urllib.parse import parse_qsl
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from excel_cloud_processor import ExcelCloudProcessor, describe_upload
+
+STORAGE_PREFIX = "/storage/v1/object/"
+
+class StubPostgrestHandler(BaseHTTPRequestHandler):
+    """
+    PostgREST/Storage 일부를 흉내 내는 요청 처리기
+
+    행 추가(on_conflict 덮어쓰기 포함)/수정/조회(eq., in. 필터, order, limit, select)를 지원하고,
+    Storage 객체는 메모리에 보관합니다. drop_every를 주면 그 수의 요청마다 응답 없이 연결을 끊습니다.
+    """
+    protocol_version = "HTTP/1.1"  # 연결 유지 (keep-alive)
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self):
+        """요청 본문을 청크 단위로 읽기"""
+        remaining = int(self.headers.get("Content-Length", 0))
+        chunks = []
+        while remaining:
+            chunk = self.rfile.read(min(remaining, 1024 * 1024))
+            if not chunk:
+                break
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        body = b"".join(chunks)
+        with self.server.lock:
+            self.server.bytes_received += len(body)
+        return body
+
+    def _should_fail(self):
+        """fail_every번째 요청마다 True"""
+        with self.server.lock:
+            self.server.requests += 1
+            return self.server.fail_every and self.server.requests % self.server.fail_every == 0
+
+    def _should_drop(self):
+        """drop_every번째 요청이면 응답 없이 연결을 끊음 (연결 끊김 흉내)"""
+        with self.server.lock:
+            self.server.drop_count += 1
+            drop = self.server.drop_every and self.server.drop_count % self.server.drop_every == 0
+            if drop:
+                self.server.drops += 1
+        if drop:
+            self.close_connection = True
+        return drop
+
+    def _send_rows(self, status, rows):
+        """Prefer: return=minimal이면 본문 없이, 아니면 행 목록으로 응답"""
+        if "return=minimal" in self.headers.get("Prefer", ""):
+            self.send_response(status)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        else:
+            self._send_json(status, rows)
+
+    def _matching_rows(self, table, params):
+        """eq./in. 필터와 order, limit 적용"""
+        rows = self.server.rows.get(table, [])
+        for column, condition in params:
+            if condition.startswith("eq."):
+                rows = [row for row in rows if str(row.get(column)) == condition[3:]]
+            elif condition.startswith("in.("):
+                values = set(condition[4:-1].split(","))
+                rows = [row for row in rows if str(row.get(column)) in values]
+        options = dict(params)
+        if "order" in options:
+            column, _, direction = options["order"].partition(".")
+            rows = sorted(rows, key=lambda row: (row.get(column) is None, row.get(column) or 0),
+                          reverse=direction == "desc")
+        if "limit" in options:
+            rows = rows[:int(options["limit"])]
+        return rows
+
+    def do_POST(self):
+        body = self._read_body()
+        if self._should_drop():
+            return
+        time.sleep(self.server.latency)
+
+        if self._should_fail():
+            self._send_json(503, {"message": "일시적인 서버 오류 (테스트)"})
+            return
+
+        path, _, query = self.path.partition("?")
+        if path.startswith(STORAGE_PREFIX):
+            key = path[len(STORAGE_PREFIX):]
+            with self.server.lock:
+                self.server.objects[key] = body
+            self._send_json(200, {"Key": key})
+            return
+
+        table = path.rsplit("/", 1)[-1]
+        row = json.loads(body or b"{}")
+        conflict = dict(parse_qsl(query)).get("on_conflict")
+        with self.server.lock:
+            rows = self.server.rows.setdefault(table, [])
+            # on_conflict 열이 같은 행은 덮어쓰기 (resolution=merge-duplicates)
+            columns = conflict.split(",") if conflict else []
+            existing = next((item for item in rows
+                             if columns and all(item.get(column) == row.get(column) for column in columns)), None)
+            if existing is not None:
+                existing.update(row)
+                row = existing
+            else:
+                row = dict(row, id=str(uuid.uuid4()), created_at=f"{time.time():.6f}")
+                rows.append(row)
+        self._send_rows(201, [row])
+
+    def do_PATCH(self):
+        changes = json.loads(self._read_body() or b"{}")
+        if self._should_drop():
+            return
+        time.sleep(self.server.latency)
+
+        path, _, query = self.path.partition("?")
+        with self.server.lock:
+            rows = self._matching_rows(path.rsplit("/", 1)[-1], parse_qsl(query))
+            for row in rows:
+                row.update(changes)
+        self._send_rows(200, rows)
+
+    def do_GET(self):
+        time.sleep(self.server.latency)
+        path, _, query = self.path.partition("?")
+
+        if self._should_drop():
+            return
+        if path.startswith(STORAGE_PREFIX):
+            data = self.server.objects.get(path[len(STORAGE_PREFIX):])
+            if data is None:
+                self._send_json(404, {"message": "객체 없음"})
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+            return
+
+        params = parse_qsl(query)
+        with self.server.lock:
+            rows = self._matching_rows(path.rsplit("/", 1)[-1], params)
+        columns = dict(params).get("select", "*")
+        if columns != "*":
+            rows = [{column: row.get(column) for column in columns.split(",")} for row in rows]
+        self._send_json(200, rows)
+
+    def do_DELETE(self):
+        body = json.loads(self._read_body() or b"{}")
+        bucket = self.path.split("?")[0][len(STORAGE_PREFIX):]
+        with self.server.lock:
+            for prefix in body.get("prefixes", []):
+                self.server.objects.pop(f"{bucket}/{prefix}", None)
+        self._send_json(200, [])
+
+def start_stub_server(latency=0.02, fail_every=0, drop_every=0):
+    """
+    테스트 서버 시작 (백그라운드 스레드)
+
+    Args:
+        latency: 요청마다 줄 지연 (초, 네트워크 왕복 흉내)
+        fail_every: 이 수의 요청마다 한 번 503 응답 (0이면 실패 없음)
+        drop_every: 이 수의 요청마다 한 번 응답 없이 연결 끊기 (0이면 끊김 없음)
+
+    Returns:
+        ThreadingHTTPServer: 종료할 때 shutdown() 호출
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubPostgrestHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.fail_every = fail_every
+    server.drop_every = drop_every
+    server.drop_count = 0
+    server.drops = 0
+    server.lock = threading.Lock()
+    server.connections = 0
+    server.requests = 0
+    server.bytes_received = 0
+    server.rows = {}
+    server.objects = {}
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def make_files(folder, count, size_kb):
+    """합성 업로드 파일 생성"""
+    for index in range(count):
+        with open(os.path.join(folder, f"file{index:03d}.xlsx"), "wb") as f:
+            f.write(os.urandom(size_kb * 1024))
+
+def legacy_upload(base_url, headers, folder):
+    """기존 방식: 파일마다 requests.post (매번 새 연결), 하나씩 순서대로"""
+    start = time.perf_counter()
+    total_bytes = 0
+    for filename in sorted(os.listdir(folder)):
+        with open(os.path.join(folder, filename), "rb") as f:
+            data = f.read()
+        requests.post(f"{base_url}/rest/v1/excel_files", headers=headers, json={
+            "filename": filename,
+            "file_size": len(data),
+            "file_data": base64.b64encode(data).decode("utf-8"),
+            "project_name": "benchmark",
+            "status": "uploaded"
+        }, timeout=60)
+        total_bytes += len(data)
+    return time.perf_counter() - start, total_bytes
+
+def reset(server):
+    """서버 카운터 초기화"""
+    with server.lock:
+        server.connections = 0
+        server.requests = 0
+        server.bytes_received = 0
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    size_kb = int(sys.argv[2]) if len(sys.argv) > 2 else 256
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+    latency_ms = int(sys.argv[4]) if len(sys.argv) > 4 else 20
+
+    print("=" * 60)
+    print("⏱️ 클라우드 일괄 업로드 성능 비교")
+    print(f"📊 파일 {count}개 x {size_kb}KB, 동시 업로드 {workers}개, 요청 지연 {latency_ms}ms")
+    print("=" * 60)
+
+    folder = tempfile.mkdtemp(prefix="upload_benchmark_")
+    server = start_stub_server(latency=latency_ms / 1000)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        make_files(folder, count, size_kb)
+        processor = ExcelCloudProcessor(base_url, "benchmark-key", pool_size=workers, backoff=0.05)
+
+        old_seconds, old_bytes = legacy_upload(base_url, processor.headers, folder)
+        old_connections = server.connections
+        print(f"🐢 기존 방식: {old_seconds:.2f}초 → {count / old_seconds:.1f}개/초, "
+              f"{old_bytes / (1024 * 1024) / old_seconds:.1f}MB/s (연결 {old_connections}회)")
+
+        reset(server)
+        summary = processor.upload_folder(folder, "benchmark", max_workers=workers)
+        base64_bytes = server.bytes_received
+        print(f"🚀 연결 풀 + 동시 업로드: {describe_upload(summary)} (연결 {server.connections}회)")
+
+        # 바이너리 방식: Storage에 원본 바이트를 스트리밍, 행에는 메타데이터만
+        reset(server)
+        binary = ExcelCloudProcessor(base_url, "benchmark-key", pool_size=workers, backoff=0.05,
+                                     transfer_mode="binary")
+        binary_summary = binary.upload_folder(folder, "benchmark", max_workers=workers)
+        binary_bytes = server.bytes_received
+        print(f"📦 바이너리 전송: {describe_upload(binary_summary)}")
+        print(f"   - 보낸 데이터: Base64 {base64_bytes / (1024 * 1024):.1f}MB → "
+              f"바이너리 {binary_bytes / (1024 * 1024):.1f}MB")
+
+        # 내려받아 원본과 비교 (청크 스트리밍 + 해시 검증)
+        first = binary_summary["uploaded"][0]
+        download_path = os.path.join(folder, "downloaded.bin")
+        downloaded = binary.download_excel_file(first["file_id"], download_path)
+        with open(os.path.join(folder, first["filename"]), "rb") as original, open(download_path, "rb") as copy:
+            same_download = downloaded["success"] and original.read() == copy.read()
+        os.remove(download_path)
+
+        # 10번째 요청마다 503 → 백오프 후 재시도로 모두 성공해야 함
+        reset(server)
+        server.fail_every = 10
+        retried = processor.upload_folder(folder, "benchmark", max_workers=workers)
+        server.fail_every = 0
+        print(f"🔁 일시 오류 포함: {describe_upload(retried)}")
+
+        print("-" * 60)
+        print(f"📈 속도 향상: {old_seconds / summary['seconds']:,.1f}배")
+        print(f"   - 모두 업로드: {'✅' if summary['success'] and len(summary['uploaded']) == count else '❌'}")
+        print(f"   - 재시도 후 모두 업로드: {'✅' if retried['success'] and retried['retries'] else '❌'}")
+        print(f"   - 바이너리 모두 업로드: {'✅' if binary_summary['success'] else '❌'}")
+        print(f"   - 바이너리 다운로드 일치: {'✅' if same_download else '❌'}")
+    finally:
+        server.shutdown()
+        shutil.rmtree(folder, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
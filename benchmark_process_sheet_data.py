@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+process_sheet_data 취소 행 분리 성능 비교
+기존 iterrows 방식과 열 단위 불리언 마스크 방식을 합성 시트로 비교합니다.
+
+사용법: python benchmark_process_sheet_data.py [행수] [반복횟수]
+"""
+
+import sys
+import time
+import numpy as np
+import pandas as pd
+from sheet_transforms import split_cancelled_rows
+
+def legacy_split_cancelled_rows(df):
+    """기존 방식: 행마다 모든 열을 문자열로 바꿔 '취소' 확인 후 행 목록으로 재구성"""
+    cancelled_rows = []
+    normal_rows = []
+
+    for idx, row in df.iterrows():
+        is_cancelled = False
+        for col in df.columns:
+            if pd.notna(row[col]) and '취소' in str(row[col]):
+                is_cancelled = True
+                break
+
+        if is_cancelled:
+            cancelled_rows.append(row)
+        else:
+            normal_rows.append(row)
+
+    df_normal = pd.DataFrame(normal_rows).reset_index(drop=True) if normal_rows else pd.DataFrame()
+    df_cancelled = pd.DataFrame(cancelled_rows).reset_index(drop=True) if cancelled_rows else pd.DataFrame()
+
+    return df_normal, df_cancelled
+
+def make_synthetic_sheet(rows, seed=42):
+    """수강 신청 시트와 비슷한 합성 데이터 생성 (약 5% 취소 행)"""
+    rng = np.random.default_rng(seed)
+
+    remarks = np.array(["", "메모", "연락 필요", "취소", "신청 취소", None], dtype=object)
+    remark_weights = [0.55, 0.2, 0.15, 0.03, 0.02, 0.05]
+
+    df = pd.DataFrame({
+        '상태': rng.choice(np.array(["Applied", "대기1", "대기12", "승인"], dtype=object), rows),
+        '지역': rng.choice(np.array(["서울", "부산", "대구", "광주"], dtype=object), rows),
+        '학교분류': rng.choice(np.array(["초", "중", "고"], dtype=object), rows),
+        '학교명': rng.choice(np.array([f"학교{i}" for i in range(200)], dtype=object), rows),
+        '학년': rng.integers(1, 7, rows),
+        '반': rng.integers(1, 11, rows),
+        '번호': rng.integers(1, 36, rows),
+        '이름': np.array([f"학생{i}" for i in range(rows)], dtype=object),
+        '연락처': np.array([f"010-{i % 10000:04d}-{(i * 7) % 10000:04d}" for i in range(rows)], dtype=object),
+        '점수': rng.normal(80, 10, rows),
+        '비고': rng.choice(remarks, rows, p=remark_weights),
+    })
+    return df
+
+def time_call(func, df, repeat):
+    """가장 빠른 실행 시간(초)과 마지막 결과 반환"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(df)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def same_split(legacy, vectorized):
+    """두 방식의 분리 결과가 같은 행을 담고 있는지 확인 (열 타입 차이는 무시)"""
+    for old, new in zip(legacy, vectorized):
+        if old.shape != new.shape:
+            return False
+        if not old.astype(str).equals(new.astype(str)):
+            return False
+    return True
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    print("=" * 60)
+    print("⏱️ 취소 행 분리 성능 비교")
+    print(f"📊 합성 시트: {rows:,}행, 반복 {repeat}회 (최솟값 기준)")
+    print("=" * 60)
+
+    df = make_synthetic_sheet(rows)
+
+    new_seconds, new_result = time_call(split_cancelled_rows, df, repeat)
+    print(f"🚀 불리언 마스크: {new_seconds:.3f}초")
+
+    # 기존 방식은 느리므로 한 번만 실행
+    old_seconds, old_result = time_call(legacy_split_cancelled_rows, df, 1)
+    print(f"🐢 기존 iterrows: {old_seconds:.3f}초")
+
+    print("-" * 60)
+    print(f"📈 속도 향상: {old_seconds / new_seconds:,.1f}배")
+    print(f"   - 일반 행: {len(new_result[0]):,}행, 취소 행: {len(new_result[1]):,}행")
+    print(f"   - 결과 일치: {'✅' if same_split(old_result, new_result) else '❌'}")
+    print(f"   - 열 타입 유지: {'✅' if (new_result[0].dtypes == df.dtypes).all() else '❌'}")
+
+if __name__ == "__main__":
+    main()
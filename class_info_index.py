@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+수업정보 조회 인덱스
+수업정보 파일을 실행마다 한 번만 훑어서 교육명 → 수업정보 레코드 인덱스와
+열 매핑을 미리 만들어 두고, 시트마다 사전 조회로 수업정보를 채웁니다.
+"""
+
+import re
+import unicodedata
+import pandas as pd
+
+# 통합 결과에 추가되는 수업정보 열
+CLASS_INFO_COLUMNS = ['수업일', '시작', '종료', '주강사', '보조강사', '장소', '모니터']
+
+# 수업정보 파일에서 각 열로 인정하는 열 이름 후보 (앞쪽일수록 우선)
+CLASS_INFO_COLUMN_CANDIDATES = {
+    '수업일': ['수업일', '날짜', 'date', '일자'],
+    '시작': ['시작', '시작시간', 'start', '시작시간'],
+    '종료': ['종료', '종료시간', 'end', '끝'],
+    '주강사': ['주강사', '강사', 'instructor', '선생님'],
+    '보조강사': ['보조강사', '보조', 'assistant'],
+    '장소': ['장소', '위치', 'location', '교실'],
+    '모니터': ['모니터', 'monitor', '관리자']
+}
+
+def normalize_education_name(value):
+    """교육명 비교용 정규화 (전각 문자, 앞뒤/연속 공백 정리)"""
+    text = unicodedata.normalize('NFKC', str(value))
+    return re.sub(r'\s+', ' ', text).strip()
+
+def resolve_column_sources(columns):
+    """
+    수업정보 열마다 값을 가져올 원본 열 위치 목록을 우선순위대로 결정
+
+    후보 이름마다 그 이름을 포함하는 첫 번째 열을 사용하며,
+    앞 후보의 값이 비어 있으면 다음 후보 열의 값을 사용합니다.
+
+    Returns:
+        dict: {수업정보 열: [원본 열 위치, ...]}
+    """
+    column_texts = [str(col).lower() for col in columns]
+    sources = {}
+
+    for target_col, candidates in CLASS_INFO_COLUMN_CANDIDATES.items():
+        positions = []
+        for candidate in candidates:
+            for position, column_text in enumerate(column_texts):
+                if candidate in column_text:
+                    if position not in positions:
+                        positions.append(position)
+                    break
+        sources[target_col] = positions
+
+    return sources
+
+class ClassInfoIndex:
+    def __init__(self, class_info_df):
+        """
+        수업정보 인덱스 생성 (실행마다 한 번)
+
+        Args:
+            class_info_df: 수업정보 파일 데이터프레임
+        """
+        self.columns = list(class_info_df.columns)
+        self.column_sources = resolve_column_sources(self.columns)
+        self.records = self._build_records(class_info_df)
+        self.name_index = self._build_name_index(class_info_df)
+        self._lookup_cache = {}
+
+    def _build_records(self, class_info_df):
+        """행마다 수업정보 열 값을 미리 계산"""
+        records = []
+        for row in class_info_df.itertuples(index=False, name=None):
+            record = {}
+            for target_col, positions in self.column_sources.items():
+                if not positions:
+                    continue
+                value = ""
+                for position in positions:
+                    cell = row[position]
+                    value = str(cell) if pd.notna(cell) else ""
+                    if value:
+                        break
+                record[target_col] = value
+            records.append(record)
+        return records
+
+    def _build_name_index(self, class_info_df):
+        """정규화된 셀 문자열 → 해당 문자열이 있는 행 위치 목록"""
+        name_index = {}
+        for position in range(class_info_df.shape[1]):
+            column = class_info_df.iloc[:, position]
+            for row_position, cell in enumerate(column):
+                if pd.isna(cell):
+                    continue
+                key = normalize_education_name(cell)
+                if not key:
+                    continue
+                name_index.setdefault(key, set()).add(row_position)
+
+        return {key: sorted(rows) for key, rows in name_index.items()}
+
+    def describe_mapping(self):
+        """열 매핑 요약 문자열"""
+        parts = []
+        for target_col, positions in self.column_sources.items():
+            if positions:
+                sources = ", ".join(str(self.columns[position]) for position in positions)
+                parts.append(f"{target_col}←{sources}")
+            else:
+                parts.append(f"{target_col}←없음")
+        return " | ".join(parts)
+
+    def _find_rows(self, key):
+        """정확히 일치하는 교육명 우선, 없으면 교육명을 포함하는 셀로 검색"""
+        rows = self.name_index.get(key)
+        if rows:
+            return rows, 'exact'
+
+        rows = set()
+        for text, text_rows in self.name_index.items():
+            if key in text:
+                rows.update(text_rows)
+        return sorted(rows), 'partial'
+
+    def lookup(self, education_name):
+        """
+        교육명으로 수업정보 조회
+
+        같은 교육명은 첫 조회 결과를 재사용하며, 애매하거나 찾지 못한 경우의 안내 메시지는
+        교육명마다 첫 조회에서만 반환합니다.
+
+        Returns:
+            tuple: (수업정보 값 dict 또는 None, 안내 메시지 또는 None)
+        """
+        key = normalize_education_name(education_name)
+        if key in self._lookup_cache:
+            return self._lookup_cache[key], None
+
+        rows, match_type = self._find_rows(key) if key else ([], 'exact')
+        message = None
+
+        if not rows:
+            values = None
+            message = f"⚠️ 수업정보 없음: {education_name}"
+        else:
+            values = self.records[rows[0]]
+            if len(rows) > 1:
+                message = (f"⚠️ 수업정보 중복 일치: {education_name} "
+                           f"({len(rows)}개 행, 첫 번째 행 {rows[0] + 2}행 사용)")
+            elif match_type == 'partial':
+                message = f"ℹ️ 수업정보 부분 일치: {education_name} ({rows[0] + 2}행 사용)"
+
+        self._lookup_cache[key] = values
+        return values, message
@@ -96,7 +96,8 @@ if not config:
 # 클라이언트 초기화
 @st.cache_resource
 def get_processor():
-    return ExcelCloudProcessor(config["supabase_url"], config["supabase_key"])
+    return ExcelCloudProcessor(config["supabase_url"], config["supabase_key"],
+                               transfer_mode=config.get("transfer_mode", "base64"))
 
 processor = get_processor()
 
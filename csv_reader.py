@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CSV 읽기
+파일 앞부분 표본으로 인코딩(utf-8-sig/utf-8/cp949)을 판별하고 (euc-kr 파일은 상위 인코딩인 cp949로 읽음),
+pyarrow가 있으면 멀티스레드 pyarrow 엔진으로 읽습니다.
+대용량 파일은 일정 행 수 단위의 청크로 나눠 읽을 수 있습니다.
+"""
+
+import codecs
+import pandas as pd
+
+try:
+    import pyarrow.csv  # pandas pyarrow 엔진에 필요
+    PYARROW_CSV_AVAILABLE = True
+except ImportError:
+    PYARROW_CSV_AVAILABLE = False
+
+# 판별 순서 (BOM이 있으면 utf-8-sig, cp949는 euc-kr을 포함하는 상위 인코딩)
+CSV_ENCODINGS = ['utf-8-sig', 'utf-8', 'cp949']
+
+# 인코딩 판별에 사용하는 표본 크기 (바이트)
+SAMPLE_BYTES = 1024 * 1024
+
+# 청크 읽기 시 청크당 최대 행 수
+DEFAULT_CSV_CHUNK_ROWS = 100000
+
+# 이 크기 이상인 CSV는 청크 단위 읽기 권장 (바이트)
+CSV_CHUNK_THRESHOLD_BYTES = 200 * 1024 * 1024
+
+def _read_sample(source, size=SAMPLE_BYTES):
+    """파일 앞부분 표본 (파일 객체는 읽기 위치를 처음으로 되돌림)"""
+    if hasattr(source, 'read'):
+        source.seek(0)
+        sample = source.read(size)
+        source.seek(0)
+        return sample if isinstance(sample, bytes) else sample.encode('utf-8')
+    with open(source, 'rb') as f:
+        return f.read(size)
+
+def _decodes(sample, encoding):
+    """표본이 해당 인코딩으로 해석되는지 (표본 끝에서 잘린 멀티바이트 문자는 허용)"""
+    for cut in range(4):
+        try:
+            sample[:len(sample) - cut].decode(encoding)
+            return True
+        except UnicodeDecodeError as e:
+            # 잘린 문자 때문이 아니라 중간에서 실패하면 다른 인코딩
+            if e.start < len(sample) - 4:
+                return False
+    return False
+
+def detect_encoding(source, sample_bytes=SAMPLE_BYTES):
+    """
+    CSV 인코딩 판별
+
+    Args:
+        source: 파일 경로 또는 파일 객체
+        sample_bytes: 판별에 사용할 앞부분 바이트 수
+
+    Returns:
+        str: CSV_ENCODINGS 중 하나
+    """
+    sample = _read_sample(source, sample_bytes)
+
+    if sample.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+
+    for encoding in CSV_ENCODINGS[1:]:
+        if _decodes(sample, encoding):
+            return encoding
+
+    raise Exception("CSV 인코딩을 판별할 수 없습니다 (utf-8/cp949 아님)")
+
+def _fallback_encodings(encoding):
+    """표본 이후에서 해석 오류가 날 때 다시 시도할 인코딩 (표본이 영문뿐인 한글 파일 대비)"""
+    return [encoding] + [candidate for candidate in ('cp949',) if candidate != encoding]
+
+def _has_undecoded_bytes(df):
+    """문자열로 해석되지 못한 bytes 열이 있는지 (pyarrow 엔진은 잘못된 utf-8을 bytes로 남김)"""
+    for position in range(df.shape[1]):
+        column = df.iloc[:, position]
+        if column.dtype == object and pd.api.types.infer_dtype(column, skipna=True) in ('bytes', 'mixed'):
+            if column.map(lambda value: isinstance(value, bytes)).any():
+                return True
+    return False
+
+def _rewind(source):
+    if hasattr(source, 'seek'):
+        source.seek(0)
+
+def read_csv_file(source, header=0, encoding=None):
+    """
+    CSV 파일 전체 읽기
+
+    pyarrow가 있으면 pyarrow 엔진(멀티스레드)으로 읽고, 지원하지 않는 파일이면 기본 엔진으로 읽습니다.
+
+    Args:
+        source: 파일 경로 또는 파일 객체
+        header: 헤더 행 번호 (None이면 헤더 없이 읽기)
+        encoding: 인코딩 (None이면 판별)
+
+    Returns:
+        tuple: (데이터프레임, 사용한 인코딩, 사용한 엔진)
+    """
+    encoding = encoding or detect_encoding(source)
+    last_error = None
+
+    for candidate in _fallback_encodings(encoding):
+        engines = ['pyarrow', 'c'] if PYARROW_CSV_AVAILABLE else ['c']
+        for engine in engines:
+            _rewind(source)
+            try:
+                df = pd.read_csv(source, encoding=candidate, header=header, engine=engine)
+                if candidate.startswith('utf-8') and _has_undecoded_bytes(df):
+                    raise UnicodeDecodeError(candidate, b'', 0, 1, "표본 이후에 utf-8이 아닌 문자")
+                return df, candidate, engine
+            except UnicodeDecodeError as e:
+                last_error = e
+                break
+            except Exception as e:
+                # pyarrow 엔진이 처리하지 못하는 형식(따옴표 안 줄바꿈 등)은 기본 엔진으로 재시도
+                last_error = e
+                if engine == engines[-1]:
+                    raise
+
+    raise Exception(f"CSV 읽기 실패: {last_error}")
+
+def iter_csv_chunks(source, chunk_size=DEFAULT_CSV_CHUNK_ROWS, header=0, encoding=None, on_restart=None):
+    """
+    CSV 파일을 청크 단위로 읽기 (파일 크기와 관계없이 메모리 사용량 일정)
+
+    인코딩은 앞부분 표본으로 판별하므로, 표본 이후에서 해석 오류가 나면 cp949로 처음부터 다시 읽습니다.
+    이미 청크를 내보낸 뒤라면 on_restart(새 인코딩)를 먼저 호출하므로 호출한 쪽에서 받은 청크를 버려야 합니다
+    (on_restart가 없으면 다시 읽지 않고 오류를 그대로 발생).
+
+    Args:
+        source: 파일 경로 또는 파일 객체
+        chunk_size: 청크당 최대 행 수
+        header: 헤더 행 번호 (None이면 헤더 없이 읽기)
+        encoding: 인코딩 (None이면 판별)
+        on_restart: 처음부터 다시 읽기 전에 호출할 함수 (새 인코딩)
+
+    Yields:
+        DataFrame: 최대 chunk_size 행의 데이터프레임
+    """
+    encoding = encoding or detect_encoding(source)
+    candidates = _fallback_encodings(encoding)
+
+    for index, candidate in enumerate(candidates):
+        _rewind(source)
+        yielded = False
+        try:
+            with pd.read_csv(source, encoding=candidate, header=header, chunksize=chunk_size) as reader:
+                for chunk in reader:
+                    yielded = True
+                    yield chunk
+            return
+        except UnicodeDecodeError:
+            if index == len(candidates) - 1 or (yielded and on_restart is None):
+                raise
+            if yielded:
+                on_restart(candidates[index + 1])
+
+def should_chunk_csv(file_size):
+    """파일 크기 기준 청크 읽기 사용 여부"""
+    return file_size is not None and file_size >= CSV_CHUNK_THRESHOLD_BYTES
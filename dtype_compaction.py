@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+열 타입 압축
+통합된 데이터의 열을 더 작은 타입으로 바꿔 메모리를 줄이고 정렬/그룹화를 빠르게 합니다.
+- 상태/지역/학교명처럼 값이 반복되는 문자열 → category (범주는 가나다순이라 정렬 결과가 같음)
+- 결측값 때문에 실수로 읽힌 학년/반/번호 같은 정수 → 가장 작은 nullable 정수 (Int8, Int16 ...)
+- 나머지 문자열 → pyarrow 문자열 (pyarrow가 있을 때)
+"""
+
+import numpy as np
+import pandas as pd
+from frame_cleaning import text_kind
+
+try:
+    import pyarrow  # pyarrow 문자열 타입에 필요
+    PYARROW_STRING_AVAILABLE = True
+except ImportError:
+    PYARROW_STRING_AVAILABLE = False
+
+# category로 바꾸는 최소 행 수 (작은 표는 이득이 거의 없음)
+CATEGORY_MIN_ROWS = 100
+
+# 고유값 수 / 행 수가 이 비율 이하인 문자열 열만 category로 변환
+CATEGORY_MAX_RATIO = 0.5
+
+# 작은 것부터 시도하는 nullable 정수 타입
+NULLABLE_INT_DTYPES = ['Int8', 'Int16', 'Int32', 'Int64']
+
+def _pyarrow_string_dtype():
+    """결측값을 NaN으로 쓰는 pyarrow 문자열 타입 (pandas 기본 str 타입과 같음)"""
+    try:
+        return pd.StringDtype('pyarrow', na_value=np.nan)
+    except TypeError:
+        # na_value 인자가 없는 구버전 pandas
+        return pd.StringDtype('pyarrow')
+
+STRING_DTYPE = _pyarrow_string_dtype() if PYARROW_STRING_AVAILABLE else None
+
+def _smallest_int_dtype(minimum, maximum):
+    """값 범위를 담을 수 있는 가장 작은 nullable 정수 타입 (없으면 None)"""
+    for dtype in NULLABLE_INT_DTYPES:
+        info = np.iinfo(dtype.lower())
+        if info.min <= minimum and maximum <= info.max:
+            return dtype
+    return None
+
+def _compact_numeric(column):
+    """정수 값만 있는 실수/정수 열을 가장 작은 nullable 정수로 변환 (변환하지 않으면 None)"""
+    if column.dtype == object:
+        # 헤더 없이 읽은 시트는 숫자만 있는 열도 object로 남음
+        if pd.api.types.infer_dtype(column, skipna=True) not in ('integer', 'floating', 'mixed-integer-float'):
+            return None
+        column = pd.to_numeric(column)
+    if pd.api.types.is_bool_dtype(column.dtype) or not pd.api.types.is_numeric_dtype(column.dtype):
+        return None
+
+    values = column.to_numpy(dtype='float64', na_value=np.nan)
+    present = values[~np.isnan(values)]
+    if present.size == 0:
+        return None
+    if pd.api.types.is_float_dtype(column.dtype) and not np.array_equal(present, np.floor(present)):
+        return None
+
+    dtype = _smallest_int_dtype(present.min(), present.max())
+    if dtype is None or dtype == str(column.dtype):
+        return None
+    return column.astype(dtype)
+
+def _compact_text(column, rows, categorize, max_ratio):
+    """문자열 열을 category 또는 pyarrow 문자열로 변환 (변환하지 않으면 None)"""
+    if text_kind(column) != 'string':
+        return None
+
+    if categorize:
+        # 한 번의 해시 패스로 고유값 수 확인과 category 생성을 함께 처리 (범주는 정렬된 순서)
+        codes, uniques = pd.factorize(column, sort=True, use_na_sentinel=True)
+        if len(uniques) <= rows * max_ratio:
+            categorical = pd.Categorical.from_codes(codes, categories=uniques)
+            return pd.Series(categorical, index=column.index, name=column.name)
+
+    if STRING_DTYPE is not None and column.dtype == object:
+        return column.astype(STRING_DTYPE)
+    return None
+
+def compact_dtypes(df, categorize=True, max_ratio=CATEGORY_MAX_RATIO, min_rows=CATEGORY_MIN_ROWS):
+    """
+    열 타입 압축
+
+    Args:
+        df: 대상 데이터프레임 (수정하지 않음)
+        categorize: 값이 반복되는 문자열 열을 category로 변환할지 여부
+        max_ratio: category 변환 기준 (고유값 수 / 행 수 상한)
+        min_rows: category 변환을 시도할 최소 행 수
+
+    Returns:
+        tuple: (압축된 데이터프레임, 열별 보고 목록)
+               보고 항목은 column, dtype_before, dtype_after, bytes_before, bytes_after
+    """
+    rows = len(df)
+    categorize = categorize and rows >= min_rows
+    result = df.copy(deep=False)
+    report = []
+
+    for position in range(df.shape[1]):
+        column = df.iloc[:, position]
+        compacted = _compact_numeric(column)
+        if compacted is None:
+            compacted = _compact_text(column, rows, categorize, max_ratio)
+        if compacted is None:
+            continue
+
+        bytes_before = int(column.memory_usage(index=False, deep=True))
+        bytes_after = int(compacted.memory_usage(index=False, deep=True))
+        if bytes_after >= bytes_before:
+            continue
+
+        result.isetitem(position, compacted)
+        report.append({
+            'column': str(column.name),
+            'dtype_before': str(column.dtype),
+            'dtype_after': str(compacted.dtype),
+            'bytes_before': bytes_before,
+            'bytes_after': bytes_after
+        })
+
+    return result, report
+
+def _format_bytes(size):
+    """바이트 수를 읽기 쉬운 문자열로 변환"""
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):.1f}MB"
+    return f"{size / 1024:.1f}KB"
+
+def describe_compaction(report):
+    """압축 결과 요약 문자열 (예: '열 4개 압축, 12.0MB → 3.1MB')"""
+    if not report:
+        return "압축할 열 없음"
+    before = sum(item['bytes_before'] for item in report)
+    after = sum(item['bytes_after'] for item in report)
+    return f"열 {len(report)}개 압축, {_format_bytes(before)} → {_format_bytes(after)}"
+
+def compaction_lines(report):
+    """열별 압축 결과 문자열 목록 (예: '상태: object → category, 1.2MB 절약')"""
+    return [
+        f"{item['column']}: {item['dtype_before']} → {item['dtype_after']}, "
+        f"{_format_bytes(item['bytes_before'] - item['bytes_after'])} 절약"
+        for item in report
+    ]
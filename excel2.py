@@ -7,6 +7,12 @@ from datetime import datetime
 import openpyxl
 from openpyxl.styles import Font, PatternFill, Alignment
 from openpyxl.utils.dataframe import dataframe_to_rows
+import argparse
+import multiprocessing
+from excel_output import write_styled_sheets
+from merge_cache import IncrementalMergeCache
+from workbook_reader import read_sheet_auto, describe_read
+from sheet_transforms import split_cancelled_rows, rewrite_waitlist_status, build_grade_class_number
 
 def extract_education_name_and_date(df):
     """
@@ -95,34 +101,8 @@ def process_sheet_data(df):
     if df.empty:
         return None
     
-    # 취소 행과 일반 행 분리
-    cancelled_rows = []
-    normal_rows = []
-    
-    for idx, row in df.iterrows():
-        # 비고 열에서 '취소' 확인
-        is_cancelled = False
-        for col in df.columns:
-            if pd.notna(row[col]) and '취소' in str(row[col]):
-                is_cancelled = True
-                break
-        
-        if is_cancelled:
-            cancelled_rows.append(row)
-        else:
-            normal_rows.append(row)
-    
-    # 일반 행들로 DataFrame 재구성
-    if normal_rows:
-        df_normal = pd.DataFrame(normal_rows).reset_index(drop=True)
-    else:
-        df_normal = pd.DataFrame()
-    
-    # 취소 행들로 DataFrame 재구성
-    if cancelled_rows:
-        df_cancelled = pd.DataFrame(cancelled_rows).reset_index(drop=True)
-    else:
-        df_cancelled = pd.DataFrame()
+    # 취소 행과 일반 행 분리 (열 단위 불리언 마스크, 원본 열 타입 유지)
+    df_normal, df_cancelled = split_cancelled_rows(df)
     
     return df_normal, df_cancelled
 
@@ -143,17 +123,8 @@ def update_waitlist_status(df):
     if status_col is None:
         return df
     
-    # 대기 상태 업데이트
-    for idx, row in df.iterrows():
-        status_value = str(row[status_col]) if pd.notna(row[status_col]) else ""
-        
-        # 대기 번호 추출
-        wait_match = re.search(r'대기(\d+)', status_value)
-        if wait_match:
-            wait_num = wait_match.group(1)
-            df.at[idx, status_col] = f"Applied (대기{wait_num})"
-    
-    return df
+    # 대기 상태 업데이트 (대기N → Applied (대기N), 벡터 연산)
+    return rewrite_waitlist_status(df, status_col)
 
 def sort_dataframe(df):
     """
@@ -217,17 +188,8 @@ def add_grade_class_number_column(df):
             number_col = col
     
     if grade_col and class_col and number_col:
-        # 조합 열 생성
-        def combine_grade_class_number(row):
-            grade = str(row[grade_col]) if pd.notna(row[grade_col]) else ""
-            class_num = str(row[class_col]) if pd.notna(row[class_col]) else ""
-            number = str(row[number_col]) if pd.notna(row[number_col]) else ""
-            
-            if grade and class_num and number:
-                return f"{grade}-{class_num}-{number}"
-            return ""
-        
-        df['학년-반-번호'] = df.apply(combine_grade_class_number, axis=1)
+        # 조합 열 생성 (세 값이 모두 있을 때만, 벡터 연산)
+        df['학년-반-번호'] = build_grade_class_number(df, grade_col, class_col, number_col)
     
     return df
 
@@ -256,24 +218,17 @@ def add_class_info_columns(df, class_info_df):
     
     return df
 
-def apply_strikethrough_to_cancelled_rows(worksheet, cancelled_df, start_row):
-    """
-    취소된 행에 취소선 적용
-    """
-    if cancelled_df.empty:
-        return
-    
-    for idx, row in cancelled_df.iterrows():
-        row_num = start_row + idx + 1
-        for col_idx, value in enumerate(row, 1):
-            cell = worksheet.cell(row=row_num, column=col_idx)
-            cell.font = Font(strike=True)
-            cell.value = value
-
-def merge_excel_files_advanced(folder_path, class_info_file=None, output_file='통합파일_고급.xlsx'):
+def merge_excel_files_advanced(folder_path, class_info_file=None, output_file='통합파일_고급.xlsx', workers=1,
+                               constant_memory=False, incremental=False):
     """
     고급 엑셀 파일 통합
+    workers가 2 이상이면 파일별 처리 단계를 프로세스 풀에서 병렬 실행
+    constant_memory면 결과를 쓰기 전용 모드로 저장 (메모리 일정)
+    incremental이면 바뀌지 않은 파일은 이전 처리 결과를 재사용하고 결과 파일만 다시 생성
     """
+    # parallel_merge가 이 모듈의 처리 함수를 가져다 쓰므로 순환 임포트를 피해 함수 안에서 임포트
+    from parallel_merge import run_file_stages
+    
     try:
         # 엑셀 파일들 찾기
         excel_files = []
@@ -296,93 +251,46 @@ def merge_excel_files_advanced(folder_path, class_info_file=None, output_file='
         class_info_df = pd.DataFrame()
         if class_info_file and os.path.exists(class_info_file):
             try:
-                class_info_df = pd.read_excel(class_info_file)
-                print(f"📋 수업 정보 파일 로드: {class_info_file}")
+                class_info_df = read_sheet_auto(class_info_file)
+                print(f"📋 수업 정보 파일 로드: {class_info_file} ({describe_read(class_info_df)})")
             except Exception as e:
                 print(f"⚠️ 수업 정보 파일 읽기 실패: {e}")
         
         # 교육명별로 그룹화하여 처리
         education_groups = {}
         
-        for file_path in excel_files:
-            try:
-                filename = os.path.basename(file_path)
-                print(f"\n📄 처리 중: {filename}")
-                
-                # 엑셀 파일의 모든 시트 읽기
-                excel_data = pd.ExcelFile(file_path)
-                
-                for sheet_name in excel_data.sheet_names:
-                    try:
-                        # 시트 읽기
-                        df = pd.read_excel(file_path, sheet_name=sheet_name)
-                        
-                        # 빈 시트 건너뛰기
-                        if df.empty:
-                            print(f"  ⚠️ 빈 시트: {sheet_name}")
-                            continue
-                        
-                        # 교육명과 날짜 추출
-                        education_name, date_str, time_str = extract_education_name_and_date(df)
-                        
-                        if not education_name:
-                            print(f"  ⚠️ 교육명을 찾을 수 없음: {sheet_name}")
-                            continue
-                        
-                        # 시트 데이터 처리
-                        result = process_sheet_data(df)
-                        if result is None:
-                            print(f"  ⚠️ 처리할 데이터가 없음: {sheet_name}")
-                            continue
-                        
-                        df_normal, df_cancelled = result
-                        
-                        if df_normal.empty:
-                            print(f"  ⚠️ 유효한 데이터가 없음: {sheet_name}")
-                            continue
-                        
-                        # 대기 학생 상태 업데이트
-                        df_normal = update_waitlist_status(df_normal)
-                        
-                        # 정렬
-                        df_normal = sort_dataframe(df_normal)
-                        
-                        # 학년-반-번호 열 추가
-                        df_normal = add_grade_class_number_column(df_normal)
-                        
-                        # 수업 정보 열 추가
-                        df_normal = add_class_info_columns(df_normal, class_info_df)
-                        
-                        # 시트명 생성
-                        if date_str and time_str:
-                            sheet_name_new = f"{education_name}_{date_str}_{time_str}"
-                        elif date_str:
-                            sheet_name_new = f"{education_name}_{date_str}"
-                        else:
-                            sheet_name_new = education_name
-                        
-                        sheet_name_new = clean_sheet_name(sheet_name_new)
-                        
-                        # 교육명별로 그룹화
-                        if education_name not in education_groups:
-                            education_groups[education_name] = []
-                        
-                        education_groups[education_name].append({
-                            'sheet_name': sheet_name_new,
-                            'data': df_normal,
-                            'cancelled_data': df_cancelled,
-                            'date_str': date_str,
-                            'time_str': time_str,
-                            'original_file': filename
-                        })
-                        
-                        print(f"  ✅ {sheet_name} → {sheet_name_new} ({len(df_normal):,}행)")
-                        
-                    except Exception as e:
-                        print(f"  ❌ 시트 처리 오류: {sheet_name} - {e}")
-                
-            except Exception as e:
-                print(f"  ❌ 파일 처리 오류: {filename} - {e}")
+        if workers > 1:
+            print(f"⚙️ 병렬 처리: {workers}개 프로세스")
+        
+        cache = IncrementalMergeCache(folder_path) if incremental else None
+        
+        # 파일별 처리 단계 (병렬 실행 시에도 결과는 파일 순서대로 도착)
+        for file_result in run_file_stages(excel_files, workers=workers, header=0, cache=cache):
+            print(f"\n📄 처리 중: {file_result['filename']}")
+            for message in file_result['messages']:
+                print(message)
+            
+            for sheet_info in file_result['sheets']:
+                try:
+                    education_name = sheet_info['education_name']
+                    
+                    # 수업 정보 열 추가
+                    sheet_info['data'] = add_class_info_columns(sheet_info['data'], class_info_df)
+                    
+                    # 교육명별로 그룹화
+                    if education_name not in education_groups:
+                        education_groups[education_name] = []
+                    
+                    education_groups[education_name].append(sheet_info)
+                    
+                    print(f"  ✅ {sheet_info['source_sheet']} → {sheet_info['sheet_name']} ({len(sheet_info['data']):,}행)")
+                    
+                except Exception as e:
+                    print(f"  ❌ 시트 처리 오류: {sheet_info['source_sheet']} - {e}")
+        
+        if cache is not None:
+            cache.save()
+            print(f"\n♻️ 증분 통합: {cache.describe()}")
         
         # 각 교육명별로 최신 버전만 선택하고 통합
         final_sheets = {}
@@ -411,33 +319,9 @@ def merge_excel_files_advanced(folder_path, class_info_file=None, output_file='
                             sheet_info['sheet_name'] = f"{sheet_info['sheet_name']}*{i-1}"
                         final_sheets[sheet_info['sheet_name']] = sheet_info
         
-        # 엑셀 파일 생성
-        with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-            for sheet_name, sheet_info in final_sheets.items():
-                # 일반 데이터 저장
-                sheet_info['data'].to_excel(writer, sheet_name=sheet_name, index=False)
-                
-                # 취소된 데이터가 있으면 추가
-                if not sheet_info['cancelled_data'].empty:
-                    # 취소된 데이터를 맨 아래에 추가
-                    combined_data = pd.concat([
-                        sheet_info['data'],
-                        sheet_info['cancelled_data']
-                    ], ignore_index=True)
-                    
-                    # 다시 저장
-                    combined_data.to_excel(writer, sheet_name=sheet_name, index=False)
-        
-        # 취소선 적용을 위해 openpyxl로 다시 열어서 스타일 적용
-        wb = openpyxl.load_workbook(output_path)
-        
-        for sheet_name, sheet_info in final_sheets.items():
-            if not sheet_info['cancelled_data'].empty:
-                ws = wb[sheet_name]
-                normal_rows = len(sheet_info['data'])
-                apply_strikethrough_to_cancelled_rows(ws, sheet_info['cancelled_data'], normal_rows)
-        
-        wb.save(output_path)
+        # 엑셀 파일 생성 (한 번에 기록하면서 취소 행에 취소선 적용)
+        sheets = [dict(sheet_info, sheet_name=sheet_name) for sheet_name, sheet_info in final_sheets.items()]
+        write_styled_sheets(output_path, sheets, constant_memory=constant_memory)
         
         print(f"\n✅ 통합 완료!")
         print(f"📊 처리 결과:")
@@ -450,8 +334,21 @@ def merge_excel_files_advanced(folder_path, class_info_file=None, output_file='
         print(f"❌ 프로그램 오류: {e}")
         return False
 
+def parse_args():
+    """명령행 인자 처리"""
+    parser = argparse.ArgumentParser(description="고급 엑셀 파일 통합기")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="파일별 처리에 사용할 프로세스 수 (기본값: 1, 순차 처리)")
+    parser.add_argument("--constant-memory", action="store_true",
+                        help="결과 파일을 쓰기 전용 모드로 저장 (대용량 결과의 메모리 사용량 일정)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="바뀌지 않은 파일은 이전 처리 결과를 재사용 (작업 폴더의 .통합캐시)")
+    return parser.parse_args()
+
 def main():
     """메인 실행 함수"""
+    args = parse_args()
+    
     try:
         # 프로그램 헤더
         print("=" * 70)
@@ -474,7 +371,9 @@ def main():
             print("⚠️ 수업 정보 파일을 찾을 수 없습니다. (파일명에 '수업정보'가 포함된 xlsx 파일)")
         
         # 파일 통합 실행
-        success = merge_excel_files_advanced(current_dir, class_info_file)
+        success = merge_excel_files_advanced(current_dir, class_info_file, workers=args.workers,
+                                             constant_memory=args.constant_memory,
+                                             incremental=args.incremental)
         
         if success:
             print(f"\n🎉 작업 완료!")
@@ -502,4 +401,6 @@ def main():
         input("\n✨ Enter 키를 눌러 프로그램을 종료하세요...")
 
 if __name__ == "__main__":
+    # 실행파일(PyInstaller)에서 병렬 처리 프로세스를 띄우기 위해 필요
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
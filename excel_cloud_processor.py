@@ -7,79 +7,636 @@ Supabase PostgreSQL을 활용한 안전한 Excel 파일 처리
 
 import os
 import json
+import glob
+import time
+import uuid
+import random
 import base64
+import hashlib
+import mimetypes
+import threading
+from urllib.parse import quote
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 import io
 import zipfile
 
+# 일괄 업로드 기본 동시 업로드 수 (연결 풀 크기)
+DEFAULT_UPLOAD_WORKERS = 4
+
+# 요청 시간 제한 (초)
+DEFAULT_TIMEOUT = 60
+
+# 다시 시도하는 응답 코드 (요청 과다, 서버 일시 오류)
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# 일괄 업로드 대상 확장자
+UPLOAD_PATTERNS = ['*.xlsx', '*.xls']
+
+# 파일 전송 방식: base64(행의 file_data 열에 Base64 문자열), binary(Storage에 원본 바이트, 행에는 메타데이터만),
+# chunked(내용 해시로 이름 붙인 청크를 병렬 업로드, 청크 목록은 excel_file_chunks 표, 중단 후 이어 올리기)
+TRANSFER_MODES = ('base64', 'binary', 'chunked')
+
+# binary 방식에서 파일을 저장하는 Storage 버킷 (supabase_migration_binary_storage.sql에서 생성)
+STORAGE_BUCKET = 'excel-files'
+
+# 스트리밍 업로드/다운로드 청크 크기
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+# chunked 방식의 청크 크기 (청크 하나가 한 번의 요청)
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+# 이미 있는 청크를 한 번에 조회할 해시 수 (URL 길이 제한)
+CHUNK_LOOKUP_BATCH = 100
+
+class HashingReader:
+    """
+    파일을 청크 단위로 보내면서 SHA-256을 함께 계산하는 읽기 객체
+
+    requests에 본문으로 넘기면 파일 전체를 메모리에 올리지 않고 청크 단위로 전송합니다.
+    재시도할 때 처음으로 되감으면 해시도 다시 계산합니다.
+    """
+
+    def __init__(self, file, size, chunk_size=STREAM_CHUNK_SIZE):
+        self.file = file
+        self.size = size
+        self.chunk_size = chunk_size
+        self._digest = hashlib.sha256()
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        for chunk in iter(lambda: self.read(self.chunk_size), b''):
+            yield chunk
+
+    def read(self, size=-1):
+        chunk = self.file.read(self.chunk_size if size is None or size < 0 else size)
+        self._digest.update(chunk)
+        return chunk
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if (offset, whence) != (0, os.SEEK_SET):
+            raise ValueError("처음으로만 되감을 수 있습니다")
+        self._digest = hashlib.sha256()
+        return self.file.seek(0)
+
+    def hexdigest(self):
+        return self._digest.hexdigest()
+
+def _chunk_object_path(sha256):
+    """청크의 Storage 경로 (내용 해시가 이름이므로 같은 내용은 한 번만 저장)"""
+    return f"chunks/{sha256[:2]}/{sha256}"
+
+def file_chunks(file_path, chunk_size=UPLOAD_CHUNK_SIZE):
+    """
+    파일을 청크로 나눠 청크별 해시 계산 (한 번에 청크 하나만 메모리에 올림)
+
+    Returns:
+        tuple: (청크 목록 [{index, offset, size, sha256}], 파일 전체 SHA-256)
+    """
+    chunks = []
+    whole = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for index, data in enumerate(iter(lambda: f.read(chunk_size), b'')):
+            whole.update(data)
+            chunks.append({"index": index, "offset": index * chunk_size, "size": len(data),
+                           "sha256": hashlib.sha256(data).hexdigest()})
+    return chunks, whole.hexdigest()
+
+def _content_type(filename):
+    """파일 확장자에 맞는 Content-Type"""
+    return mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+def _retry_after_seconds(response):
+    """Retry-After 헤더의 대기 시간 (초 단위 값만 사용, 없으면 None)"""
+    value = response.headers.get("Retry-After")
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+def describe_upload(summary):
+    """일괄 업로드 결과 요약 문자열 (예: '파일 20개 업로드, 24.0MB, 3.2초 → 6.3개/초, 7.5MB/s')"""
+    text = (f"파일 {len(summary['uploaded'])}개 업로드, {summary['bytes'] / (1024 * 1024):.1f}MB, "
+            f"{summary['seconds']:.1f}초 → {summary['files_per_second']:.1f}개/초, "
+            f"{summary['mb_per_second']:.1f}MB/s")
+    if summary['failed']:
+        text += f", 실패 {len(summary['failed'])}개"
+    if summary['retries']:
+        text += f", 재시도 {summary['retries']}회"
+    chunks_sent = sum(result.get("chunks_sent", 0) for result in summary['uploaded'] + summary['failed'])
+    chunks_skipped = sum(result.get("chunks_skipped", 0) for result in summary['uploaded'] + summary['failed'])
+    if chunks_sent or chunks_skipped:
+        text += f", 청크 전송 {chunks_sent}개/건너뜀 {chunks_skipped}개"
+    return text
+
 class ExcelCloudProcessor:
-    def __init__(self, supabase_url, supabase_key):
+    def __init__(self, supabase_url, supabase_key, pool_size=DEFAULT_UPLOAD_WORKERS, max_retries=3,
+                 backoff=0.5, timeout=DEFAULT_TIMEOUT, transfer_mode='base64', storage_bucket=STORAGE_BUCKET,
+                 chunk_size=UPLOAD_CHUNK_SIZE, chunk_workers=None):
         """
         Supabase 클라이언트 초기화
         
+        요청은 하나의 세션으로 보내므로 연결(TLS 포함)을 매번 새로 맺지 않고 재사용합니다.
+        
         Args:
             supabase_url: Supabase 프로젝트 URL
             supabase_key: Supabase API 키
+            pool_size: 유지할 연결 수 (일괄 업로드의 기본 동시 업로드 수)
+            max_retries: 연결 오류/429/5xx 응답 시 다시 시도할 횟수
+            backoff: 첫 재시도 대기 시간 (초, 재시도마다 두 배)
+            timeout: 요청 시간 제한 (초)
+            transfer_mode: 'base64'(행에 Base64 문자열 저장),
+                           'binary'(Storage에 원본 바이트를 스트리밍, 행에는 메타데이터만 저장) 또는
+                           'chunked'(청크 단위 병렬 업로드, 중단된 업로드는 이어서 진행)
+            storage_bucket: binary/chunked 방식에서 사용할 Storage 버킷
+            chunk_size: chunked 방식의 청크 크기 (바이트)
+            chunk_workers: chunked 방식에서 파일 하나의 청크를 동시에 보낼 수 (기본값: pool_size)
         """
-        self.supabase_url = supabase_url
+        if transfer_mode not in TRANSFER_MODES:
+            raise ValueError(f"지원하지 않는 전송 방식: {transfer_mode} (가능: {', '.join(TRANSFER_MODES)})")
+        self.supabase_url = supabase_url.rstrip('/')
         self.supabase_key = supabase_key
         self.headers = {
             "apikey": supabase_key,
             "Authorization": f"Bearer {supabase_key}",
-            "Content-Type": "application/json"
+            "Content-Type": "application/json",
+            # 추가한 행을 응답으로 받기 (업로드/처리 요청의 id 확인에 필요)
+            "Prefer": "return=representation"
         }
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.transfer_mode = transfer_mode
+        self.storage_bucket = storage_bucket
+        self.chunk_size = chunk_size
+        self.chunk_workers = chunk_workers or pool_size
+        self.retries = 0
+        self._retry_lock = threading.Lock()
         
-    def upload_excel_file(self, file_path, project_name="default"):
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.pool_size = 0
+        self._mount_pool(pool_size)
+    
+    def _mount_pool(self, pool_size):
+        """연결 풀 크기 설정 (동시 요청 수만큼 연결을 유지)"""
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.pool_size = pool_size
+    
+    def _request(self, method, path, **kwargs):
         """
-        Excel 파일을 클라우드에 업로드
+        REST 요청 (연결 오류와 429/5xx 응답은 지수 백오프로 다시 시도)
         
-        Args:
-            file_path: 업로드할 Excel 파일 경로
-            project_name: 프로젝트 이름
+        응답을 받지 못한 시간 초과는 서버에 이미 반영되었을 수 있으므로 다시 시도하지 않습니다.
+        파일 본문(data)은 시도마다 처음으로 되감아 다시 보냅니다.
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        url = f"{self.supabase_url}{path}"
+        body = kwargs.get('data')
+        
+        for attempt in range(self.max_retries + 1):
+            if hasattr(body, 'seek'):
+                body.seek(0)
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.exceptions.ConnectionError:
+                if attempt == self.max_retries:
+                    raise
+                delay = None
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or attempt == self.max_retries:
+                    return response
+                delay = _retry_after_seconds(response)
+                # 스트리밍 응답은 연결을 풀에 돌려주고 다시 시도
+                response.close()
             
+            if delay is None:
+                # 여러 업로드가 같은 순간에 다시 몰리지 않도록 약간의 흔들림 추가
+                delay = self.backoff * (2 ** attempt) * random.uniform(1.0, 1.5)
+            with self._retry_lock:
+                self.retries += 1
+            time.sleep(delay)
+    
+    def _upload(self, file_path, project_name):
+        """
+        파일 하나 업로드 (출력 없음)
+        
         Returns:
-            dict: 업로드 결과 (file_id, status)
+            dict: success, filename, file_size와 file_id/data 또는 error
         """
+        if self.transfer_mode == 'binary':
+            return self._upload_binary(file_path, project_name)
+        if self.transfer_mode == 'chunked':
+            return self._upload_chunked(file_path, project_name)
+        
+        filename = os.path.basename(file_path)
         try:
             # 파일 읽기
             with open(file_path, 'rb') as f:
                 file_data = f.read()
             
-            # Base64 인코딩
-            file_base64 = base64.b64encode(file_data).decode('utf-8')
-            
-            # 파일 정보
+            # 파일 정보 (Base64 인코딩)
             file_info = {
-                "filename": os.path.basename(file_path),
+                "filename": filename,
                 "file_size": len(file_data),
-                "file_data": file_base64,
+                "file_data": base64.b64encode(file_data).decode('utf-8'),
                 "project_name": project_name,
                 "upload_time": datetime.now().isoformat(),
                 "status": "uploaded"
             }
             
             # Supabase에 업로드
-            response = requests.post(
-                f"{self.supabase_url}/rest/v1/excel_files",
-                headers=self.headers,
-                json=file_info
-            )
+            response = self._request("POST", "/rest/v1/excel_files", json=file_info)
             
             if response.status_code == 201:
                 result = response.json()
-                print(f"✅ 파일 업로드 성공: {file_info['filename']}")
-                print(f"📁 파일 ID: {result[0]['id']}")
-                return {"success": True, "file_id": result[0]['id'], "data": result[0]}
-            else:
-                print(f"❌ 업로드 실패: {response.text}")
+                return {"success": True, "filename": filename, "file_size": len(file_data),
+                        "file_id": result[0]['id'], "data": result[0]}
+            return {"success": False, "filename": filename, "file_size": len(file_data), "error": response.text}
+            
+        except Exception as e:
+            return {"success": False, "filename": filename, "file_size": 0, "error": str(e)}
+    
+    def _object_url(self, bucket, object_path):
+        return f"/storage/v1/object/{bucket}/{object_path}"
+    
+    def _upload_binary(self, file_path, project_name):
+        """
+        파일 하나를 Storage에 원본 바이트로 스트리밍 업로드한 뒤 메타데이터 행 추가 (출력 없음)
+        
+        Base64/JSON 변환이 없어 전송량이 약 25% 줄고, 파일 전체를 메모리에 올리지 않습니다.
+        메타데이터 행 추가에 실패하면 올린 객체를 지웁니다.
+        """
+        filename = os.path.basename(file_path)
+        file_size = 0
+        try:
+            file_size = os.path.getsize(file_path)
+            # 한글 파일명은 Storage 키로 쓸 수 없으므로 키는 무작위 이름, 원래 이름은 행에 보관
+            extension = os.path.splitext(filename)[1].lower()
+            object_path = f"uploads/{datetime.now():%Y%m%d}/{uuid.uuid4().hex}{extension}"
+            
+            with open(file_path, 'rb') as f:
+                reader = HashingReader(f, file_size)
+                response = self._request(
+                    "POST", self._object_url(self.storage_bucket, object_path), data=reader,
+                    # 연결이 끊겨 다시 보낼 때 이미 올라간 객체와 충돌하지 않도록 덮어쓰기 허용
+                    headers={"Content-Type": _content_type(filename), "x-upsert": "true"}
+                )
+            if response.status_code not in (200, 201):
+                return {"success": False, "filename": filename, "file_size": file_size,
+                        "error": f"Storage 업로드 실패: {response.text}"}
+            
+            file_info = {
+                "filename": filename,
+                "file_size": file_size,
+                "file_data": None,
+                "storage_bucket": self.storage_bucket,
+                "storage_path": object_path,
+                "content_sha256": reader.hexdigest(),
+                "project_name": project_name,
+                "upload_time": datetime.now().isoformat(),
+                "status": "uploaded"
+            }
+            response = self._request("POST", "/rest/v1/excel_files", json=file_info)
+            
+            if response.status_code == 201:
+                result = response.json()
+                return {"success": True, "filename": filename, "file_size": file_size,
+                        "file_id": result[0]['id'], "data": result[0]}
+            
+            self._delete_object(self.storage_bucket, object_path)
+            return {"success": False, "filename": filename, "file_size": file_size, "error": response.text}
+            
+        except Exception as e:
+            return {"success": False, "filename": filename, "file_size": file_size, "error": str(e)}
+    
+    def _find_resumable_upload(self, project_name, content_sha256):
+        """같은 내용의 끝나지 않은 업로드 행 조회 (없으면 None)"""
+        response = self._request("GET", f"/rest/v1/excel_files?content_sha256=eq.{content_sha256}"
+                                        f"&project_name=eq.{quote(project_name, safe='')}"
+                                        f"&status=eq.uploading&select=*&order=created_at.desc&limit=1")
+        if response.status_code != 200:
+            return None
+        rows = response.json()
+        return rows[0] if rows else None
+    
+    def _acknowledged_chunks(self, file_id):
+        """서버가 받았다고 기록한 청크 {순번: 해시}"""
+        response = self._request("GET", f"/rest/v1/excel_file_chunks?file_id=eq.{file_id}&select=chunk_index,sha256")
+        if response.status_code != 200:
+            raise RuntimeError(f"청크 목록 조회 실패: {response.text}")
+        return {row["chunk_index"]: row["sha256"] for row in response.json()}
+    
+    def _stored_chunk_hashes(self, hashes):
+        """다른 업로드로 이미 Storage에 있는 청크 해시 (청크 목록 표에서 조회)"""
+        stored = set()
+        hashes = sorted(set(hashes))
+        for start in range(0, len(hashes), CHUNK_LOOKUP_BATCH):
+            batch = ",".join(hashes[start:start + CHUNK_LOOKUP_BATCH])
+            response = self._request("GET", f"/rest/v1/excel_file_chunks?sha256=in.({batch})&select=sha256")
+            if response.status_code == 200:
+                stored.update(row["sha256"] for row in response.json())
+        return stored
+    
+    def _send_chunk(self, file_path, file_id, chunk, upload_data):
+        """
+        청크 하나 전송 후 청크 목록 표에 기록 (기록되면 서버가 받은 것으로 봄)
+        
+        upload_data가 False면 이미 Storage에 있는 청크이므로 목록에만 기록합니다.
+        """
+        if upload_data:
+            with open(file_path, 'rb') as f:
+                f.seek(chunk["offset"])
+                data = f.read(chunk["size"])
+            if hashlib.sha256(data).hexdigest() != chunk["sha256"]:
+                raise RuntimeError("업로드 중 파일 내용이 바뀌었습니다")
+            
+            # 같은 내용은 같은 경로이므로 다시 보내도 덮어쓰기만 됨
+            response = self._request("POST", self._object_url(self.storage_bucket, _chunk_object_path(chunk["sha256"])),
+                                     data=data, headers={"Content-Type": "application/octet-stream", "x-upsert": "true"})
+            if response.status_code not in (200, 201):
+                raise RuntimeError(f"청크 {chunk['index']} 업로드 실패: {response.text}")
+        
+        response = self._request(
+            "POST", "/rest/v1/excel_file_chunks?on_conflict=file_id,chunk_index",
+            json={"file_id": file_id, "chunk_index": chunk["index"], "sha256": chunk["sha256"], "size": chunk["size"]},
+            headers={"Prefer": "resolution=merge-duplicates,return=minimal"}
+        )
+        if response.status_code not in (200, 201, 204):
+            raise RuntimeError(f"청크 {chunk['index']} 기록 실패: {response.text}")
+    
+    def _upload_chunked(self, file_path, project_name):
+        """
+        파일 하나를 청크 단위로 업로드 (출력 없음)
+        
+        청크는 내용 해시를 이름으로 Storage에 저장하고, 파일 행(status='uploading')과
+        청크 목록 표(excel_file_chunks)에 순번별 해시를 기록합니다.
+        같은 파일을 다시 올리면 기록된 청크는 건너뛰고 남은 청크만 보낸 뒤 행을 'uploaded'로 바꿉니다.
+        """
+        filename = os.path.basename(file_path)
+        file_size = 0
+        try:
+            file_size = os.path.getsize(file_path)
+            chunks, content_sha256 = file_chunks(file_path, self.chunk_size)
+            
+            row = self._find_resumable_upload(project_name, content_sha256)
+            if row is None or row.get("chunk_size") != self.chunk_size:
+                file_info = {
+                    "filename": filename,
+                    "file_size": file_size,
+                    "file_data": None,
+                    "storage_bucket": self.storage_bucket,
+                    "content_sha256": content_sha256,
+                    "chunk_size": self.chunk_size,
+                    "chunk_count": len(chunks),
+                    "project_name": project_name,
+                    "upload_time": datetime.now().isoformat(),
+                    "status": "uploading"
+                }
+                response = self._request("POST", "/rest/v1/excel_files", json=file_info)
+                if response.status_code != 201:
+                    return {"success": False, "filename": filename, "file_size": file_size, "error": response.text}
+                row = response.json()[0]
+            file_id = row["id"]
+            
+            # 이어 올리기: 같은 순번에 같은 해시가 기록된 청크는 건너뜀
+            acknowledged = self._acknowledged_chunks(file_id)
+            pending = [chunk for chunk in chunks if acknowledged.get(chunk["index"]) != chunk["sha256"]]
+            stored = self._stored_chunk_hashes(chunk["sha256"] for chunk in pending)
+            
+            sent = 0
+            errors = []
+            with ThreadPoolExecutor(max_workers=max(1, self.chunk_workers)) as executor:
+                futures = {executor.submit(self._send_chunk, file_path, file_id, chunk, chunk["sha256"] not in stored): chunk
+                           for chunk in pending}
+                for future in as_completed(futures):
+                    try:
+                        future.result()
+                    except Exception as e:
+                        errors.append(str(e))
+                        continue
+                    if futures[future]["sha256"] not in stored:
+                        sent += 1
+            
+            reused = sum(1 for chunk in pending if chunk["sha256"] in stored)
+            chunk_info = {"file_id": file_id, "chunks": len(chunks), "chunks_resumed": len(chunks) - len(pending),
+                          "chunks_sent": sent, "chunks_skipped": len(chunks) - len(pending) + reused}
+            if errors:
+                return dict(chunk_info, success=False, filename=filename, file_size=file_size,
+                            error=f"청크 {len(errors)}개 실패 (다시 올리면 이어서 진행): {errors[0]}")
+            
+            response = self._request("PATCH", f"/rest/v1/excel_files?id=eq.{file_id}",
+                                     json={"status": "uploaded", "upload_time": datetime.now().isoformat()})
+            if response.status_code not in (200, 204):
+                return dict(chunk_info, success=False, filename=filename, file_size=file_size, error=response.text)
+            data = response.json()[0] if response.status_code == 200 and response.content else row
+            return dict(chunk_info, success=True, filename=filename, file_size=file_size, data=data)
+            
+        except Exception as e:
+            return {"success": False, "filename": filename, "file_size": file_size, "error": str(e)}
+    
+    def _delete_object(self, bucket, object_path):
+        """Storage 객체 삭제 (실패해도 무시)"""
+        try:
+            self._request("DELETE", f"/storage/v1/object/{bucket}", json={"prefixes": [object_path]})
+        except requests.exceptions.RequestException:
+            pass
+    
+    def _download_object(self, bucket, object_path, output_path, expected_sha256=None):
+        """Storage 객체 하나를 청크 단위로 내려받아 저장"""
+        return self._download_objects(bucket, [(object_path, None)], output_path, expected_sha256)
+    
+    def _download_objects(self, bucket, parts, output_path, expected_sha256=None):
+        """
+        Storage 객체들을 순서대로 청크 단위로 내려받아 한 파일로 저장
+        
+        임시 파일에 받은 뒤 해시가 맞으면 저장 경로로 교체하므로 중간에 실패해도 기존 파일이 깨지지 않습니다.
+        
+        Args:
+            parts: [(객체 경로, 객체 SHA-256 또는 None)] 순서 목록
+            expected_sha256: 파일 전체 SHA-256 (None이면 확인하지 않음)
+        
+        Returns:
+            dict: 다운로드 결과 (file_path, file_size)
+        """
+        digest = hashlib.sha256()
+        file_size = 0
+        temp_path = f"{output_path}.part"
+        try:
+            with open(temp_path, 'wb') as f:
+                for object_path, part_sha256 in parts:
+                    response = self._request("GET", self._object_url(bucket, object_path), stream=True)
+                    if response.status_code != 200:
+                        error = response.text
+                        response.close()
+                        raise RuntimeError(f"Storage 다운로드 실패: {error}")
+                    
+                    part_digest = hashlib.sha256()
+                    with response:
+                        for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+                            f.write(chunk)
+                            digest.update(chunk)
+                            part_digest.update(chunk)
+                            file_size += len(chunk)
+                    if part_sha256 and part_digest.hexdigest() != part_sha256:
+                        raise RuntimeError(f"내려받은 청크의 해시가 일치하지 않습니다: {object_path}")
+            
+            if expected_sha256 and digest.hexdigest() != expected_sha256:
+                raise RuntimeError("내려받은 파일의 해시가 일치하지 않습니다")
+            
+            os.replace(temp_path, output_path)
+        except RuntimeError as e:
+            os.remove(temp_path)
+            return {"success": False, "error": str(e)}
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        
+        return {"success": True, "file_path": output_path, "file_size": file_size}
+    
+    def _download_chunked(self, row, output_path):
+        """청크 목록 표 순서대로 청크를 이어 받아 원본 파일 복원"""
+        if row.get("status") != "uploaded":
+            return {"success": False, "error": "업로드가 아직 끝나지 않은 파일입니다"}
+        
+        response = self._request("GET", f"/rest/v1/excel_file_chunks?file_id=eq.{row['id']}"
+                                        f"&select=chunk_index,sha256&order=chunk_index.asc")
+        if response.status_code != 200:
+            return {"success": False, "error": response.text}
+        chunks = response.json()
+        if [chunk["chunk_index"] for chunk in chunks] != list(range(row["chunk_count"])):
+            return {"success": False, "error": "청크 목록이 완전하지 않습니다"}
+        
+        parts = [(_chunk_object_path(chunk["sha256"]), chunk["sha256"]) for chunk in chunks]
+        return self._download_objects(row.get("storage_bucket") or self.storage_bucket, parts, output_path,
+                                      expected_sha256=row.get("content_sha256"))
+    
+    def download_excel_file(self, file_id, output_path):
+        """
+        업로드한 원본 파일 다운로드 (Storage에 있으면 스트리밍, 아니면 Base64 열에서 복원)
+        
+        Args:
+            file_id: 파일 ID
+            output_path: 저장할 파일 경로
+            
+        Returns:
+            dict: 다운로드 결과
+        """
+        try:
+            response = self._request("GET", f"/rest/v1/excel_files?id=eq.{file_id}&select=*")
+            if response.status_code != 200:
                 return {"success": False, "error": response.text}
-                
+            rows = response.json()
+            if not rows:
+                return {"success": False, "error": "파일 정보를 찾을 수 없습니다"}
+            
+            row = rows[0]
+            if row.get("chunk_count") is not None:
+                return self._download_chunked(row, output_path)
+            if row.get("storage_path"):
+                return self._download_object(row.get("storage_bucket") or self.storage_bucket, row["storage_path"],
+                                             output_path, expected_sha256=row.get("content_sha256"))
+            if row.get("file_data"):
+                with open(output_path, 'wb') as f:
+                    f.write(base64.b64decode(row["file_data"]))
+                return {"success": True, "file_path": output_path, "file_size": row.get("file_size")}
+            return {"success": False, "error": "파일 데이터가 없습니다"}
+            
         except Exception as e:
-            print(f"❌ 업로드 오류: {e}")
             return {"success": False, "error": str(e)}
+        
+    def upload_excel_file(self, file_path, project_name="default"):
+        """
+        Excel 파일을 클라우드에 업로드
+        
+        Args:
+            file_path: 업로드할 Excel 파일 경로
+            project_name: 프로젝트 이름
+            
+        Returns:
+            dict: 업로드 결과 (file_id, status)
+        """
+        result = self._upload(file_path, project_name)
+        if result["success"]:
+            print(f"✅ 파일 업로드 성공: {result['filename']}")
+            print(f"📁 파일 ID: {result['file_id']}")
+        else:
+            print(f"❌ 업로드 실패: {result['error']}")
+        return result
+    
+    def upload_excel_files(self, file_paths, project_name="default", max_workers=None, progress=None):
+        """
+        여러 파일을 동시에 업로드
+        
+        동시 업로드 수만큼 연결을 유지하면서 재사용하고, 실패한 요청은 백오프 후 다시 시도합니다.
+        
+        Args:
+            file_paths: 업로드할 파일 경로 목록
+            project_name: 프로젝트 이름
+            max_workers: 동시 업로드 수 (기본값: 연결 풀 크기)
+            progress: 파일마다 호출할 함수 (완료 수, 전체 수, 파일 결과)
+            
+        Returns:
+            dict: success, uploaded/failed(파일 결과 목록, 입력 순서), bytes, seconds,
+                  files_per_second, mb_per_second, retries
+        """
+        file_paths = list(file_paths)
+        workers = max(1, min(max_workers or self.pool_size, len(file_paths) or 1))
+        # chunked 방식은 파일마다 청크를 동시에 보내므로 그만큼 연결 유지
+        connections = workers * (self.chunk_workers if self.transfer_mode == 'chunked' else 1)
+        if connections > self.pool_size:
+            self._mount_pool(connections)
+        
+        retries_before = self.retries
+        start = time.perf_counter()
+        results = [None] * len(file_paths)
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(self._upload, file_path, project_name): index
+                       for index, file_path in enumerate(file_paths)}
+            for done, future in enumerate(as_completed(futures), 1):
+                result = future.result()
+                results[futures[future]] = result
+                if progress:
+                    progress(done, len(file_paths), result)
+        
+        seconds = time.perf_counter() - start
+        uploaded = [result for result in results if result["success"]]
+        failed = [result for result in results if not result["success"]]
+        total_bytes = sum(result["file_size"] for result in uploaded)
+        
+        return {
+            "success": not failed,
+            "uploaded": uploaded,
+            "failed": failed,
+            "bytes": total_bytes,
+            "seconds": seconds,
+            "files_per_second": len(uploaded) / seconds if seconds else 0.0,
+            "mb_per_second": total_bytes / (1024 * 1024) / seconds if seconds else 0.0,
+            "retries": self.retries - retries_before
+        }
+    
+    def upload_folder(self, folder_path, project_name="default", max_workers=None, progress=None):
+        """
+        폴더 안의 Excel 파일을 모두 동시에 업로드 (엑셀 임시 파일 ~$ 제외)
+        
+        Returns:
+            dict: upload_excel_files와 같은 결과
+        """
+        file_paths = []
+        for pattern in UPLOAD_PATTERNS:
+            file_paths.extend(glob.glob(os.path.join(folder_path, pattern)))
+        file_paths = sorted(path for path in file_paths if not os.path.basename(path).startswith('~$'))
+        return self.upload_excel_files(file_paths, project_name, max_workers=max_workers, progress=progress)
     
     def process_excel_file(self, file_id, processing_options=None):
         """
@@ -109,11 +666,7 @@ class ExcelCloudProcessor:
                 "start_time": datetime.now().isoformat()
             }
             
-            response = requests.post(
-                f"{self.supabase_url}/rest/v1/process_excel",
-                headers=self.headers,
-                json=process_data
-            )
+            response = self._request("POST", "/rest/v1/process_excel", json=process_data)
             
             if response.status_code == 201:
                 result = response.json()
@@ -138,10 +691,7 @@ class ExcelCloudProcessor:
             dict: 처리 상태
         """
         try:
-            response = requests.get(
-                f"{self.supabase_url}/rest/v1/process_excel?id=eq.{process_id}",
-                headers=self.headers
-            )
+            response = self._request("GET", f"/rest/v1/process_excel?id=eq.{process_id}")
             
             if response.status_code == 200:
                 result = response.json()
@@ -175,11 +725,18 @@ class ExcelCloudProcessor:
             if status["status"]["status"] != "completed":
                 return {"success": False, "error": "처리가 아직 완료되지 않았습니다"}
             
+            # 결과가 Storage에 있으면 스트리밍으로 다운로드
+            row = status["status"]
+            if row.get("result_storage_path"):
+                result = self._download_object(row.get("result_storage_bucket") or self.storage_bucket,
+                                               row["result_storage_path"], output_path,
+                                               expected_sha256=row.get("result_sha256"))
+                if result["success"]:
+                    print(f"✅ 결과 다운로드 완료: {output_path}")
+                return result
+            
             # 결과 파일 다운로드
-            response = requests.get(
-                f"{self.supabase_url}/rest/v1/process_excel?id=eq.{process_id}&select=result_file_data",
-                headers=self.headers
-            )
+            response = self._request("GET", f"/rest/v1/process_excel?id=eq.{process_id}&select=result_file_data")
             
             if response.status_code == 200:
                 result = response.json()
@@ -209,10 +766,7 @@ class ExcelCloudProcessor:
             list: 프로젝트 목록
         """
         try:
-            response = requests.get(
-                f"{self.supabase_url}/rest/v1/excel_files?select=project_name&distinct=true",
-                headers=self.headers
-            )
+            response = self._request("GET", "/rest/v1/excel_files?select=project_name&distinct=true")
             
             if response.status_code == 200:
                 projects = [item["project_name"] for item in response.json()]
@@ -242,10 +796,11 @@ def main():
     print("2. 파일 처리")
     print("3. 결과 다운로드")
     print("4. 프로젝트 목록 조회")
+    print("5. 폴더 일괄 업로드")
     
     while True:
         print("\n" + "-" * 40)
-        choice = input("선택하세요 (1-4, q: 종료): ").strip()
+        choice = input("선택하세요 (1-5, q: 종료): ").strip()
         
         if choice == 'q':
             break
@@ -289,6 +844,25 @@ def main():
             else:
                 print(f"❌ 조회 실패: {result['error']}")
         
+        elif choice == '5':
+            folder_path = input("업로드할 폴더 경로: ").strip()
+            project_name = input("프로젝트 이름 (기본값: default): ").strip() or "default"
+            workers = input(f"동시 업로드 수 (기본값: {DEFAULT_UPLOAD_WORKERS}): ").strip()
+            
+            if os.path.isdir(folder_path):
+                def show_progress(done, total, file_result):
+                    mark = "✅" if file_result["success"] else "❌"
+                    print(f"  {mark} [{done}/{total}] {file_result['filename']}")
+                
+                summary = processor.upload_folder(folder_path, project_name,
+                                                  max_workers=int(workers) if workers.isdigit() else None,
+                                                  progress=show_progress)
+                print(f"📊 {describe_upload(summary)}")
+                for failed in summary["failed"]:
+                    print(f"❌ {failed['filename']}: {failed['error']}")
+            else:
+                print("❌ 폴더를 찾을 수 없습니다.")
+        
         else:
             print("❌ 잘못된 선택입니다.")
 
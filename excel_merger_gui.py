@@ -4,7 +4,6 @@ from tkinter.scrolledtext import ScrolledText
 import pandas as pd
 import os
 import glob
-import shutil
 from pathlib import Path
 import re
 from datetime import datetime
@@ -12,6 +11,19 @@ import openpyxl
 from openpyxl.styles import Font, PatternFill, Alignment
 from openpyxl.utils.dataframe import dataframe_to_rows
 import threading
+import multiprocessing
+from parallel_merge import run_file_stages, default_worker_count
+from class_info_index import ClassInfoIndex, CLASS_INFO_COLUMNS
+from merge_cache import IncrementalMergeCache
+from file_staging import STAGING_MODES, stage_files, same_content, link_or_copy
+from ui_channel import UiEventChannel
+from excel_output import write_styled_sheets
+from spill_merge import write_sheet_files, sheet_files_dir, COMPRESSIONS, PYARROW_AVAILABLE
+from workbook_probe import probe_workbook, describe_probe
+from workbook_reader import read_sheet_auto, describe_read
+
+# 저장 형식 표시 이름 → 형식
+OUTPUT_FORMATS = {"Excel (.xlsx)": 'xlsx', "Parquet": 'parquet', "Feather": 'feather'}
 
 class ExcelMergerGUI:
     def __init__(self, root):
@@ -26,6 +38,16 @@ class ExcelMergerGUI:
         
         self.setup_ui()
         
+        # 작업 스레드의 로그/진행률/알림은 이벤트 채널을 거쳐 메인 루프에서 반영
+        self.channel = UiEventChannel(self.root, {
+            'log': self._append_logs,
+            'progress': self._apply_progress,
+            'file_status': self._apply_file_status,
+            'dialog': self._show_dialog,
+            'finished': self._on_merge_finished,
+        })
+        self.channel.start()
+        
     def setup_ui(self):
         """UI 구성"""
         # 메인 프레임
@@ -100,13 +122,48 @@ class ExcelMergerGUI:
         execute_frame = ttk.Frame(main_frame)
         execute_frame.grid(row=3, column=0, columnspan=3, pady=20)
         
+        # 병렬 처리 프로세스 수
+        ttk.Label(execute_frame, text="병렬 작업 수:").pack(side=tk.LEFT, padx=(0, 5))
+        self.workers_var = tk.IntVar(value=1)
+        self.workers_spinbox = ttk.Spinbox(execute_frame, from_=1, to=default_worker_count(),
+                                           textvariable=self.workers_var, width=5)
+        self.workers_spinbox.pack(side=tk.LEFT, padx=(0, 15))
+        
+        # 저메모리 저장 (쓰기 전용 모드)
+        self.constant_memory_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(execute_frame, text="저메모리 저장", 
+                       variable=self.constant_memory_var).pack(side=tk.LEFT, padx=(0, 15))
+        
+        # 증분 통합 (바뀐 파일만 다시 처리)
+        self.incremental_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(execute_frame, text="변경된 파일만 처리", 
+                       variable=self.incremental_var).pack(side=tk.LEFT, padx=(0, 15))
+        
+        # 파일 준비 방식 (원본에서 바로 읽기 / 하드 링크 / 복사)
+        ttk.Label(execute_frame, text="파일 준비:").pack(side=tk.LEFT, padx=(0, 5))
+        self.staging_var = tk.StringVar(value=list(STAGING_MODES)[0])
+        ttk.Combobox(execute_frame, textvariable=self.staging_var, values=list(STAGING_MODES),
+                     state="readonly", width=12).pack(side=tk.LEFT, padx=(0, 15))
+        
+        # 저장 형식 (Parquet/Feather는 시트마다 파일 하나, 열 타입 유지)
+        ttk.Label(execute_frame, text="저장 형식:").pack(side=tk.LEFT, padx=(0, 5))
+        output_formats = list(OUTPUT_FORMATS) if PYARROW_AVAILABLE else ["Excel (.xlsx)"]
+        self.output_format_var = tk.StringVar(value=output_formats[0])
+        ttk.Combobox(execute_frame, textvariable=self.output_format_var, values=output_formats,
+                     state="readonly", width=14).pack(side=tk.LEFT, padx=(0, 5))
+        self.compression_var = tk.StringVar(value=COMPRESSIONS[0])
+        ttk.Combobox(execute_frame, textvariable=self.compression_var, values=COMPRESSIONS,
+                     state="readonly", width=6).pack(side=tk.LEFT, padx=(0, 15))
+        
         self.execute_button = ttk.Button(execute_frame, text="🔄 파일 통합 실행", 
                                         command=self.execute_merge, style="Accent.TButton")
-        self.execute_button.pack()
+        self.execute_button.pack(side=tk.LEFT)
         
-        # 진행상황 표시
-        self.progress = ttk.Progressbar(main_frame, mode='indeterminate')
-        self.progress.grid(row=4, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(0, 10))
+        # 진행상황 표시 (파일 처리/시트 저장 단계별 실제 진행률)
+        self.progress = ttk.Progressbar(main_frame, mode='determinate')
+        self.progress.grid(row=4, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 10))
+        self.progress_label = ttk.Label(main_frame, text="", width=18)
+        self.progress_label.grid(row=4, column=2, sticky=tk.W, padx=(10, 0), pady=(0, 10))
         
         # 로그 출력 영역
         log_frame = ttk.LabelFrame(main_frame, text="처리 로그", padding="5")
@@ -124,12 +181,33 @@ class ExcelMergerGUI:
         file_frame.rowconfigure(2, weight=1)
         
     def log(self, message):
-        """로그 메시지 출력"""
+        """로그 메시지 출력 (어느 스레드에서든 호출 가능, 화면에는 모아서 반영)"""
+        self.channel.post('log', message=f"[{datetime.now().strftime('%H:%M:%S')}] {message}")
+        
+    def _append_logs(self, messages):
+        """모인 로그 메시지를 한 번에 삽입 (메인 스레드)"""
         self.log_text.config(state='normal')
-        self.log_text.insert(tk.END, f"[{datetime.now().strftime('%H:%M:%S')}] {message}\n")
+        self.log_text.insert(tk.END, "\n".join(messages) + "\n")
         self.log_text.config(state='disabled')
         self.log_text.see(tk.END)
-        self.root.update()
+        
+    def set_progress(self, value, maximum, text=""):
+        """진행률 표시 (어느 스레드에서든 호출 가능)"""
+        self.channel.post('progress', value=value, maximum=maximum, text=text)
+        
+    def _apply_progress(self, value, maximum, text=""):
+        """진행률 반영 (메인 스레드)"""
+        self.progress.config(maximum=max(maximum, 1), value=value)
+        self.progress_label.config(text=text)
+        
+    def show_dialog(self, kind, title, message):
+        """알림창 표시 요청 (kind: 'info', 'warning', 'error')"""
+        self.channel.post('dialog', kind=kind, title=title, message=message)
+        
+    def _show_dialog(self, kind, title, message):
+        """알림창 표시 (메인 스레드)"""
+        show = {'info': messagebox.showinfo, 'warning': messagebox.showwarning}.get(kind, messagebox.showerror)
+        show(title, message)
         
     def select_work_folder(self):
         """작업 폴더 선택"""
@@ -177,13 +255,19 @@ class ExcelMergerGUI:
         try:
             size = os.path.getsize(file_path)
             size_str = f"{size:,} bytes"
-:
+        except Exception:
             size_str = "알 수 없음"
         
+        # 시트 구성 확인 (워크북을 로드하지 않고 매니페스트만 읽음)
+        try:
+            sheet_summary = f" ({describe_probe(probe_workbook(file_path))})"
+        except Exception:
+            sheet_summary = ""
+        
         # 트리뷰에 추가
         item_id = self.file_tree.insert("", tk.END, values=(filename, size_str, "대기"))
         self.excel_files.append(file_path)
-        self.log(f"파일 추가: {filename}")
+        self.log(f"파일 추가: {filename}{sheet_summary}")
         
     def on_drop(self, event):
         """드래그 앤 드롭 이벤트 처리"""
@@ -202,7 +286,11 @@ class ExcelMergerGUI:
         self.log("파일 목록이 초기화되었습니다.")
         
     def update_file_status(self, filename, status):
-        """파일 상태 업데이트"""
+        """파일 상태 업데이트 요청 (어느 스레드에서든 호출 가능)"""
+        self.channel.post('file_status', filename=filename, status=status)
+        
+    def _apply_file_status(self, filename, status):
+        """파일 상태 반영 (메인 스레드)"""
         for item in self.file_tree.get_children():
             if self.file_tree.item(item)['values'][0] == filename:
                 values = list(self.file_tree.item(item)['values'])
@@ -220,17 +308,32 @@ class ExcelMergerGUI:
             messagebox.showerror("오류", "통합할 엑셀 파일을 추가해주세요.")
             return
             
-        # 별도 스레드에서 실행
-        thread = threading.Thread(target=self._execute_merge_thread)
+        # 병렬 작업 수 확인 (Tk 변수는 메인 스레드에서 읽음)
+        try:
+            workers = max(1, int(self.workers_var.get()))
+        except (tk.TclError, ValueError):
+            workers = 1
+        constant_memory = bool(self.constant_memory_var.get())
+        output_format = OUTPUT_FORMATS.get(self.output_format_var.get(), 'xlsx')
+        compression = self.compression_var.get()
+        incremental = bool(self.incremental_var.get())
+        staging_mode = STAGING_MODES.get(self.staging_var.get(), 'direct')
+        
+        self.execute_button.config(state='disabled')
+        self._apply_progress(0, 1, "준비 중")
+        
+        # 별도 스레드에서 실행 (화면 갱신은 이벤트 채널로만 요청)
+        thread = threading.Thread(target=self._execute_merge_thread,
+                                  args=(workers, constant_memory, output_format, compression, incremental,
+                                        staging_mode))
         thread.daemon = True
         thread.start()
         
-    def _execute_merge_thread(self):
+    def _execute_merge_thread(self, workers=1, constant_memory=False, output_format='xlsx', compression=None,
+                              incremental=False, staging_mode='direct'):
         """파일 통합 실행 (스레드)"""
+        success = False
         try:
-            self.execute_button.config(state='disabled')
-            self.progress.start(10)
-            
             # 작업 폴더 권한 체크
             try:
                 test_file = os.path.join(self.work_folder, "test_permission.tmp")
@@ -240,362 +343,132 @@ class ExcelMergerGUI:
                 self.log(f"✅ 작업 폴더 권한 확인: {self.work_folder}")
             except Exception as e:
                 self.log(f"❌ 작업 폴더 권한 없음: {e}")
-                messagebox.showerror("권한 오류", f"작업 폴더에 쓰기 권한이 없습니다.\n다른 폴더를 선택해주세요.\n{self.work_folder}")
+                self.show_dialog('error', "권한 오류", f"작업 폴더에 쓰기 권한이 없습니다.\n다른 폴더를 선택해주세요.\n{self.work_folder}")
                 return
             
-            # 작업 폴더에 파일 복사
-            self.log("작업 폴더로 파일 복사 중...")
-            copied_files = []
-            
-            for file_path in self.excel_files:
-                filename = os.path.basename(file_path)
-                dest_path = os.path.join(self.work_folder, filename)
-                
-                try:
-                    # 파일이 열려있는지 체크
-                    if os.path.exists(dest_path):
-                        try:
-                            # 파일을 쓰기 모드로 열어서 사용 중인지 확인
-                            with open(dest_path, 'r+b'):
-                                pass
-                        except PermissionError:
-                            self.log(f"⚠️ 파일이 사용 중입니다. 닫고 다시 시도하세요: {filename}")
-                            self.update_file_status(filename, "사용중")
-                            continue
-                    
-                    # 중복 파일 체크 및 복사
-                    if os.path.exists(dest_path):
-                        if os.path.getsize(file_path) == os.path.getsize(dest_path):
-                            self.log(f"동일한 파일 존재, 건너뜀: {filename}")
-                            self.update_file_status(filename, "건너뜀")
-                            copied_files.append(dest_path)
-                            continue
-                    
-                    # 파일 복사 전 원본 파일 체크
-                    if not os.path.exists(file_path):
-                        self.log(f"❌ 원본 파일이 존재하지 않음: {filename}")
-                        self.update_file_status(filename, "원본없음")
-                        continue
-                    
-                    shutil.copy2(file_path, dest_path)
-                    copied_files.append(dest_path)
-                    self.update_file_status(filename, "복사완료")
-                    self.log(f"파일 복사: {filename}")
-                    
-                except PermissionError as e:
-                    self.log(f"권한 오류 - {filename}: {e}")
-                    self.update_file_status(filename, "권한오류")
-                except Exception as e:
-                    self.log(f"파일 복사 실패 {filename}: {e}")
-                    self.update_file_status(filename, "복사실패")
+            # 통합할 파일 준비 (원본 경로 그대로 또는 작업 폴더에 링크/복사, 같은 내용은 한 번만)
+            mode_label = next((label for label, mode in STAGING_MODES.items() if mode == staging_mode), staging_mode)
+            self.log(f"통합할 파일 준비 중... ({mode_label})")
+            staged_files = stage_files(self.excel_files, self.work_folder, staging_mode,
+                                       log=self.log, set_status=self.update_file_status)
             
-            if not copied_files:
-                self.log("❌ 복사된 파일이 없습니다!")
-                messagebox.showerror("오류", "복사된 파일이 없어 통합을 진행할 수 없습니다.")
+            if not staged_files:
+                self.log("❌ 준비된 파일이 없습니다!")
+                self.show_dialog('error', "오류", "준비된 파일이 없어 통합을 진행할 수 없습니다.")
                 return
             
-            # 수업정보 파일 복사
+            # 수업정보 파일 준비
             class_info_path = None
             if self.class_info_file:
                 class_info_filename = os.path.basename(self.class_info_file)
-                class_info_path = os.path.join(self.work_folder, class_info_filename)
                 try:
                     if not os.path.exists(self.class_info_file):
                         self.log(f"⚠️ 수업정보 파일이 존재하지 않음: {class_info_filename}")
+                    elif staging_mode == 'direct':
+                        class_info_path = self.class_info_file
                     else:
-                        shutil.copy2(self.class_info_file, class_info_path)
-                        self.log(f"수업정보 파일 복사: {class_info_filename}")
+                        class_info_path = os.path.join(self.work_folder, class_info_filename)
+                        if os.path.exists(class_info_path) and not same_content(self.class_info_file, class_info_path):
+                            # 이전 링크를 통해 다른 원본을 덮어쓰지 않도록 먼저 삭제
+                            os.remove(class_info_path)
+                        if not os.path.exists(class_info_path):
+                            method = link_or_copy(self.class_info_file, class_info_path, staging_mode)
+                            self.log(f"수업정보 파일 {method}: {class_info_filename}")
                 except Exception as e:
-                    self.log(f"수업정보 파일 복사 실패: {e}")
+                    self.log(f"수업정보 파일 준비 실패: {e}")
                     class_info_path = None
             
             # 파일 통합 실행
             self.log("파일 통합 시작...")
-            success = self.merge_excel_files_advanced(self.work_folder, class_info_path)
+            success = self.merge_excel_files_advanced(self.work_folder, class_info_path, workers=workers,
+                                                      constant_memory=constant_memory,
+                                                      output_format=output_format, compression=compression,
+                                                      incremental=incremental, file_paths=staged_files)
             
             if success:
                 self.log("✅ 파일 통합 완료!")
                 
-                # 결과 파일 확인
+                # 결과 파일 확인 (Parquet/Feather는 시트별 파일이 있는 폴더)
                 output_file = os.path.join(self.work_folder, "통합파일_고급.xlsx")
-                if os.path.exists(output_file):
+                if output_format != 'xlsx':
+                    output_file = sheet_files_dir(output_file, output_format)
+                if os.path.isdir(output_file):
+                    self.log(f"📁 결과 폴더: {os.path.basename(output_file)} ({len(os.listdir(output_file))}개 파일)")
+                    self.show_dialog('info', "완료", f"파일 통합이 성공적으로 완료되었습니다!\n\n저장 위치: {output_file}")
+                elif os.path.exists(output_file):
                     file_size = os.path.getsize(output_file)
                     self.log(f"📄 결과 파일: 통합파일_고급.xlsx ({file_size:,} bytes)")
-                    messagebox.showinfo("완료", f"파일 통합이 성공적으로 완료되었습니다!\n\n저장 위치: {output_file}")
+                    self.show_dialog('info', "완료", f"파일 통합이 성공적으로 완료되었습니다!\n\n저장 위치: {output_file}")
                 else:
                     self.log("⚠️ 결과 파일이 생성되지 않았습니다.")
-                    messagebox.showwarning("경고", "통합은 완료되었지만 결과 파일을 찾을 수 없습니다.")
-                
-                # 모든 파일 상태를 완료로 변경
-                for item in self.file_tree.get_children():
-                    values = list(self.file_tree.item(item)['values'])
-                    if values[2] in ["복사완료", "건너뜀"]:
-                        values[2] = "완료"
-                        self.file_tree.item(item, values=values)
+                    self.show_dialog('warning', "경고", "통합은 완료되었지만 결과 파일을 찾을 수 없습니다.")
             else:
                 self.log("❌ 파일 통합 실패!")
-                messagebox.showerror("오류", "파일 통합에 실패했습니다. 로그를 확인해주세요.")
+                self.show_dialog('error', "오류", "파일 통합에 실패했습니다. 로그를 확인해주세요.")
                 
         except Exception as e:
             import traceback
             error_detail = traceback.format_exc()
             self.log(f"심각한 오류: {e}")
             self.log(f"오류 상세: {error_detail}")
-            messagebox.showerror("오류", f"예상치 못한 오류가 발생했습니다:\n{e}\n\n상세 로그를 확인해주세요.")
+            self.show_dialog('error', "오류", f"예상치 못한 오류가 발생했습니다:\n{e}\n\n상세 로그를 확인해주세요.")
             
         finally:
-            self.progress.stop()
-            self.execute_button.config(state='normal')
-
-    # 기존 엑셀 처리 함수들을 여기에 포함
-    def extract_education_name_and_date(self, df):
-        """첫 번째 행에서 교육명과 날짜를 추출"""
-        if df.empty or len(df) < 1:
-            return None, None, None
-        
-        first_row = df.iloc[0]
-        education_name = None
-        date_str = None
-        time_str = None
-        
-        for cell_value in first_row:
-            if pd.isna(cell_value):
-                continue
-                
-            cell_str = str(cell_value).strip()
-            
-            # 교육명 패턴 찾기
-            if not education_name and re.search(r'[가-힣]', cell_str) and len(cell_str) > 2:
-                education_name = cell_str
-            
-            # 날짜 패턴 찾기
-            date_patterns = [
-                r'(\d{1,2})[-/.](\d{1,2})',
-                r'(\d{1,2})월\s*(\d{1,2})일',
-            ]
-            
-            for pattern in date_patterns:
-                match = re.search(pattern, cell_str)
-                if match and not date_str:
-                    month, day = match.groups()
-                    date_str = f"{month.zfill(2)}-{day.zfill(2)}"
-                    break
-            
-            # 시간 패턴 찾기
-            time_match = re.search(r'(\d{1,2}):(\d{2})', cell_str)
-            if time_match and not time_str:
-                hour, minute = time_match.groups()
-                time_str = f"{hour.zfill(2)}-{minute}"
-        
-        return education_name, date_str, time_str
-
-    def clean_sheet_name(self, name):
-        """엑셀 시트명으로 사용할 수 없는 문자들 정리"""
-        if not name:
-            return "Sheet"
-        
-        invalid_chars = r'[\[\]:*?/\\]'
-        cleaned = re.sub(invalid_chars, '_', str(name))
-        
-        if len(cleaned) > 31:
-            cleaned = cleaned[:28] + "..."
-        
-        if not cleaned.strip():
-            cleaned = "Sheet"
-        
-        return cleaned
-
-    def process_sheet_data(self, df):
-        """시트 데이터 처리"""
-        if df.empty or len(df) < 3:
-            return None
-        
-        # 첫 번째와 두 번째 행 삭제
-        df = df.iloc[2:].reset_index(drop=True)
-        
-        if df.empty:
-            return None
-        
-        # 컬럼명 정리
-        if len(df) > 0:
-            df.columns = df.iloc[0]
-            df = df.iloc[1:].reset_index(drop=True)
-        
-        # 빈 행 제거
-        df = df.dropna(how='all')
-        
-        if df.empty:
-            return None
-        
-        # 취소 행과 일반 행 분리
-        cancelled_rows = []
-        normal_rows = []
-        
-        for idx, row in df.iterrows():
-            is_cancelled = False
-            for col in df.columns:
-                if pd.notna(row[col]) and '취소' in str(row[col]):
-                    is_cancelled = True
-                    break
-            
-            if is_cancelled:
-                cancelled_rows.append(row)
-            else:
-                normal_rows.append(row)
-        
-        df_normal = pd.DataFrame(normal_rows).reset_index(drop=True) if normal_rows else pd.DataFrame()
-        df_cancelled = pd.DataFrame(cancelled_rows).reset_index(drop=True) if cancelled_rows else pd.DataFrame()
-        
-        return df_normal, df_cancelled
-
-    def update_waitlist_status(self, df):
-        """대기 학생 상태 업데이트"""
-        if df.empty:
-            return df
-        
-        status_col = None
-        for col in df.columns:
-            if '상태' in str(col) or 'status' in str(col).lower():
-                status_col = col
-                break
-        
-        if status_col is None:
-            return df
-        
-        for idx, row in df.iterrows():
-            status_value = str(row[status_col]) if pd.notna(row[status_col]) else ""
-            
-            wait_match = re.search(r'대기(\d+)', status_value)
-            if wait_match:
-                wait_num = wait_match.group(1)
-                df.at[idx, status_col] = f"Applied (대기{wait_num})"
-        
-        return df
-
-    def sort_dataframe(self, df):
-        """데이터프레임 정렬"""
-        if df.empty:
-            return df
-        
-        sort_columns = []
-        sort_orders = []
-        
-        column_mapping = {
-            '상태': ('상태', False),
-            '지역': ('지역', True),
-            '학교분류': ('학교분류', False),
-            '학교명': ('학교명', True),
-            '학년': ('학년', True),
-            '반': ('반', True),
-            '번호': ('번호', True)
-        }
-        
-        for col_name, (ascending, is_asc) in column_mapping.items():
-            for df_col in df.columns:
-                if col_name in str(df_col):
-                    sort_columns.append(df_col)
-                    sort_orders.append(is_asc)
-                    break
-        
-        if sort_columns:
-            df = df.sort_values(by=sort_columns, ascending=sort_orders, na_position='last')
-        
-        return df
-
-    def add_grade_class_number_column(self, df):
-        """학년-반-번호 조합 열 추가"""
-        if df.empty:
-            return df
-        
-        grade_col = None
-        class_col = None
-        number_col = None
-        
-        for col in df.columns:
-            col_str = str(col)
-            if '학년' in col_str:
-                grade_col = col
-            elif '반' in col_str and '학년' not in col_str:
-                class_col = col
-            elif '번호' in col_str:
-                number_col = col
-        
-        if grade_col and class_col and number_col:
-            def combine_grade_class_number(row):
-                grade = str(row[grade_col]) if pd.notna(row[grade_col]) else ""
-                class_num = str(row[class_col]) if pd.notna(row[class_col]) else ""
-                number = str(row[number_col]) if pd.notna(row[number_col]) else ""
-                
-                if grade and class_num and number:
-                    return f"{grade}-{class_num}-{number}"
-                return ""
-            
-            df['학년-반-번호'] = df.apply(combine_grade_class_number, axis=1)
-        
-        return df
+            self.channel.post('finished', success=success)
+    
+    def _on_merge_finished(self, success):
+        """통합 종료 처리 (메인 스레드)"""
+        self.execute_button.config(state='normal')
+        self.progress_label.config(text="완료" if success else "실패")
+        
+        if success:
+            # 모든 파일 상태를 완료로 변경
+            for item in self.file_tree.get_children():
+                values = list(self.file_tree.item(item)['values'])
+                if values[2] == "준비완료":
+                    values[2] = "완료"
+                    self.file_tree.item(item, values=values)
 
-    def add_class_info_columns(self, df, class_info_df, education_name):
-        """수업 정보 열 추가"""
+    # 파일별 처리 단계(교육명 추출, 취소 행 분리, 대기 상태, 정렬, 학년-반-번호)는 parallel_merge 모듈에서 실행
+    def add_class_info_columns(self, df, class_info_index, education_name):
+        """수업 정보 열 추가 (미리 만든 수업정보 인덱스에서 교육명으로 조회)"""
         if df.empty:
             return df
         
         # 기본 열들 추가
-        new_columns = ['수업일', '시작', '종료', '주강사', '보조강사', '장소', '모니터']
-        for col in new_columns:
+        for col in CLASS_INFO_COLUMNS:
             df[col] = ""
         
         # 수업 정보가 있으면 매핑
-        if not class_info_df.empty and education_name:
-            # 교육명으로 해당 수업 정보 찾기
-            matching_rows = class_info_df[class_info_df.apply(
-                lambda row: any(education_name in str(cell) for cell in row), axis=1
-            )]
-            
-            if not matching_rows.empty:
-                class_info = matching_rows.iloc[0]
-                
-                # 컬럼 매핑
-                column_mapping = {
-                    '수업일': ['수업일', '날짜', 'date', '일자'],
-                    '시작': ['시작', '시작시간', 'start', '시작시간'],
-                    '종료': ['종료', '종료시간', 'end', '끝'],
-                    '주강사': ['주강사', '강사', 'instructor', '선생님'],
-                    '보조강사': ['보조강사', '보조', 'assistant'],
-                    '장소': ['장소', '위치', 'location', '교실'],
-                    '모니터': ['모니터', 'monitor', '관리자']
-                }
-                
-                for target_col, possible_cols in column_mapping.items():
-                    for possible_col in possible_cols:
-                        for class_col in class_info_df.columns:
-                            if possible_col in str(class_col).lower():
-                                value = str(class_info[class_col]) if pd.notna(class_info[class_col]) else ""
-                                df[target_col] = value
-                                break
-                        if df[target_col].iloc[0]:  # 값이 설정되었으면 다음으로
-                            break
+        if class_info_index is not None and education_name:
+            values, message = class_info_index.lookup(education_name)
+            if message:
+                self.log(f"  {message}")
+            
+            if values:
+                for target_col, value in values.items():
+                    df[target_col] = value
         
         return df
 
-    def apply_strikethrough_to_cancelled_rows(self, worksheet, cancelled_df, start_row):
-        """취소된 행에 취소선 적용"""
-        if cancelled_df.empty:
-            return
-        
-        for idx, row in cancelled_df.iterrows():
-            row_num = start_row + idx + 1
-            for col_idx, value in enumerate(row, 1):
-                cell = worksheet.cell(row=row_num, column=col_idx)
-                cell.font = Font(strike=True)
-                cell.value = value
-
-    def merge_excel_files_advanced(self, folder_path, class_info_file=None, output_file='통합파일_고급.xlsx'):
-        """고급 엑셀 파일 통합"""
+    def merge_excel_files_advanced(self, folder_path, class_info_file=None, output_file='통합파일_고급.xlsx', workers=1,
+                                   constant_memory=False, output_format='xlsx', compression=None, incremental=False,
+                                   file_paths=None):
+        """
+        고급 엑셀 파일 통합
+        workers가 2 이상이면 파일별 처리를 병렬 실행, constant_memory면 쓰기 전용 모드로 저장
+        output_format이 'parquet'/'feather'면 시트마다 파일 하나로 저장 (열 타입 유지, 취소 행은 '취소여부' 열)
+        incremental이면 바뀌지 않은 파일은 이전 처리 결과를 재사용하고 결과 파일만 다시 생성
+        file_paths를 주면 폴더를 다시 찾지 않고 그 파일들을 통합 (결과 파일은 folder_path에 저장)
+        """
         try:
             # 엑셀 파일들 찾기
-            excel_files = []
-            for ext in ['*.xlsx', '*.xls']:
-                excel_files.extend(glob.glob(os.path.join(folder_path, ext)))
+            if file_paths is not None:
+                excel_files = list(file_paths)
+            else:
+                excel_files = []
+                for ext in ['*.xlsx', '*.xls']:
+                    excel_files.extend(glob.glob(os.path.join(folder_path, ext)))
             
             output_path = os.path.join(folder_path, output_file)
             excel_files = [f for f in excel_files if os.path.abspath(f) != os.path.abspath(output_path)]
@@ -615,107 +488,66 @@ class ExcelMergerGUI:
             if class_info_file and os.path.exists(class_info_file):
                 try:
                     # 여러 시트가 있을 수 있으므로 첫 번째 시트 읽기
-                    class_info_df = pd.read_excel(class_info_file, sheet_name=0)
-                    self.log(f"📋 수업 정보 파일 로드: {os.path.basename(class_info_file)} ({len(class_info_df)}행)")
+                    class_info_df = read_sheet_auto(class_info_file)
+                    self.log(f"📋 수업 정보 파일 로드: {os.path.basename(class_info_file)} "
+                             f"({len(class_info_df)}행, {describe_read(class_info_df)})")
                 except Exception as e:
                     self.log(f"⚠️ 수업 정보 파일 읽기 실패: {e}")
             
+            # 수업 정보 인덱스 생성 (실행마다 한 번, 시트별로는 사전 조회만 수행)
+            class_info_index = None
+            if not class_info_df.empty:
+                class_info_index = ClassInfoIndex(class_info_df)
+                self.log(f"📋 수업 정보 열 매핑: {class_info_index.describe_mapping()}")
+            
             # 교육명별로 그룹화하여 처리
             education_groups = {}
             processed_count = 0
             
-            for file_path in excel_files:
-                try:
-                    filename = os.path.basename(file_path)
-                    self.log(f"📄 처리 중: {filename}")
-                    
-                    # 파일이 열려있는지 체크
-                    try:
-                        with open(file_path, 'r+b'):
-                            pass
-                    except PermissionError:
-                        self.log(f"⚠️ 파일이 사용 중입니다. 건너뜀: {filename}")
-                        continue
-                    
-                    # 엑셀 파일 읽기
+            if workers > 1:
+                self.log(f"⚙️ 병렬 처리: {workers}개 프로세스")
+            
+            cache = IncrementalMergeCache(folder_path) if incremental else None
+            
+            # 파일별 처리 단계 (병렬 실행 시에도 결과는 파일 순서대로 도착)
+            self.set_progress(0, len(excel_files), f"파일 처리 0/{len(excel_files)}")
+            for file_index, file_result in enumerate(
+                    run_file_stages(excel_files, workers=workers, header=None, cache=cache), 1):
+                filename = file_result['filename']
+                self.log(f"📄 처리 중: {filename}")
+                for message in file_result['messages']:
+                    self.log(message)
+                
+                sheet_processed = 0
+                for sheet_info in file_result['sheets']:
                     try:
-                        excel_data = pd.ExcelFile(file_path)
+                        education_name = sheet_info['education_name']
+                        
+                        # 수업 정보 열 추가 (모든 파일이 공유하는 수업정보를 사용하므로 메인 프로세스에서 처리)
+                        sheet_info['data'] = self.add_class_info_columns(sheet_info['data'], class_info_index, education_name)
+                        
+                        # 교육명별로 그룹화
+                        if education_name not in education_groups:
+                            education_groups[education_name] = []
+                        
+                        education_groups[education_name].append(sheet_info)
+                        
+                        self.log(f"  ✅ {sheet_info['source_sheet']} → {sheet_info['sheet_name']} ({len(sheet_info['data']):,}행)")
+                        sheet_processed += 1
+                        
                     except Exception as e:
-                        self.log(f"❌ 엑셀 파일 읽기 실패: {filename} - {e}")
+                        self.log(f"  ❌ 시트 처리 오류: {sheet_info['source_sheet']} - {e}")
                         continue
-                    
-                    sheet_processed = 0
-                    for sheet_name in excel_data.sheet_names:
-                        try:
-                            # 시트 읽기 (헤더 없이)
-                            df = pd.read_excel(file_path, sheet_name=sheet_name, header=None)
-                            
-                            if df.empty or len(df) < 3:
-                                self.log(f"  ⚠️ 데이터가 부족한 시트: {sheet_name}")
-                                continue
-                            
-                            # 교육명과 날짜 추출
-                            education_name, date_str, time_str = self.extract_education_name_and_date(df)
-                            
-                            if not education_name:
-                                self.log(f"  ⚠️ 교육명을 찾을 수 없음: {sheet_name}")
-                                continue
-                            
-                            # 시트 데이터 처리
-                            result = self.process_sheet_data(df)
-                            if result is None:
-                                self.log(f"  ⚠️ 처리할 데이터가 없음: {sheet_name}")
-                                continue
-                            
-                            df_normal, df_cancelled = result
-                            
-                            if df_normal.empty:
-                                self.log(f"  ⚠️ 유효한 데이터가 없음: {sheet_name}")
-                                continue
-                            
-                            # 데이터 처리
-                            df_normal = self.update_waitlist_status(df_normal)
-                            df_normal = self.sort_dataframe(df_normal)
-                            df_normal = self.add_grade_class_number_column(df_normal)
-                            df_normal = self.add_class_info_columns(df_normal, class_info_df, education_name)
-                            
-                            # 시트명 생성
-                            if date_str and time_str:
-                                sheet_name_new = f"{education_name}_{date_str}_{time_str}"
-                            elif date_str:
-                                sheet_name_new = f"{education_name}_{date_str}"
-                            else:
-                                sheet_name_new = education_name
-                            
-                            sheet_name_new = self.clean_sheet_name(sheet_name_new)
-                            
-                            # 교육명별로 그룹화
-                            if education_name not in education_groups:
-                                education_groups[education_name] = []
-                            
-                            education_groups[education_name].append({
-                                'sheet_name': sheet_name_new,
-                                'data': df_normal,
-                                'cancelled_data': df_cancelled,
-                                'date_str': date_str,
-                                'time_str': time_str,
-                                'original_file': filename
-                            })
-                            
-                            self.log(f"  ✅ {sheet_name} → {sheet_name_new} ({len(df_normal):,}행)")
-                            sheet_processed += 1
-                            
-                        except Exception as e:
-                            self.log(f"  ❌ 시트 처리 오류: {sheet_name} - {e}")
-                            continue
-                    
-                    if sheet_processed > 0:
-                        processed_count += 1
-                        self.log(f"  📊 {filename}: {sheet_processed}개 시트 처리됨")
-                    
-                except Exception as e:
-                    self.log(f"❌ 파일 처리 오류: {filename} - {e}")
-                    continue
+                
+                if sheet_processed > 0:
+                    processed_count += 1
+                    self.log(f"  📊 {filename}: {sheet_processed}개 시트 처리됨")
+                
+                self.set_progress(file_index, len(excel_files), f"파일 처리 {file_index}/{len(excel_files)}")
+            
+            if cache is not None:
+                cache.save()
+                self.log(f"♻️ 증분 통합: {cache.describe()}")
             
             if processed_count == 0:
                 self.log("❌ 처리된 파일이 없습니다!")
@@ -763,48 +595,35 @@ class ExcelMergerGUI:
                     self.log(f"❌ 출력 파일이 사용 중입니다: {output_file}")
                     return False
             
-            # 엑셀 파일 생성
-            try:
-                with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-                    for sheet_name, sheet_info in final_sheets.items():
-                        try:
-                            # 취소된 데이터와 일반 데이터 합치기
-                            if not sheet_info['cancelled_data'].empty:
-                                combined_data = pd.concat([
-                                    sheet_info['data'],
-                                    sheet_info['cancelled_data']
-                                ], ignore_index=True)
-                            else:
-                                combined_data = sheet_info['data']
-                            
-                            combined_data.to_excel(writer, sheet_name=sheet_name, index=False)
-                            self.log(f"  📄 시트 생성: {sheet_name}")
-                            
-                        except Exception as e:
-                            self.log(f"❌ 시트 생성 실패: {sheet_name} - {e}")
-                            continue
-                
-                self.log("✅ 엑셀 파일 생성 완료")
-                
-                # 취소선 적용
+            sheets = [dict(sheet_info, sheet_name=sheet_name) for sheet_name, sheet_info in final_sheets.items()]
+            
+            def sheet_progress(done, total):
+                self.set_progress(done, total, f"시트 저장 {done}/{total}")
+            
+            if output_format != 'xlsx':
+                # 시트별 Parquet/Feather 파일 생성
+                output_path = sheet_files_dir(output_path, output_format)
                 try:
-                    wb = openpyxl.load_workbook(output_path)
-                    
-                    for sheet_name, sheet_info in final_sheets.items():
-                        if not sheet_info['cancelled_data'].empty and sheet_name in wb.sheetnames:
-                            ws = wb[sheet_name]
-                            normal_rows = len(sheet_info['data'])
-                            self.apply_strikethrough_to_cancelled_rows(ws, sheet_info['cancelled_data'], normal_rows + 1)
-                    
-                    wb.save(output_path)
-                    self.log("✅ 취소선 적용 완료")
+                    self.log(f"💾 {output_format} 저장 (압축: {compression or COMPRESSIONS[0]})")
+                    write_sheet_files(output_path, sheets, output_format, compression, log=self.log,
+                                      progress=sheet_progress)
+                    self.log(f"✅ {output_format} 파일 생성 완료")
+                except Exception as e:
+                    self.log(f"❌ {output_format} 파일 생성 실패: {e}")
+                    return False
+            
+            else:
+                # 엑셀 파일 생성 (한 번에 기록하면서 취소 행에 취소선 적용)
+                try:
+                    if constant_memory:
+                        self.log("💾 저메모리 저장 모드 (쓰기 전용)")
+                    write_styled_sheets(output_path, sheets, log=self.log, constant_memory=constant_memory,
+                                        progress=sheet_progress)
+                    self.log("✅ 엑셀 파일 생성 완료 (취소선 포함)")
                     
                 except Exception as e:
-                    self.log(f"⚠️ 취소선 적용 실패: {e}")
-                
-            except Exception as e:
-                self.log(f"❌ 엑셀 파일 생성 실패: {e}")
-                return False
+                    self.log(f"❌ 엑셀 파일 생성 실패: {e}")
+                    return False
             
             self.log(f"🎉 통합 완료!")
             self.log(f"📊 처리 결과:")
@@ -819,8 +638,6 @@ class ExcelMergerGUI:
             error_detail = traceback.format_exc()
             self.log(f"❌ 프로그램 오류: {e}")
             self.log(f"상세 오류: {error_detail}")
-            return False Exception as e:
-            self.log(f"❌ 프로그램 오류: {e}")
             return False
 
 
@@ -880,4 +697,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # 실행파일(PyInstaller)에서 병렬 처리 프로세스를 띄우기 위해 필요
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
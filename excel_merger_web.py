@@ -8,11 +8,20 @@ from datetime import datetime
 import warnings
 import zipfile
 import tempfile
-import io
-import base64
 import shutil
 import subprocess
 import sys
+import time
+import uuid
+from urllib.parse import quote
+from workbook_reader import iter_sheet_chunks, should_stream, read_sheet_auto, record_read, describe_read
+from upload_cache import ParsedUploadCache, upload_hash
+from workbook_probe import list_sheet_names, sniff_format
+from csv_reader import iter_csv_chunks, should_chunk_csv
+from frame_cleaning import clean_dataframe
+from schema_alignment import align_frames, describe_alignment, alignment_lines
+from dtype_compaction import compact_dtypes, describe_compaction, compaction_lines
+from spill_merge import SpillMerger, PYARROW_AVAILABLE, COMPRESSIONS, write_merged_result
 
 # pandas 경고 메시지 숨기기
 warnings.filterwarnings('ignore')
@@ -81,91 +90,118 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-def get_download_link(df, filename, file_label):
-    """다운로드 링크 생성"""
-    csv = df.to_csv(index=False, encoding='utf-8-sig')
-    b64 = base64.b64encode(csv.encode()).decode()
-    href = f'<a href="data:file/csv;base64,{b64}" download="{filename}">📥 {file_label} 다운로드</a>'
-    return href
+# 다운로드 형식별 설정 (확장자, MIME 타입, 표시 이름)
+DOWNLOAD_FORMATS = {
+    'csv': ('.csv', 'text/csv', 'CSV 파일'),
+    'xlsx': ('.xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'Excel 파일'),
+}
+if PYARROW_AVAILABLE:
+    DOWNLOAD_FORMATS['parquet'] = ('.parquet', 'application/vnd.apache.parquet', 'Parquet 파일')
+    DOWNLOAD_FORMATS['feather'] = ('.feather', 'application/vnd.apache.arrow.file', 'Feather 파일')
 
-def get_excel_download_link(df, filename, file_label):
-    """엑셀 다운로드 링크 생성"""
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, index=False, sheet_name='통합데이터')
-    
-    b64 = base64.b64encode(output.getvalue()).decode()
-    href = f'<a href="data:application/vnd.openxmlformats-officedocument.spreadsheetml.sheet;base64,{b64}" download="{filename}">📊 {file_label} 다운로드</a>'
-    return href
+# 정적 파일 경로로 내려받을 결과 파일을 두는 폴더 (server.enableStaticServing, /app/static/downloads/...)
+DOWNLOAD_STATIC_DIR = Path(__file__).resolve().parent / 'static' / 'downloads'
 
-def safe_read_excel(file, sheet_name=None):
-    """안전한 Excel 파일 읽기 (스타일 오류 방지)"""
+def static_serving_enabled():
+    """Streamlit 정적 파일 제공(server.enableStaticServing)이 켜져 있는지"""
     try:
-        # 방법 1: openpyxl 엔진 사용
-        if sheet_name:
-            return pd.read_excel(file, sheet_name=sheet_name, engine='openpyxl')
-        else:
-            return pd.read_excel(file, engine='openpyxl')
-    except Exception as e1:
+        return bool(st.get_option('server.enableStaticServing'))
+    except Exception:
+        return False
+
+def publish_download_file(file_path):
+    """
+    결과 파일을 정적 파일 폴더에 연결하고 내려받기 URL 반환
+    
+    세션마다 추측할 수 없는 폴더를 만들어 하드 링크(안 되면 복사)로 연결하며,
+    서버는 요청이 올 때 파일을 디스크에서 나눠 읽어 보내므로 메모리에 올리지 않습니다.
+    """
+    token = st.session_state.setdefault('download_token', uuid.uuid4().hex)
+    target_dir = DOWNLOAD_STATIC_DIR / token
+    target_dir.mkdir(parents=True, exist_ok=True)
+    target = target_dir / Path(file_path).name
+    if not target.exists():
         try:
-            # 방법 2: xlrd 엔진 사용 (구형 Excel 파일용)
-            if sheet_name:
-                return pd.read_excel(file, sheet_name=sheet_name, engine='xlrd')
-            else:
-                return pd.read_excel(file, engine='xlrd')
-        except Exception as e2:
-            try:
-                # 방법 3: 기본 엔진 사용
-                if sheet_name:
-                    return pd.read_excel(file, sheet_name=sheet_name, engine=None)
-                else:
-                    return pd.read_excel(file, engine=None)
-            except Exception as e3:
-                # 방법 4: 스타일 정보 완전 무시하고 읽기
-                import openpyxl
-                from io import BytesIO
-                
-                # 파일을 메모리로 읽기
-                file.seek(0)
-                file_bytes = file.read()
-                file.seek(0)  # 파일 포인터 원위치
-                
-                # openpyxl로 워크북 열기 (데이터만)
-                wb = openpyxl.load_workbook(BytesIO(file_bytes), data_only=True)
-                
-                if sheet_name and sheet_name in wb.sheetnames:
-                    ws = wb[sheet_name]
-                else:
-                    ws = wb.active
-                
-                # 워크시트를 데이터프레임으로 변환
-                data = []
-                for row in ws.iter_rows(values_only=True):
-                    data.append(row)
-                
-                if data:
-                    df = pd.DataFrame(data[1:], columns=data[0])  # 첫 행을 헤더로 사용
-                    return df
-                else:
-                    raise Exception("빈 워크시트")
-                    
-            except Exception as e4:
-                raise Exception(f"모든 읽기 방법 실패: openpyxl({e1}), xlrd({e2}), 기본({e3}), 수동({e4})")
+            os.link(file_path, target)
+        except OSError:
+            shutil.copy2(file_path, target)
+    return f"app/static/downloads/{token}/{quote(target.name)}"
 
-def clean_dataframe(df):
-    """데이터프레임 정리"""
-    # 빈 행 제거
-    df = df.dropna(how='all')
+def clear_published_downloads():
+    """이 세션이 정적 파일 폴더에 연결한 결과 파일 삭제 (새 통합 결과를 만들 때)"""
+    token = st.session_state.get('download_token')
+    if token:
+        shutil.rmtree(DOWNLOAD_STATIC_DIR / token, ignore_errors=True)
+
+def write_download_file(df, folder, fmt, constant_memory=False, compression=None):
+    """
+    다운로드용 결과 파일을 디스크에 생성 (요청했을 때만 호출)
     
-    # 빈 열 제거
-    df = df.dropna(axis=1, how='all')
+    Returns:
+        Path: 생성된 파일 경로
+    """
+    extension = DOWNLOAD_FORMATS[fmt][0]
+    # 압축 방식마다 다른 파일 (같은 초에 만들어도 서로 덮어쓰지 않음)
+    codec = f"_{compression}" if download_key(fmt, compression)[1] else ""
+    file_path = Path(folder) / f"통합데이터_{datetime.now().strftime('%Y%m%d_%H%M%S')}{codec}{extension}"
+    return write_merged_result(df, file_path, fmt, constant_memory, compression)
+
+def download_key(fmt, compression=None):
+    """준비된 다운로드 파일 키 (Parquet/Feather는 압축 방식이 다르면 다른 파일)"""
+    return (fmt, compression if fmt in ('parquet', 'feather') else None)
+
+def render_download_buttons(df, folder, constant_memory=False, compression=None):
+    """
+    결과 다운로드 버튼 표시
     
-    # 문자열 컬럼의 앞뒤 공백 제거
-    for col in df.columns:
-        if df[col].dtype == 'object':
-            df[col] = df[col].astype(str).str.strip()
+    파일은 '준비' 버튼을 눌렀을 때만 디스크에 생성합니다.
+    정적 파일 제공이 켜져 있으면 파일 경로로 연결한 링크를 보여 주므로, 서버는 내려받을 때
+    파일을 디스크에서 나눠 읽어 보내고 다시 실행할 때마다 파일을 읽지 않습니다.
+    꺼져 있으면 st.download_button은 파일 전체를 메모리에 올리므로, 사용자가 고른 형식 하나만 올립니다.
+    """
+    download_files = st.session_state.setdefault('download_files', {})
+    static_serving = static_serving_enabled()
+    columns = st.columns(len(DOWNLOAD_FORMATS))
     
-    return df
+    for column, (fmt, (extension, mime, label)) in zip(columns, DOWNLOAD_FORMATS.items()):
+        with column:
+            key = download_key(fmt, compression)
+            widget_key = "_".join(str(part) for part in key if part)
+            file_path = download_files.get(key)
+            
+            if file_path and Path(file_path).exists():
+                size_mb = Path(file_path).stat().st_size / (1024 * 1024)
+                title = f"📥 {label} 다운로드 ({size_mb:.1f}MB)"
+                if static_serving:
+                    url = publish_download_file(file_path)
+                    st.markdown(f'<a href="{url}" download="{Path(file_path).name}">{title}</a>',
+                                unsafe_allow_html=True)
+                elif st.session_state.get('download_requested') == key:
+                    with open(file_path, 'rb') as f:
+                        st.download_button(
+                            title,
+                            data=f,
+                            file_name=Path(file_path).name,
+                            mime=mime,
+                            key=f"download_{widget_key}"
+                        )
+                elif st.button(title, key=f"request_{widget_key}"):
+                    st.session_state['download_requested'] = key
+                    st.rerun()
+            elif st.button(f"🛠️ {label} 준비", key=f"prepare_{widget_key}"):
+                try:
+                    with st.spinner(f"{label}을 만드는 중..."):
+                        download_files[key] = str(write_download_file(df, folder, fmt, constant_memory, compression))
+                    st.rerun()
+                except Exception as e:
+                    st.error(f"{label} 생성 실패: {e}")
+
+def safe_read_excel(file, sheet_name=None):
+    """안전한 Excel 파일 읽기 (형식을 먼저 판별하여 맞는 엔진으로 한 번만 읽기)"""
+    try:
+        return read_sheet_auto(file, sheet_name)
+    except Exception as e:
+        raise Exception(f"읽기 실패 ({sniff_format(file)} 형식): {e}")
 
 def check_and_request_permissions():
     """시스템 권한 확인 및 요청"""
@@ -280,61 +316,224 @@ def run_launcher_py():
     except Exception as e:
         return False, f"launcher.py 실행 중 오류: {str(e)}"
 
-def merge_excel_files(uploaded_files, merge_option, sheet_name=None):
-    """엑셀 파일들을 통합"""
+@st.cache_resource
+def get_upload_cache():
+    """재실행과 세션 간에 공유되는 업로드 파싱 캐시"""
+    return ParsedUploadCache()
+
+def read_sheet_names(uploaded_file, file_hash=None):
+    """업로드 파일의 시트 목록 (워크북 매니페스트만 읽음, 같은 내용이면 캐시 사용)"""
+    file_hash = file_hash or upload_hash(uploaded_file)
+    return get_upload_cache().get_sheet_names(file_hash, lambda: list_sheet_names(uploaded_file.getvalue()))
+
+def read_excel_streaming(uploaded_file, sheet_name=None):
+    """
+    대용량 xlsx 파일을 청크 단위로 읽어서 빈 행을 바로 제거
+    
+    결과는 하나의 데이터프레임이므로 메모리 통합에서만 사용합니다
+    (디스크 분할 통합은 spill_xlsx_chunks로 청크마다 바로 기록).
+    """
+    start = time.perf_counter()
+    chunks = []
+    for chunk in iter_sheet_chunks(uploaded_file, sheet_name):
+        chunk = chunk.dropna(how='all')
+        if not chunk.empty:
+            chunks.append(chunk)
+    
+    df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+    return record_read(df, 'xlsx', 'openpyxl-readonly', time.perf_counter() - start)
+
+def add_source_columns(df, file_name, merge_option):
+    """통합 방식에 따라 파일명/폴더명 열 추가"""
+    if merge_option == "파일명 추가":
+        df['파일명'] = file_name
+    elif merge_option == "폴더명 추가":
+        df['폴더명'] = os.path.dirname(file_name) or "루트"
+    return df
+
+def spill_csv_chunks(merger, uploaded_file, merge_option):
+    """
+    대용량 CSV를 청크마다 정리하여 바로 디스크 분할 통합에 기록 (파일 전체를 메모리에 올리지 않음)
+    
+    읽는 도중 실패하거나 다른 인코딩으로 처음부터 다시 읽으면 이 파일에서 기록한 조각을 되돌립니다.
+    
+    Returns:
+        tuple: (행수, 열수)
+    """
+    checkpoint = merger.checkpoint()
+    totals = {'rows': 0, 'columns': 0}
+    
+    def restart(encoding):
+        merger.rollback(checkpoint)
+        totals.update(rows=0, columns=0)
+    
+    try:
+        for chunk in iter_csv_chunks(uploaded_file, on_restart=restart):
+            # 파일 전체에서 빈 열은 SpillMerger가 결과를 기록할 때 제외
+            chunk = clean_dataframe(chunk, drop_empty_columns=False)
+            chunk = add_source_columns(chunk, uploaded_file.name, merge_option)
+            merger.append(chunk)
+            totals['rows'] += len(chunk)
+            totals['columns'] = max(totals['columns'], len(chunk.columns))
+    except Exception:
+        merger.rollback(checkpoint)
+        raise
+    return totals['rows'], totals['columns']
+
+def spill_xlsx_chunks(merger, uploaded_file, sheet_name, merge_option):
+    """
+    대용량 xlsx를 읽기 전용 청크마다 정리하여 바로 디스크 분할 통합에 기록
+    
+    시트 전체를 데이터프레임으로 합치지 않고 캐시에도 보관하지 않으므로 메모리 사용량이 청크 크기로 유지됩니다.
+    읽는 도중 실패하면 이 파일에서 기록한 조각을 되돌립니다.
+    
+    Returns:
+        tuple: (행수, 열수)
+    """
+    checkpoint = merger.checkpoint()
+    rows = 0
+    columns = 0
+    try:
+        for chunk in iter_sheet_chunks(uploaded_file, sheet_name):
+            chunk = clean_dataframe(chunk, drop_empty_columns=False)
+            if chunk.empty:
+                continue
+            chunk = add_source_columns(chunk, uploaded_file.name, merge_option)
+            merger.append(chunk)
+            rows += len(chunk)
+            columns = max(columns, len(chunk.columns))
+    except Exception:
+        merger.rollback(checkpoint)
+        raise
+    return rows, columns
+
+def merge_excel_files(uploaded_files, merge_option, sheet_name=None, streaming=False, spill_dir=None):
+    """
+    엑셀 파일들을 통합
+    
+    spill_dir를 지정하면 파일마다 정리된 데이터를 Parquet 조각으로 디스크에 기록하고
+    SpillMerger를 반환합니다 (DataFrame처럼 len/columns/head 사용 가능).
+    """
     all_data = []
     file_info = []
+    merger = SpillMerger(spill_dir) if spill_dir else None
+    # 디스크 분할 통합은 파싱 결과를 메모리에 보관하지 않음 (공유 캐시에 이미 있는 결과만 사용)
+    cache = get_upload_cache()
+    store = merger is None
+    cached_files = 0
     
     try:
         for uploaded_file in uploaded_files:
             file_name = uploaded_file.name
+            # 같은 내용의 파일은 이전 실행의 파싱 결과 재사용
+            file_hash = upload_hash(uploaded_file)
+            
+            if merger is not None and file_name.endswith('.csv') and should_chunk_csv(uploaded_file.size):
+                try:
+                    rows, columns = spill_csv_chunks(merger, uploaded_file, merge_option)
+                except Exception as e:
+                    st.warning(f"⚠️ {file_name} 청크 읽기 실패: {str(e)}")
+                    continue
+                file_info.append({'파일명': file_name, '행수': rows, '열수': columns, '읽기': "csv 청크"})
+                continue
+            
+            if merger is not None and file_name.endswith('.xlsx') and (streaming or should_stream(uploaded_file.size)):
+                try:
+                    rows, columns = spill_xlsx_chunks(merger, uploaded_file, sheet_name, merge_option)
+                except Exception as e:
+                    st.warning(f"⚠️ {file_name} 스트리밍 읽기 실패: {str(e)}")
+                    continue
+                file_info.append({'파일명': file_name, '행수': rows, '열수': columns, '읽기': "xlsx 청크"})
+                continue
             
             # 파일 확장자에 따라 읽기
-            if file_name.endswith('.xlsx') or file_name.endswith('.xls'):
+            if file_name.endswith('.xlsx') and (streaming or should_stream(uploaded_file.size)):
+                try:
+                    # 읽기 전용 스트리밍 읽기 (대용량 파일)
+                    df, cached = cache.get_frame(file_hash, sheet_name, 'streaming',
+                                                 lambda: read_excel_streaming(uploaded_file, sheet_name),
+                                                 store=store)
+                except Exception as e:
+                    st.warning(f"⚠️ {file_name} 스트리밍 읽기 실패: {str(e)}")
+                    continue
+            elif file_name.endswith('.xlsx') or file_name.endswith('.xls'):
                 try:
                     # 안전한 Excel 읽기 함수 사용
-                    df = safe_read_excel(uploaded_file, sheet_name)
+                    df, cached = cache.get_frame(file_hash, sheet_name, 'excel',
+                                                 lambda: safe_read_excel(uploaded_file, sheet_name),
+                                                 store=store)
                 except Exception as e:
                     st.warning(f"⚠️ {file_name} 읽기 실패: {str(e)}")
                     continue
             elif file_name.endswith('.csv'):
-                df = pd.read_csv(uploaded_file, encoding='utf-8-sig')
+                try:
+                    # 인코딩 판별 후 pyarrow 엔진으로 읽기 (cp949/euc-kr 파일 포함)
+                    df, cached = cache.get_frame(file_hash, None, 'csv',
+                                                 lambda: read_sheet_auto(uploaded_file, file_format='csv'),
+                                                 store=store)
+                except Exception as e:
+                    st.warning(f"⚠️ {file_name} 읽기 실패: {str(e)}")
+                    continue
             else:
                 st.warning(f"⚠️ 지원하지 않는 파일 형식: {file_name}")
                 continue
             
-            # 데이터 정리
-            df = clean_dataframe(df)
+            if cached:
+                cached_files += 1
+            read_summary = "캐시" if cached else describe_read(df)
             
-            if merge_option == "파일명 추가":
-                df['파일명'] = file_name
-            elif merge_option == "폴더명 추가":
-                df['폴더명'] = os.path.dirname(file_name) or "루트"
+            # 데이터 정리
+            df = add_source_columns(clean_dataframe(df), file_name, merge_option)
             
-            all_data.append(df)
+            if merger is not None:
+                merger.append(df)
+            else:
+                all_data.append(df)
             file_info.append({
                 '파일명': file_name,
                 '행수': len(df),
-                '열수': len(df.columns)
+                '열수': len(df.columns),
+                '읽기': read_summary
             })
     
     except Exception as e:
         st.error(f"❌ 파일 처리 중 오류 발생: {str(e)}")
         return None, None
     
-    if not all_data:
+    if not file_info:
         st.error("❌ 처리할 수 있는 파일이 없습니다.")
         return None, None
     
+    if cached_files:
+        st.caption(f"⚡ 파싱 생략 (캐시 사용): {cached_files}/{len(file_info)}개 파일 · {cache.describe()}")
+    
+    if merger is not None:
+        # 머리글 맞추기는 모든 조각의 머리글로 계산하고, 빈 열 제외와 열 타입 통일은 결과를 기록할 때 조각별로 적용
+        alignment = merger.alignment
+        if alignment['renamed'] or alignment['collisions']:
+            with st.expander(f"🧩 열 구성 맞추기: {describe_alignment(alignment)}"):
+                st.text("\n".join(alignment_lines(alignment)))
+        return merger, file_info
+    
     # 데이터 통합
     try:
+        # 머리글 이름과 열 타입을 하나의 구성으로 맞춘 뒤 통합 (빈 합집합 열과 object 변환 방지)
+        all_data, alignment = align_frames(all_data)
+        if alignment['renamed'] or alignment['collisions'] or alignment['added']:
+            with st.expander(f"🧩 열 구성 맞추기: {describe_alignment(alignment)}"):
+                st.text("\n".join(alignment_lines(alignment)))
+        
         if merge_option == "단순 통합":
             merged_df = pd.concat(all_data, ignore_index=True)
         else:
             merged_df = pd.concat(all_data, ignore_index=True)
         
-        # 최종 정리
-        merged_df = clean_dataframe(merged_df)
+        # 파일마다 이미 정리했으므로 통합 후에는 열 타입 압축만 적용
+        # (디스크 분할 통합은 조각마다 범주가 달라 압축하지 않음)
+        merged_df, report = compact_dtypes(merged_df)
+        if report:
+            with st.expander(f"🗜️ 열 타입 압축: {describe_compaction(report)}"):
+                st.text("\n".join(compaction_lines(report)))
         
         return merged_df, file_info
     
@@ -462,16 +661,8 @@ def main():
                 try:
                     first_file = uploaded_files[0]
                     if first_file.name.endswith(('.xlsx', '.xls')):
-                        # 안전한 방법으로 시트 목록 가져오기
-                        import openpyxl
-                        from io import BytesIO
-                        
-                        first_file.seek(0)
-                        file_bytes = first_file.read()
-                        first_file.seek(0)
-                        
-                        wb = openpyxl.load_workbook(BytesIO(file_bytes), data_only=True)
-                        sheet_options.extend(wb.sheetnames)
+                        # 시트 목록 가져오기 (같은 파일이면 재실행 시 캐시 사용)
+                        sheet_options.extend(read_sheet_names(first_file))
                 except Exception as e:
                     st.warning(f"시트 목록을 가져올 수 없습니다: {e}")
                     pass
@@ -485,6 +676,29 @@ def main():
             if sheet_name == "모든 시트 (첫 번째 시트만)":
                 sheet_name = None
         
+        # 대용량 파일 읽기 옵션
+        streaming = st.checkbox(
+            "대용량 파일 스트리밍 읽기",
+            value=False,
+            help="xlsx 파일을 청크 단위로 읽어 메모리 사용량을 일정하게 유지합니다 (50MB 이상 파일은 자동 적용)"
+        )
+        
+        # 대용량 결과 저장 옵션
+        constant_memory = st.checkbox(
+            "저메모리 저장 (쓰기 전용)",
+            value=False,
+            help="결과 엑셀 파일을 행 단위로 바로 디스크에 기록하여 행 수와 관계없이 메모리 사용량을 일정하게 유지합니다"
+        )
+        
+        # 메모리보다 큰 통합 옵션
+        spill = st.checkbox(
+            "디스크 분할 통합 (메모리보다 큰 통합)",
+            value=False,
+            disabled=not PYARROW_AVAILABLE,
+            help="파일마다 정리된 데이터를 디스크(Parquet)에 기록한 뒤 나눠 읽으면서 결과를 저장합니다"
+                 + ("" if PYARROW_AVAILABLE else " (pyarrow 설치 필요)")
+        )
+        
         # 파일 저장 및 launcher.py 실행 버튼
         col1, col2 = st.columns(2)
         
@@ -518,10 +732,17 @@ def main():
                             st.markdown(f"**중복 파일 처리:** {len(duplicate_files)}개 파일에 타임스탬프 추가")
                         
                         # 파일 통합 실행 (launcher.py 실행 제거)
+                        # 이전 디스크 분할 통합 결과의 조각 파일 정리
+                        previous = st.session_state.get('merged_data')
+                        if isinstance(previous, SpillMerger):
+                            previous.cleanup()
+                        
                         merged_df, file_info = merge_excel_files(
                             uploaded_files, 
                             merge_option, 
-                            sheet_name
+                            sheet_name,
+                            streaming,
+                            spill_dir=str(Path(session_folder) / "분할통합") if spill else None
                         )
                         
                         if merged_df is not None:
@@ -545,14 +766,20 @@ def main():
                             with col3:
                                 st.metric("처리된 파일수", len(file_info))
                             
+                            # 이전 결과의 다운로드 파일은 다시 만들어야 함
+                            clear_published_downloads()
+                            st.session_state['download_files'] = {}
+                            st.session_state.pop('download_requested', None)
+                            
                             # 결과 파일 저장 및 폴더 열기
                             try:
                                 # 결과 파일 저장
                                 result_filename = f"통합데이터_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
                                 result_path = Path(session_folder) / result_filename
                                 
-                                with pd.ExcelWriter(result_path, engine='openpyxl') as writer:
-                                    merged_df.to_excel(writer, index=False, sheet_name='통합데이터')
+                                write_merged_result(merged_df, result_path, 'xlsx', constant_memory)
+                                # 저장된 결과 파일은 그대로 Excel 다운로드에 사용
+                                st.session_state['download_files'][download_key('xlsx')] = str(result_path)
                                 
                                 st.markdown(f"<div class='success-box'>💾 결과 파일이 저장되었습니다: {result_path}</div>", unsafe_allow_html=True)
                                 
@@ -572,27 +799,11 @@ def main():
                             except Exception as e:
                                 st.error(f"파일 저장 중 오류: {e}")
                             
-                            # 다운로드 섹션
-                            st.markdown("### 📥 다운로드")
-                            
-                            col1, col2 = st.columns(2)
-                            
-                            with col1:
-                                # CSV 다운로드
-                                csv_filename = f"통합데이터_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-                                csv_link = get_download_link(merged_df, csv_filename, "CSV 파일")
-                                st.markdown(csv_link, unsafe_allow_html=True)
-                            
-                            with col2:
-                                # Excel 다운로드
-                                excel_filename = f"통합데이터_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-                                excel_link = get_excel_download_link(merged_df, excel_filename, "Excel 파일")
-                                st.markdown(excel_link, unsafe_allow_html=True)
-                            
                             # 세션 상태에 저장
                             st.session_state['merged_data'] = merged_df
                             st.session_state['file_info'] = file_info
                             st.session_state['result_folder'] = session_folder
+                            st.session_state['constant_memory'] = constant_memory
     else:
         st.markdown("""
         <div class="file-uploader">
@@ -629,6 +840,23 @@ def main():
             except Exception as e:
                 st.error(f"폴더 열기 실패: {e}")
         
+        # 다운로드 섹션 (버튼을 눌러 다시 실행되어도 유지되도록 세션 상태 기준으로 표시)
+        st.markdown("### 📥 다운로드")
+        if PYARROW_AVAILABLE:
+            compression = st.selectbox(
+                "Parquet/Feather 압축",
+                COMPRESSIONS,
+                help="Parquet/Feather 파일은 열 타입(숫자, 날짜)을 그대로 저장합니다"
+            )
+        else:
+            compression = None
+        render_download_buttons(
+            st.session_state['merged_data'],
+            st.session_state['result_folder'],
+            st.session_state.get('constant_memory', False),
+            compression
+        )
+        
         # 결과 미리보기
         with st.expander("👀 결과 미리보기", expanded=False):
             st.dataframe(st.session_state['merged_data'].head(20), use_container_width=True)
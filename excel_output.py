@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+엑셀 결과 파일 저장
+시트 데이터를 한 번만 기록하면서 취소 행에 취소선 스타일을 함께 적용합니다.
+(저장 후 다시 열어서 스타일을 입히는 과정 없음)
+대용량 결과는 쓰기 전용(write-only) 모드로 행을 바로 디스크에 기록하여 메모리를 일정하게 유지합니다.
+"""
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, Side
+
+# 엑셀 시트 최대 행 수 (머리글 포함)
+EXCEL_MAX_ROWS = 1048576
+
+# 공용 스타일 이름
+HEADER_STYLE_NAME = '통합_머리글'
+CANCELLED_STYLE_NAME = '통합_취소행'
+
+def _make_named_styles():
+    """머리글과 취소 행에 쓰는 공용 스타일 생성 (pandas 머리글 모양과 동일)"""
+    thin = Side(style='thin')
+    header_style = NamedStyle(name=HEADER_STYLE_NAME)
+    header_style.font = Font(bold=True)
+    header_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    header_style.alignment = Alignment(horizontal='center', vertical='top')
+
+    cancelled_style = NamedStyle(name=CANCELLED_STYLE_NAME)
+    cancelled_style.font = Font(strike=True)
+
+    return header_style, cancelled_style
+
+def to_cell_value(value):
+    """pandas/numpy 값을 엑셀 셀에 쓸 수 있는 값으로 변환 (결측값은 빈 셀)"""
+    if value is None:
+        return None
+    try:
+        if pd.isna(value):
+            return None
+    except (TypeError, ValueError):
+        # 리스트 등 배열형 값은 문자열로 기록
+        return str(value)
+
+    if isinstance(value, np.datetime64):
+        return pd.Timestamp(value).to_pydatetime()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+def combine_sheet_frames(data, cancelled_data):
+    """
+    일반 행 뒤에 취소 행을 붙인 데이터프레임과 취소 행 시작 위치 반환
+
+    취소 행은 같은 시트에서 나온 것이므로 열 이름이 아니라 위치로 이어 붙입니다
+    (중복 머리글이나 빈 머리글이 여러 개인 시트도 열 순서와 이름을 그대로 유지).
+    """
+    if cancelled_data is None or cancelled_data.empty:
+        return data, len(data)
+
+    if cancelled_data.shape[1] != data.shape[1]:
+        if data.columns.is_unique and cancelled_data.columns.is_unique:
+            return pd.concat([data, cancelled_data], ignore_index=True), len(data)
+        # 열 수가 다르고 이름으로도 맞출 수 없으면 모자란 열은 빈 값으로 채움
+        width = max(data.shape[1], cancelled_data.shape[1])
+        data = data.set_axis(range(data.shape[1]), axis=1).reindex(columns=range(width))
+        cancelled_data = cancelled_data.set_axis(range(cancelled_data.shape[1]), axis=1).reindex(columns=range(width))
+
+    columns = [
+        pd.concat([data.iloc[:, position], cancelled_data.iloc[:, position]], ignore_index=True).rename(position)
+        for position in range(data.shape[1])
+    ]
+    combined = pd.concat(columns, axis=1).set_axis(data.columns, axis=1)
+    return combined, len(data)
+
+class StyledExcelWriter:
+    def __init__(self, output_path, constant_memory=False):
+        """
+        엑셀 결과 파일 작성기
+
+        Args:
+            output_path: 저장할 파일 경로 또는 파일 객체
+            constant_memory: True면 쓰기 전용(write-only) 모드로 행을 바로 디스크에 기록하여
+                             행 수와 관계없이 메모리 사용량을 일정하게 유지
+        """
+        self.output_path = output_path
+        self.constant_memory = constant_memory
+        self.wb = Workbook(write_only=constant_memory)
+        if not constant_memory:
+            self.wb.remove(self.wb.active)
+
+        header_style, cancelled_style = _make_named_styles()
+        self.wb.add_named_style(header_style)
+        self.wb.add_named_style(cancelled_style)
+
+        self._sheet_names = []
+
+    @property
+    def sheet_names(self):
+        """지금까지 생성된 시트명 목록"""
+        return list(self._sheet_names)
+
+    def _styled_row(self, ws, values, style_name):
+        """스타일이 적용된 한 행의 셀 목록 (쓰기 전용 모드용)"""
+        cells = []
+        for value in values:
+            cell = WriteOnlyCell(ws, value=value)
+            cell.style = style_name
+            cells.append(cell)
+        return cells
+
+    def _create_sheet(self, sheet_name, header):
+        """시트를 만들고 머리글 행 기록"""
+        ws = self.wb.create_sheet(title=sheet_name)
+        if self.constant_memory:
+            ws.append(self._styled_row(ws, header, HEADER_STYLE_NAME))
+        else:
+            ws.append(header)
+            for cell in ws[1]:
+                cell.style = HEADER_STYLE_NAME
+        return ws
+
+    def _append_row(self, ws, values, cancelled=False):
+        """데이터 행 하나 기록 (취소 행은 기록하면서 바로 취소선 적용)"""
+        if self.constant_memory:
+            # 쓰기 전용: 셀 객체를 보관하지 않고 행 단위로 임시 파일에 기록
+            ws.append(self._styled_row(ws, values, CANCELLED_STYLE_NAME) if cancelled else values)
+            return
+
+        ws.append(values)
+        if cancelled:
+            for cell in ws[ws.max_row]:
+                cell.style = CANCELLED_STYLE_NAME
+
+    def add_sheet(self, sheet_name, data, cancelled_data=None):
+        """
+        시트 하나를 기록 (취소 행은 일반 행 뒤에 취소선 스타일로 기록)
+
+        Args:
+            sheet_name: 시트명 (clean_sheet_name으로 정리된 이름)
+            data: 일반 행 데이터프레임
+            cancelled_data: 취소 행 데이터프레임 (없으면 None)
+        """
+        combined, cancelled_start = combine_sheet_frames(data, cancelled_data)
+        header = [to_cell_value(col) for col in combined.columns]
+        rows = combined.itertuples(index=False, name=None)
+
+        ws = self._create_sheet(sheet_name, header)
+        try:
+            for row_position, row in enumerate(rows):
+                self._append_row(ws, [to_cell_value(value) for value in row],
+                                 cancelled=row_position >= cancelled_start)
+        except Exception:
+            # 쓰기 전용 모드는 이미 기록된 시트를 되돌릴 수 없음
+            if not self.constant_memory:
+                self.wb.remove(ws)
+            raise
+
+        self._sheet_names.append(sheet_name)
+
+    def add_sheet_chunks(self, sheet_name, columns, chunks):
+        """
+        데이터프레임 청크를 이어서 시트 하나로 기록 (전체 데이터를 메모리에 올리지 않음)
+
+        엑셀 시트 행 한도를 넘으면 '시트명_2', '시트명_3' ... 시트로 이어서 기록합니다.
+
+        Args:
+            sheet_name: 시트명
+            columns: 머리글 열 이름 목록
+            chunks: 데이터프레임 청크 순회 객체
+
+        Returns:
+            list: 생성된 시트명 목록
+        """
+        header = [to_cell_value(col) for col in columns]
+        created = [sheet_name]
+        ws = self._create_sheet(sheet_name, header)
+        self._sheet_names.append(sheet_name)
+        written = 0
+
+        for chunk in chunks:
+            for row in chunk.itertuples(index=False, name=None):
+                if written == EXCEL_MAX_ROWS - 1:
+                    suffix = f"_{len(created) + 1}"
+                    next_name = sheet_name[:31 - len(suffix)] + suffix
+                    ws = self._create_sheet(next_name, header)
+                    self._sheet_names.append(next_name)
+                    created.append(next_name)
+                    written = 0
+
+                self._append_row(ws, [to_cell_value(value) for value in row])
+                written += 1
+
+        return created
+
+    def save(self):
+        """파일 저장 (한 번만 호출)"""
+        if not self._sheet_names:
+            raise Exception("생성된 시트가 없습니다")
+        self.wb.save(self.output_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.save()
+        return False
+
+def write_styled_sheets(output_path, sheets, log=print, constant_memory=False, progress=None):
+    """
+    시트 목록을 엑셀 파일로 한 번에 저장 (취소 행은 취소선 스타일)
+
+    Args:
+        output_path: 저장할 파일 경로
+        sheets: [{'sheet_name', 'data', 'cancelled_data'}, ...]
+        log: 진행 메시지를 출력할 함수
+        constant_memory: 쓰기 전용 모드로 저장할지 여부
+        progress: 시트마다 (처리한 시트 수, 전체 시트 수)로 호출할 함수
+
+    Returns:
+        int: 생성된 시트 수
+    """
+    writer = StyledExcelWriter(output_path, constant_memory=constant_memory)
+
+    for index, sheet in enumerate(sheets, 1):
+        sheet_name = sheet['sheet_name']
+        try:
+            writer.add_sheet(sheet_name, sheet['data'], sheet.get('cancelled_data'))
+            log(f"  📄 시트 생성: {sheet_name}")
+        except Exception as e:
+            log(f"❌ 시트 생성 실패: {sheet_name} - {e}")
+            continue
+        finally:
+            if progress is not None:
+                progress(index, len(sheets))
+
+    writer.save()
+    return len(writer.sheet_names)
+
+def write_dataframe(output_path, df, sheet_name='통합데이터', constant_memory=False):
+    """데이터프레임 하나를 시트 하나로 저장"""
+    with StyledExcelWriter(output_path, constant_memory=constant_memory) as writer:
+        writer.add_sheet(sheet_name, df)
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+통합 대상 파일 준비 (작업 폴더로 복사하지 않는 방식)
+선택한 파일을 매번 작업 폴더로 복사하지 않고 원본 경로에서 바로 읽거나,
+같은 디스크라면 하드 링크(또는 지원하는 파일 시스템에서는 reflink)로 작업 폴더에 연결합니다.
+내용이 같은 파일은 내용 해시로 한 번만 통합합니다 (크기가 같은 파일끼리만 해시 계산).
+"""
+
+import os
+import shutil
+from merge_cache import file_hash
+
+try:
+    import fcntl  # reflink(FICLONE)에 필요 (리눅스)
+except ImportError:
+    fcntl = None
+
+# 화면 표시 이름 → 준비 방식
+STAGING_MODES = {"원본에서 바로": 'direct', "하드 링크": 'link', "복사": 'copy'}
+
+# 리눅스 FICLONE ioctl 번호 (btrfs, xfs 등에서 내용 공유 복사)
+FICLONE = 0x40049409
+
+def is_in_use(file_path):
+    """다른 프로그램(엑셀 등)이 파일을 열고 있는지 확인"""
+    try:
+        with open(file_path, 'r+b'):
+            return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+
+def find_duplicates(file_paths):
+    """
+    내용이 같은 파일 찾기
+
+    크기가 같은 파일끼리만 내용 해시를 계산하므로 대부분의 파일은 읽지 않습니다.
+
+    Returns:
+        dict: {중복 파일 경로: 먼저 나온 같은 내용 파일 경로}
+    """
+    by_size = {}
+    for file_path in file_paths:
+        try:
+            by_size.setdefault(os.path.getsize(file_path), []).append(file_path)
+        except OSError:
+            continue
+
+    duplicates = {}
+    for same_size in by_size.values():
+        if len(same_size) < 2:
+            continue
+        first_by_hash = {}
+        for file_path in same_size:
+            try:
+                digest = file_hash(file_path)
+            except OSError:
+                continue
+            if digest in first_by_hash:
+                duplicates[file_path] = first_by_hash[digest]
+            else:
+                first_by_hash[digest] = file_path
+    return duplicates
+
+def _reflink(src, dest):
+    """reflink로 복사 (지원하지 않으면 OSError)"""
+    if fcntl is None:
+        raise OSError("reflink를 지원하지 않는 환경")
+    with open(src, 'rb') as source, open(dest, 'wb') as target:
+        try:
+            fcntl.ioctl(target.fileno(), FICLONE, source.fileno())
+        except OSError:
+            target.close()
+            os.remove(dest)
+            raise
+    shutil.copystat(src, dest)
+
+def same_content(src, dest):
+    """이미 있는 작업 폴더 파일이 원본과 같은지 (같은 파일이거나 내용 해시가 같음)"""
+    if os.path.samefile(src, dest):
+        return True
+    if os.path.getsize(src) != os.path.getsize(dest):
+        return False
+    return file_hash(src) == file_hash(dest)
+
+def link_or_copy(src, dest, mode):
+    """
+    작업 폴더에 파일 연결
+
+    'link'는 하드 링크 → reflink → 복사 순으로 시도하고, 'copy'는 항상 복사합니다.
+
+    Returns:
+        str: 실제로 사용한 방식 ('하드 링크', 'reflink', '복사')
+    """
+    if mode == 'link':
+        try:
+            os.link(src, dest)
+            return "하드 링크"
+        except OSError:
+            pass
+        try:
+            _reflink(src, dest)
+            return "reflink"
+        except OSError:
+            pass
+    shutil.copy2(src, dest)
+    return "복사"
+
+def stage_files(file_paths, work_folder, mode='direct', log=print, set_status=None):
+    """
+    통합할 파일 준비
+
+    Args:
+        file_paths: 선택한 파일 경로 목록
+        work_folder: 작업 폴더 ('link'/'copy' 방식에서 파일을 둘 곳)
+        mode: 'direct'(원본 경로 그대로), 'link'(하드 링크/reflink, 안 되면 복사), 'copy'(복사)
+        log: 진행 메시지를 출력할 함수
+        set_status: 파일 상태를 표시할 함수 (파일명, 상태)
+
+    Returns:
+        list: 통합에 사용할 파일 경로 목록 (선택한 순서)
+    """
+    set_status = set_status or (lambda filename, status: None)
+    staged = []
+
+    present = []
+    for file_path in file_paths:
+        if os.path.exists(file_path):
+            present.append(file_path)
+        else:
+            log(f"❌ 원본 파일이 존재하지 않음: {os.path.basename(file_path)}")
+            set_status(os.path.basename(file_path), "원본없음")
+
+    duplicates = find_duplicates(present)
+    used_names = set()
+
+    for file_path in present:
+        filename = os.path.basename(file_path)
+
+        if file_path in duplicates:
+            log(f"동일한 내용의 파일, 건너뜀: {filename} (= {os.path.basename(duplicates[file_path])})")
+            set_status(filename, "중복")
+            continue
+
+        if is_in_use(file_path):
+            log(f"⚠️ 파일이 사용 중입니다. 닫고 다시 시도하세요: {filename}")
+            set_status(filename, "사용중")
+            continue
+
+        if mode == 'direct':
+            staged.append(file_path)
+            set_status(filename, "준비완료")
+            continue
+
+        # 다른 폴더의 같은 이름 파일이 서로 덮어쓰지 않도록 이름 구분
+        stem, ext = os.path.splitext(filename)
+        dest_name, number = filename, 1
+        while dest_name in used_names:
+            number += 1
+            dest_name = f"{stem}_{number}{ext}"
+        used_names.add(dest_name)
+        dest_path = os.path.join(work_folder, dest_name)
+
+        try:
+            if os.path.exists(dest_path):
+                if same_content(file_path, dest_path):
+                    log(f"동일한 파일 존재, 그대로 사용: {dest_name}")
+                    staged.append(dest_path)
+                    set_status(filename, "준비완료")
+                    continue
+                if is_in_use(dest_path):
+                    log(f"⚠️ 작업 폴더의 파일이 사용 중입니다. 닫고 다시 시도하세요: {dest_name}")
+                    set_status(filename, "사용중")
+                    continue
+                os.remove(dest_path)
+
+            method = link_or_copy(file_path, dest_path, mode)
+            staged.append(dest_path)
+            set_status(filename, "준비완료")
+            log(f"파일 {method}: {dest_name}")
+        except PermissionError as e:
+            log(f"권한 오류 - {filename}: {e}")
+            set_status(filename, "권한오류")
+        except Exception as e:
+            log(f"파일 준비 실패 {filename}: {e}")
+            set_status(filename, "준비실패")
+
+    return staged
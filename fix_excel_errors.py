@@ -11,7 +11,6 @@ import tempfile
 from pathlib import Path
 import pandas as pd
 import openpyxl
-from io import BytesIO
 
 def fix_excel_file(input_path, output_path=None):
     """Excel 파일의 스타일 오류를 수정합니다."""
@@ -21,34 +20,32 @@ def fix_excel_file(input_path, output_path=None):
         
         print(f"🔧 파일 수정 중: {os.path.basename(input_path)}")
         
-        # 1단계: 원본 파일을 메모리로 읽기
-        with open(input_path, 'rb') as f:
-            file_bytes = f.read()
+        # 1단계: openpyxl 읽기 전용 모드로 워크북 열기 (스타일 무시, 스트리밍)
+        wb = openpyxl.load_workbook(input_path, read_only=True, data_only=True)
         
-        # 2단계: openpyxl로 워크북 열기 (스타일 무시)
-        wb = openpyxl.load_workbook(BytesIO(file_bytes), data_only=True)
+        # 2단계: 쓰기 전용 새 워크북 생성 (행 단위로 디스크에 기록)
+        new_wb = openpyxl.Workbook(write_only=True)
         
-        # 3단계: 새 워크북 생성
-        new_wb = openpyxl.Workbook()
-        new_wb.remove(new_wb.active)  # 기본 시트 제거
+        # 3단계: 각 시트를 새 워크북에 행 단위로 복사
+        try:
+            for sheet_name in wb.sheetnames:
+                try:
+                    ws = wb[sheet_name]
+                    new_ws = new_wb.create_sheet(title=sheet_name)
+                    
+                    # 데이터만 복사 (스타일 제외)
+                    for row in ws.iter_rows(values_only=True):
+                        new_ws.append(row)
+                    
+                    print(f"  ✅ 시트 복사 완료: {sheet_name}")
+                    
+                except Exception as e:
+                    print(f"  ⚠️ 시트 복사 실패: {sheet_name} - {e}")
+                    continue
+        finally:
+            wb.close()
         
-        # 4단계: 각 시트를 새 워크북에 복사
-        for sheet_name in wb.sheetnames:
-            try:
-                ws = wb[sheet_name]
-                new_ws = new_wb.create_sheet(title=sheet_name)
-                
-                # 데이터만 복사 (스타일 제외)
-                for row in ws.iter_rows(values_only=True):
-                    new_ws.append(row)
-                
-                print(f"  ✅ 시트 복사 완료: {sheet_name}")
-                
-            except Exception as e:
-                print(f"  ⚠️ 시트 복사 실패: {sheet_name} - {e}")
-                continue
-        
-        # 5단계: 수정된 파일 저장
+        # 4단계: 수정된 파일 저장
         new_wb.save(output_path)
         print(f"✅ 수정 완료: {os.path.basename(output_path)}")
         return True
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+데이터프레임 정리
+빈 행/열을 제거하고 문자열 셀의 앞뒤 공백만 제거합니다 (숫자/날짜 셀과 결측값은 그대로 유지).
+열 타입 압축은 dtype_compaction 모듈에서 통합이 끝난 뒤에 적용합니다.
+"""
+
+import pandas as pd
+
+def text_kind(column):
+    """
+    문자열 열 종류 판별
+
+    Returns:
+        str: 'string'(모든 값이 문자열), 'mixed'(문자열과 다른 값이 섞임) 또는 None(문자열 없음)
+    """
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return None
+    if column.dtype != object:
+        # pandas 문자열 타입(str/string)은 결측값 외에는 모두 문자열
+        return 'string' if pd.api.types.is_string_dtype(column.dtype) else None
+
+    inferred = pd.api.types.infer_dtype(column, skipna=True)
+    if inferred == 'string':
+        return 'string'
+    if inferred in ('empty', 'bytes'):
+        return None
+    if inferred.startswith('mixed'):
+        return 'mixed'
+    return None
+
+def strip_text_cells(column):
+    """
+    문자열 셀의 앞뒤 공백 제거 (결측값은 결측값으로, 숫자/날짜 셀은 원래 값으로 유지)
+
+    Args:
+        column: 정리할 열 (Series)
+
+    Returns:
+        Series: 정리된 열 (문자열이 없으면 입력 그대로)
+    """
+    kind = text_kind(column)
+    if kind is None:
+        return column
+    if column.dtype != object:
+        # pandas 문자열 타입은 벡터화된 strip 사용 (결측값 유지)
+        return column.str.strip()
+
+    # object 열은 문자열 셀만 골라 strip (.str 접근자는 숫자 셀을 결측값으로 바꿈)
+    stripped = [value.strip() if isinstance(value, str) else value for value in column.to_numpy()]
+    return pd.Series(stripped, index=column.index, name=column.name, dtype=object)
+
+def clean_dataframe(df, drop_empty_columns=True):
+    """
+    데이터프레임 정리 (파일마다 한 번 적용)
+
+    빈 행과 빈 열을 제거하고 문자열 셀의 앞뒤 공백을 제거합니다.
+    열 타입은 바꾸지 않으므로 결측값이 'nan' 문자열이 되지 않습니다.
+
+    Args:
+        df: 원본 데이터프레임
+        drop_empty_columns: 빈 열 제거 여부 (청크 단위로 정리할 때는 False,
+                            한 청크에서만 빈 열을 지우면 열 순서가 청크마다 달라짐)
+
+    Returns:
+        DataFrame: 정리된 데이터프레임
+    """
+    # 빈 행 제거
+    df = df.dropna(how='all')
+
+    # 빈 열 제거
+    if drop_empty_columns:
+        df = df.dropna(axis=1, how='all')
+
+    # 문자열 셀만 앞뒤 공백 제거
+    for position in range(df.shape[1]):
+        column = df.iloc[:, position]
+        stripped = strip_text_cells(column)
+        if stripped is not column:
+            df.isetitem(position, stripped)
+
+    return df
@@ -60,7 +60,9 @@ def main():
             '--server.port', str(port),
             '--server.headless', 'true',
             '--browser.gatherUsageStats', 'false',
-            '--server.fileWatcherType', 'none'
+            '--server.fileWatcherType', 'none',
+            # 결과 파일을 static/downloads 경로로 나눠 보내기 (메모리에 올리지 않음)
+            '--server.enableStaticServing', 'true'
         ]
         
         subprocess.run(cmd)
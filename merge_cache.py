@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+증분 통합 캐시
+폴더 통합을 다시 실행할 때 바뀌지 않은 파일은 다시 파싱하지 않도록
+파일별 처리 결과와 매니페스트(경로, 크기, 수정 시각, 내용 해시)를 작업 폴더에 보관합니다.
+
+크기와 수정 시각이 같으면 해시 계산 없이 재사용하고, 달라졌어도 내용 해시가 같으면 재사용합니다.
+처리 결과는 데이터프레임마다 Parquet 파일 하나와 나머지 구조를 담은 JSON 메타데이터로 저장합니다.
+캐시 폴더는 공유 폴더에 있을 수 있으므로 읽을 때 코드를 실행할 수 있는 pickle은 사용하지 않습니다.
+(헤더 없이 읽은 시트처럼 숫자와 문자열이 섞인 열은 값마다 타입을 붙인 JSON 문자열로 저장해 그대로 되살림)
+"""
+
+import os
+import json
+import uuid
+import base64
+import shutil
+import hashlib
+import datetime as dt
+import tempfile
+import importlib
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# 작업 폴더 안의 캐시 폴더 이름
+CACHE_DIR_NAME = '.통합캐시'
+
+# 매니페스트 파일 이름
+MANIFEST_NAME = 'manifest.json'
+
+# 처리 결과 폴더 안의 메타데이터 파일 이름
+RESULT_META_NAME = 'result.json'
+
+# 저장 형식이 바뀌면 올려서 이전 캐시를 무효화 (2: pickle → Parquet + JSON)
+CACHE_VERSION = 2
+
+# 캐시에서 되살릴 수 있는 객체 타입 (모듈.클래스 이름, 이 목록 밖의 타입은 저장하지 않음)
+CACHEABLE_TYPES = {'workbook_reader.WorkbookReader'}
+
+def file_signature(file_path):
+    """파일 크기와 수정 시각 (나노초)"""
+    stat = os.stat(file_path)
+    return stat.st_size, stat.st_mtime_ns
+
+def file_hash(file_path, chunk_size=1024 * 1024):
+    """파일 내용의 SHA-256 해시 (청크 단위로 읽음)"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _encode_value(value):
+    """셀 값 하나를 [타입, 값] 형태로 변환 (JSON으로 저장 가능)"""
+    if value is None:
+        return ['n']
+    if value is pd.NaT:
+        return ['nat']
+    if isinstance(value, (bool, np.bool_)):
+        return ['b', bool(value)]
+    if isinstance(value, (int, np.integer)):
+        return ['i', int(value)]
+    if isinstance(value, (float, np.floating)):
+        return ['x'] if np.isnan(value) else ['f', float(value)]
+    if isinstance(value, str):
+        return ['s', value]
+    if isinstance(value, pd.Timestamp):
+        return ['ts', value.isoformat()]
+    if isinstance(value, dt.datetime):
+        return ['dt', value.isoformat()]
+    if isinstance(value, dt.date):
+        return ['d', value.isoformat()]
+    if isinstance(value, dt.time):
+        return ['h', value.isoformat()]
+    if isinstance(value, (pd.Timedelta, dt.timedelta)):
+        return ['td', pd.Timedelta(value).value]
+    if isinstance(value, bytes):
+        return ['y', base64.b64encode(value).decode('ascii')]
+    if value is pd.NA:
+        return ['na']
+    # 그 밖의 값은 문자열로 저장
+    return ['s', str(value)]
+
+def _decode_value(item):
+    """_encode_value 결과를 셀 값으로 복원"""
+    tag = item[0]
+    if tag == 'n':
+        return None
+    if tag == 'x':
+        return np.nan
+    if tag == 'nat':
+        return pd.NaT
+    if tag == 'na':
+        return pd.NA
+    value = item[1]
+    if tag in ('b', 'i', 'f', 's'):
+        return value
+    if tag == 'ts':
+        return pd.Timestamp(value)
+    if tag == 'dt':
+        return dt.datetime.fromisoformat(value)
+    if tag == 'd':
+        return dt.date.fromisoformat(value)
+    if tag == 'h':
+        return dt.time.fromisoformat(value)
+    if tag == 'td':
+        return pd.Timedelta(value)
+    if tag == 'y':
+        return base64.b64decode(value)
+    raise ValueError(f"알 수 없는 캐시 값 타입: {tag}")
+
+def _tagged_array(series):
+    """값마다 타입을 붙인 JSON 문자열 배열 (숫자와 문자열이 섞인 열용)"""
+    return pa.array([json.dumps(_encode_value(value), ensure_ascii=False) for value in series], type=pa.string())
+
+def _write_frame(df, path):
+    """
+    데이터프레임을 Parquet 파일로 저장
+
+    Returns:
+        dict: 열 이름, 타입, 인덱스 등 되살리는 데 필요한 정보
+    """
+    series_list = [df.iloc[:, position] for position in range(df.shape[1])]
+    has_index = not df.index.equals(pd.RangeIndex(len(df)))
+    if has_index:
+        series_list.append(df.index.to_series())
+
+    arrays, columns = [], []
+    for series in series_list:
+        tagged = series.dtype == object
+        if not tagged:
+            try:
+                array = pa.Array.from_pandas(series)
+            except (pa.ArrowException, TypeError, ValueError):
+                tagged = True
+        if tagged:
+            array = _tagged_array(series)
+        arrays.append(array)
+        columns.append({'dtype': str(series.dtype), 'tagged': tagged})
+
+    names = [f"c{position}" for position in range(len(arrays))]
+    table = pa.Table.from_arrays(arrays, names=names) if arrays else pa.table({})
+    pq.write_table(table, path)
+
+    return {
+        'rows': len(df),
+        'labels': [_encode_value(label) for label in df.columns],
+        'labels_dtype': str(df.columns.dtype),
+        'labels_name': _encode_value(df.columns.name),
+        'columns': columns,
+        'index': has_index,
+        'index_name': _encode_value(df.index.name),
+        'attrs': _encode(dict(df.attrs), None, []),
+    }
+
+def _restore_series(array, info):
+    """Parquet 열 하나를 원래 타입의 시리즈로 복원"""
+    if info['tagged']:
+        series = pd.Series([_decode_value(json.loads(text)) for text in array.to_pylist()], dtype=object)
+        if info['dtype'] != 'object':
+            series = series.astype(info['dtype'])
+        return series
+    series = array.to_pandas()
+    if str(series.dtype) != info['dtype']:
+        try:
+            series = series.astype(info['dtype'])
+        except (TypeError, ValueError):
+            pass
+    return series
+
+def _read_frame(path, meta):
+    """_write_frame으로 저장한 데이터프레임 복원"""
+    table = pq.read_table(path)
+    series_list = [_restore_series(table.column(position).combine_chunks(), info)
+                   for position, info in enumerate(meta['columns'])]
+    index = pd.RangeIndex(meta['rows'])
+    if meta['index']:
+        index = pd.Index(series_list.pop())
+    index.name = _decode_value(meta['index_name'])
+
+    labels = [_decode_value(item) for item in meta['labels']]
+    try:
+        columns = pd.Index(labels, dtype=meta['labels_dtype'])
+    except (TypeError, ValueError):
+        columns = pd.Index(labels, dtype=object)
+    columns.name = _decode_value(meta['labels_name'])
+
+    # 시리즈 그대로 넘겨야 object 열이 문자열 타입으로 추론되지 않음
+    data = {position: series.set_axis(index) for position, series in enumerate(series_list)}
+    df = pd.DataFrame(data, index=index, columns=range(len(series_list)))
+    df.columns = columns
+    df.attrs = _decode(meta['attrs'], None)
+    return df
+
+def _encode(value, folder, frames):
+    """
+    처리 결과(dict/list/데이터프레임/허용된 객체)를 JSON으로 저장 가능한 구조로 변환
+
+    데이터프레임은 folder에 Parquet 파일로 저장하고 파일 이름만 남깁니다.
+    """
+    if isinstance(value, pd.DataFrame):
+        name = f"frame-{len(frames):04d}.parquet"
+        frames.append(name)
+        return {'frame': name, 'meta': _write_frame(value, os.path.join(folder, name))}
+    if isinstance(value, dict):
+        return {'dict': [[_encode(key, folder, frames), _encode(item, folder, frames)] for key, item in value.items()]}
+    if isinstance(value, (list, tuple)):
+        return {'list' if isinstance(value, list) else 'tuple': [_encode(item, folder, frames) for item in value]}
+    type_name = f"{type(value).__module__}.{type(value).__qualname__}"
+    if type_name in CACHEABLE_TYPES:
+        return {'object': type_name, 'state': _encode(vars(value), folder, frames)}
+    if value is None or value is pd.NaT or value is pd.NA or \
+            isinstance(value, (str, int, float, bool, np.generic, dt.date, dt.time, dt.timedelta, bytes)):
+        return {'value': _encode_value(value)}
+    raise TypeError(f"캐시에 저장할 수 없는 타입: {type_name}")
+
+def _decode(value, folder):
+    """_encode 결과를 처리 결과로 복원"""
+    if 'frame' in value:
+        return _read_frame(os.path.join(folder, os.path.basename(value['frame'])), value['meta'])
+    if 'dict' in value:
+        return {_decode(key, folder): _decode(item, folder) for key, item in value['dict']}
+    if 'list' in value:
+        return [_decode(item, folder) for item in value['list']]
+    if 'tuple' in value:
+        return tuple(_decode(item, folder) for item in value['tuple'])
+    if 'object' in value:
+        type_name = value['object']
+        if type_name not in CACHEABLE_TYPES:
+            raise ValueError(f"캐시에서 되살릴 수 없는 타입: {type_name}")
+        module_name, class_name = type_name.rsplit('.', 1)
+        cls = getattr(importlib.import_module(module_name), class_name)
+        obj = cls.__new__(cls)
+        obj.__dict__.update(_decode(value['state'], folder))
+        return obj
+    return _decode_value(value['value'])
+
+class IncrementalMergeCache:
+    def __init__(self, folder_path, cache_dir=None):
+        """
+        증분 통합 캐시
+
+        Args:
+            folder_path: 통합 대상 폴더
+            cache_dir: 캐시 폴더 (기본값: 대상 폴더 안의 '.통합캐시')
+        """
+        self.cache_dir = cache_dir or os.path.join(folder_path, CACHE_DIR_NAME)
+        self.manifest_path = os.path.join(self.cache_dir, MANIFEST_NAME)
+        self.entries = self._load_manifest()
+        self._used = set()
+        self._pending = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _load_manifest(self):
+        """매니페스트 읽기 (없거나 버전이 다르면 빈 매니페스트)"""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if manifest.get('version') != CACHE_VERSION:
+            self._remove_legacy_results()
+            return {}
+        return manifest.get('entries', {})
+
+    def _remove_legacy_results(self):
+        """이전 형식(pickle) 결과 파일은 읽지 않고 삭제"""
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return
+        for name in names:
+            if name.endswith('.pkl'):
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass
+
+    def _entry_key(self, file_path, stage_key):
+        return f"{stage_key}|{os.path.abspath(file_path)}"
+
+    def _result_dir(self, entry):
+        return os.path.join(self.cache_dir, os.path.basename(entry['result_dir']))
+
+    def _remove_result(self, entry):
+        shutil.rmtree(self._result_dir(entry), ignore_errors=True)
+
+    def _snapshot(self, key, file_path):
+        """처리 전에 파일 크기/수정 시각/내용 해시를 기록 (put에서 이 값으로 저장)"""
+        try:
+            size, mtime_ns = file_signature(file_path)
+            self._pending[key] = (size, mtime_ns, file_hash(file_path))
+        except OSError:
+            self._pending.pop(key, None)
+
+    def get(self, file_path, stage_key):
+        """
+        바뀌지 않은 파일의 이전 처리 결과 조회
+
+        결과가 없으면 지금(처리 전) 파일 상태를 기록해 두므로, 처리 후 put을 호출하면
+        처리 중에 파일이 바뀌어도 바뀌기 전 상태의 결과로 잘못 저장되지 않습니다.
+
+        Args:
+            file_path: 원본 파일 경로
+            stage_key: 처리 방식 구분 (처리 방식/옵션이 다르면 다른 결과로 취급)
+
+        Returns:
+            이전 처리 결과, 파일이 바뀌었거나 결과가 없으면 None
+        """
+        key = self._entry_key(file_path, stage_key)
+        entry = self.entries.get(key)
+        if entry is None or not PYARROW_AVAILABLE:
+            self.misses += 1
+            self._snapshot(key, file_path)
+            return None
+
+        try:
+            size, mtime_ns = file_signature(file_path)
+            if (size, mtime_ns) != (entry['size'], entry['mtime_ns']):
+                # 수정 시각만 바뀐 경우(복사 등)는 내용 해시로 확인
+                sha256 = file_hash(file_path) if size == entry['size'] else None
+                if sha256 != entry['sha256']:
+                    self.misses += 1
+                    self._pending[key] = (size, mtime_ns, sha256 or file_hash(file_path))
+                    return None
+                entry['mtime_ns'] = mtime_ns
+
+            result_dir = self._result_dir(entry)
+            with open(os.path.join(result_dir, RESULT_META_NAME), 'r', encoding='utf-8') as f:
+                result = _decode(json.load(f), result_dir)
+        except Exception:
+            self.misses += 1
+            self._snapshot(key, file_path)
+            return None
+
+        self._used.add(key)
+        self.hits += 1
+        return result
+
+    def put(self, file_path, stage_key, result):
+        """
+        파일 처리 결과 저장 (저장 실패는 통합에 영향을 주지 않음)
+
+        get에서 기록한 처리 전 파일 상태로 저장하고, 처리하는 동안 파일이 바뀌었으면 저장하지 않습니다.
+        """
+        if not PYARROW_AVAILABLE:
+            return False
+
+        key = self._entry_key(file_path, stage_key)
+        snapshot = self._pending.pop(key, None)
+        try:
+            if snapshot is None:
+                # get 없이 호출된 경우 (처리 전 상태를 알 수 없으면 저장하지 않음)
+                return False
+            size, mtime_ns, sha256 = snapshot
+            if file_signature(file_path) != (size, mtime_ns):
+                return False
+
+            os.makedirs(self.cache_dir, exist_ok=True)
+            key_hash = hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+            result_dir = f"{key_hash}-{uuid.uuid4().hex[:8]}"
+            temp_dir = tempfile.mkdtemp(dir=self.cache_dir, prefix='.tmp-')
+            try:
+                meta = _encode(result, temp_dir, [])
+                with open(os.path.join(temp_dir, RESULT_META_NAME), 'w', encoding='utf-8') as f:
+                    json.dump(meta, f, ensure_ascii=False)
+                os.replace(temp_dir, os.path.join(self.cache_dir, result_dir))
+            except Exception:
+                shutil.rmtree(temp_dir, ignore_errors=True)
+                raise
+        except Exception:
+            return False
+
+        previous = self.entries.get(key)
+        if previous is not None:
+            self._remove_result(previous)
+
+        self.entries[key] = {
+            'path': os.path.abspath(file_path),
+            'stage': stage_key,
+            'size': size,
+            'mtime_ns': mtime_ns,
+            'sha256': sha256,
+            'result_dir': result_dir,
+            'saved_at': dt.datetime.now().isoformat(timespec='seconds')
+        }
+        self._used.add(key)
+        return True
+
+    def save(self, prune=True):
+        """
+        매니페스트 저장
+
+        Args:
+            prune: 이번 실행에서 사용하지 않은 항목(삭제되었거나 제외된 파일)과 결과 파일 정리
+        """
+        if prune:
+            for key in [key for key in self.entries if key not in self._used]:
+                self._remove_result(self.entries.pop(key))
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        manifest = {'version': CACHE_VERSION, 'entries': self.entries}
+        # 중간에 중단되어도 매니페스트가 깨지지 않도록 임시 파일에 쓴 뒤 교체
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=1)
+        os.replace(temp_path, self.manifest_path)
+
+    def describe(self):
+        """캐시 사용 요약 문자열"""
+        return f"재사용 {self.hits}개, 다시 처리 {self.misses}개"
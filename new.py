@@ -17,6 +17,20 @@ import tempfile
 import shutil
 import subprocess
 import sys
+from workbook_reader import read_sheet_auto, iter_sheet_chunks, should_stream
+from workbook_probe import sniff_format
+from schema_alignment import align_frames, describe_alignment, alignment_lines
+from dtype_compaction import compact_dtypes, describe_compaction, compaction_lines
+from csv_reader import read_csv_file, iter_csv_chunks, should_chunk_csv
+from spill_merge import SpillMerger, PYARROW_AVAILABLE, COMPRESSIONS, write_merged_result
+
+# 다운로드 형식 표시 이름 → (형식, MIME 타입)
+OUTPUT_FORMATS = {
+    "Excel (.xlsx)": ('xlsx', "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "CSV (.csv)": ('csv', "text/csv"),
+    "Parquet (.parquet)": ('parquet', "application/vnd.apache.parquet"),
+    "Feather (.feather)": ('feather', "application/vnd.apache.arrow.file"),
+}
 
 # 경고 메시지 숨기기
 warnings.filterwarnings('ignore')
@@ -46,13 +60,25 @@ def main():
         st.subheader("📤 출력 형식")
         output_format = st.selectbox(
             "다운로드 형식",
-            ["Excel (.xlsx)", "CSV (.csv)"],
+            list(OUTPUT_FORMATS) if PYARROW_AVAILABLE else ["Excel (.xlsx)", "CSV (.csv)"],
             index=0
         )
+        compression = None
+        if OUTPUT_FORMATS[output_format][0] in ('parquet', 'feather'):
+            compression = st.selectbox("압축 방식", COMPRESSIONS, help="열 타입(숫자, 날짜)은 그대로 저장됩니다")
         
         # 시트 선택
         st.subheader("📄 시트 선택")
         select_sheets = st.checkbox("특정 시트만 선택", value=False)
+        
+        # 대용량 통합
+        st.subheader("💾 대용량 통합")
+        spill = st.checkbox(
+            "디스크 분할 통합",
+            value=False,
+            disabled=not PYARROW_AVAILABLE,
+            help="파일마다 디스크(Parquet)에 기록한 뒤 나눠 읽으면서 결과를 저장합니다 (메모리보다 큰 통합용)"
+        )
     
     # 메인 컨텐츠
     col1, col2 = st.columns([2, 1])
@@ -92,7 +118,8 @@ def main():
                             file_paths.append(file_path)
                         
                         # 통합 실행
-                        result_df = merge_files(file_paths, add_filename, add_folder)
+                        result_df = merge_files(file_paths, add_filename, add_folder,
+                                                spill_dir=os.path.join(temp_dir, "분할통합") if spill else None)
                         
                         # 결과 표시
                         st.success("✅ 파일 통합이 완료되었습니다!")
@@ -101,22 +128,21 @@ def main():
                         st.subheader("📊 통합 결과 미리보기")
                         st.dataframe(result_df.head(10), use_container_width=True)
                         
-                        # 다운로드 버튼
-                        if output_format == "Excel (.xlsx)":
-                            output = result_df.to_excel(index=False)
-                            st.download_button(
-                                label="📥 Excel 파일 다운로드",
-                                data=output,
-                                file_name=f"통합파일_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                            )
-                        else:
-                            output = result_df.to_csv(index=False, encoding='utf-8-sig')
+                        st.caption(f"총 {len(result_df):,}행, {len(result_df.columns):,}열")
+                        
+                        # 결과 파일을 디스크에 기록한 뒤 다운로드 버튼에 전달
+                        fmt, mime = OUTPUT_FORMATS[output_format]
+                        
+                        result_name = f"통합파일_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{fmt}"
+                        result_path = write_merged_result(result_df, os.path.join(temp_dir, result_name), fmt,
+                                                          compression=compression)
+                        
+                        with open(result_path, 'rb') as f:
                             st.download_button(
-                                label="📥 CSV 파일 다운로드",
-                                data=output,
-                                file_name=f"통합파일_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                                mime="text/csv"
+                                label=f"📥 {output_format.split(' ')[0]} 파일 다운로드",
+                                data=f,
+                                file_name=result_name,
+                                mime=mime
                             )
                         
                         # 임시 폴더 정리
@@ -152,9 +178,22 @@ def main():
         4. **다운로드**: 통합된 파일을 다운로드
         """)
 
-def merge_files(file_paths, add_filename=False, add_folder=False):
-    """파일들을 통합하는 함수"""
+def add_path_columns(df, file_path, add_filename=False, add_folder=False):
+    """파일명/폴더명 열 추가"""
+    if add_filename:
+        df['파일명'] = os.path.basename(file_path)
+    if add_folder:
+        df['폴더명'] = os.path.dirname(file_path)
+    return df
+
+def merge_files(file_paths, add_filename=False, add_folder=False, spill_dir=None):
+    """
+    파일들을 통합하는 함수
+    
+    spill_dir를 지정하면 파일마다 Parquet 조각으로 디스크에 기록하고 SpillMerger를 반환합니다.
+    """
     all_data = []
+    merger = SpillMerger(spill_dir, drop_empty_columns=False) if spill_dir else None
     
     for file_path in file_paths:
         try:
@@ -162,30 +201,74 @@ def merge_files(file_paths, add_filename=False, add_folder=False):
             file_ext = file_path.split('.')[-1].lower()
             
             if file_ext == 'csv':
-                df = pd.read_csv(file_path, encoding='utf-8-sig')
+                if merger is not None and should_chunk_csv(os.path.getsize(file_path)):
+                    # 대용량 CSV는 청크마다 바로 디스크 분할 통합에 기록
+                    # (실패하거나 다른 인코딩으로 다시 읽으면 이 파일의 조각을 되돌림)
+                    checkpoint = merger.checkpoint()
+                    try:
+                        for chunk in iter_csv_chunks(file_path, on_restart=lambda encoding: merger.rollback(checkpoint)):
+                            merger.append(add_path_columns(chunk, file_path, add_filename, add_folder))
+                    except Exception:
+                        merger.rollback(checkpoint)
+                        raise
+                    continue
+                # 인코딩(utf-8/cp949) 판별 후 pyarrow 엔진으로 읽기
+                df = read_csv_file(file_path)[0]
+            elif merger is not None and should_stream(os.path.getsize(file_path)) and sniff_format(file_path) == 'xlsx':
+                # 대용량 xlsx는 읽기 전용 청크마다 바로 디스크 분할 통합에 기록 (시트 전체를 합치지 않음)
+                checkpoint = merger.checkpoint()
+                try:
+                    for chunk in iter_sheet_chunks(file_path):
+                        chunk = chunk.dropna(how='all')
+                        if not chunk.empty:
+                            merger.append(add_path_columns(chunk, file_path, add_filename, add_folder))
+                except Exception:
+                    merger.rollback(checkpoint)
+                    raise
+                continue
             else:
-                df = pd.read_excel(file_path)
-            
-            # 파일명 열 추가
-            if add_filename:
-                df['파일명'] = os.path.basename(file_path)
+                # 확장자와 실제 형식이 달라도 맞는 엔진으로 한 번에 읽기
+                df = read_sheet_auto(file_path)
             
-            # 폴더명 열 추가
-            if add_folder:
-                df['폴더명'] = os.path.dirname(file_path)
+            df = add_path_columns(df, file_path, add_filename, add_folder)
             
-            all_data.append(df)
+            if merger is not None:
+                merger.append(df)
+            else:
+                all_data.append(df)
             
         except Exception as e:
             st.warning(f"⚠️ {file_path} 파일을 읽는 중 오류: {str(e)}")
             continue
     
+    if merger is not None:
+        if not merger.parts:
+            raise Exception("읽을 수 있는 파일이 없습니다.")
+        # 메모리 통합과 같은 규칙으로 머리글을 맞춤 (모든 조각의 머리글로 계산)
+        alignment = merger.alignment
+        if alignment['renamed'] or alignment['collisions']:
+            with st.expander(f"🧩 열 구성 맞추기: {describe_alignment(alignment)}"):
+                st.text("\n".join(alignment_lines(alignment)))
+        return merger
+    
     if not all_data:
         raise Exception("읽을 수 있는 파일이 없습니다.")
     
+    # 머리글 이름과 열 타입을 하나의 구성으로 맞춘 뒤 통합 (빈 합집합 열과 object 변환 방지)
+    all_data, alignment = align_frames(all_data)
+    if alignment['renamed'] or alignment['collisions'] or alignment['added']:
+        with st.expander(f"🧩 열 구성 맞추기: {describe_alignment(alignment)}"):
+            st.text("\n".join(alignment_lines(alignment)))
+    
     # 모든 데이터 통합
     result_df = pd.concat(all_data, ignore_index=True)
     
+    # 반복되는 문자열은 category, 결측값 있는 정수는 nullable 정수로 압축
+    result_df, report = compact_dtypes(result_df)
+    if report:
+        with st.expander(f"🗜️ 열 타입 압축: {describe_compaction(report)}"):
+            st.text("\n".join(compaction_lines(report)))
+    
     return result_df
 
 if __name__ == "__main__":
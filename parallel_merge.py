@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+병렬 파일 처리
+고급 통합의 파일별 처리 단계(교육명 추출, 취소 행 분리, 대기 상태, 정렬, 학년-반-번호)를
+여러 프로세스에서 실행하고 입력 순서대로 결과를 돌려줍니다.
+"""
+
+import os
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
+from workbook_reader import read_workbook
+from dtype_compaction import compact_dtypes, describe_compaction
+from excel2 import (
+    extract_education_name_and_date,
+    clean_sheet_name,
+    process_sheet_data,
+    update_waitlist_status,
+    sort_dataframe,
+    add_grade_class_number_column,
+)
+
+def default_worker_count():
+    """사용 가능한 CPU 코어 수"""
+    return os.cpu_count() or 1
+
+def build_sheet_name(education_name, date_str, time_str):
+    """교육명과 날짜/시간으로 시트명 생성"""
+    if date_str and time_str:
+        sheet_name = f"{education_name}_{date_str}_{time_str}"
+    elif date_str:
+        sheet_name = f"{education_name}_{date_str}"
+    else:
+        sheet_name = education_name
+
+    return clean_sheet_name(sheet_name)
+
+def process_file_stage(file_path, header=None):
+    """
+    파일 하나의 처리 단계 (워커 프로세스에서 실행)
+
+    다른 파일과 독립적인 작업만 수행하며, 로그는 메시지 목록으로 모아서 반환합니다.
+
+    Args:
+        file_path: 처리할 엑셀 파일 경로
+        header: 시트를 읽을 때 헤더 행 번호 (None이면 헤더 없이 읽기)
+
+    Returns:
+        dict: filename, sheets(시트 정보 목록), messages(로그), parse_seconds, ok
+    """
+    filename = os.path.basename(file_path)
+    result = {
+        'file_path': file_path,
+        'filename': filename,
+        'sheets': [],
+        'messages': [],
+        'parse_seconds': None,
+        'ok': False
+    }
+    messages = result['messages']
+
+    try:
+        # 파일이 열려있는지 체크
+        try:
+            with open(file_path, 'r+b'):
+                pass
+        except PermissionError:
+            messages.append(f"⚠️ 파일이 사용 중입니다. 건너뜀: {filename}")
+            return result
+
+        # 엑셀 파일 읽기 (한 번만 파싱)
+        try:
+            reader = read_workbook(file_path, header=header)
+            result['parse_seconds'] = reader.parse_seconds
+            messages.append(f"  ⏱️ 파싱 완료: {len(reader.sheet_names)}개 시트, "
+                            f"{reader.file_format}/{reader.engine_used} {reader.parse_seconds:.2f}초")
+        except Exception as e:
+            messages.append(f"❌ 엑셀 파일 읽기 실패: {filename} - {e}")
+            return result
+
+        for sheet_name, df in reader.iter_sheets():
+            try:
+                if df.empty or len(df) < 3:
+                    messages.append(f"  ⚠️ 데이터가 부족한 시트: {sheet_name}")
+                    continue
+
+                # 교육명과 날짜 추출
+                education_name, date_str, time_str = extract_education_name_and_date(df)
+
+                if not education_name:
+                    messages.append(f"  ⚠️ 교육명을 찾을 수 없음: {sheet_name}")
+                    continue
+
+                # 시트 데이터 처리
+                sheet_result = process_sheet_data(df)
+                if sheet_result is None:
+                    messages.append(f"  ⚠️ 처리할 데이터가 없음: {sheet_name}")
+                    continue
+
+                df_normal, df_cancelled = sheet_result
+
+                if df_normal.empty:
+                    messages.append(f"  ⚠️ 유효한 데이터가 없음: {sheet_name}")
+                    continue
+
+                # 데이터 처리
+                df_normal = update_waitlist_status(df_normal)
+                # 학년-반-번호는 원래 값으로 만든 뒤 압축 (압축하면 4.0 같은 실수 값이 4로 바뀜)
+                df_normal = add_grade_class_number_column(df_normal)
+                # 대기 상태를 바꾼 뒤 열 타입 압축 (category/작은 정수로 정렬 비용 감소)
+                df_normal, report = compact_dtypes(df_normal)
+                if report:
+                    messages.append(f"  🗜️ {sheet_name} 열 타입 압축: {describe_compaction(report)}")
+                df_normal = sort_dataframe(df_normal)
+
+                result['sheets'].append({
+                    'source_sheet': sheet_name,
+                    'education_name': education_name,
+                    'sheet_name': build_sheet_name(education_name, date_str, time_str),
+                    'data': df_normal,
+                    'cancelled_data': df_cancelled,
+                    'date_str': date_str,
+                    'time_str': time_str,
+                    'original_file': filename
+                })
+
+            except Exception as e:
+                messages.append(f"  ❌ 시트 처리 오류: {sheet_name} - {e}")
+                continue
+
+        result['ok'] = True
+
+    except Exception as e:
+        messages.append(f"❌ 파일 처리 오류: {filename} - {e}")
+
+    return result
+
+def _run_stages(file_paths, workers, header):
+    """캐시 없이 처리 단계 실행 (입력 순서대로 결과 반환)"""
+    workers = max(1, min(int(workers or 1), len(file_paths) or 1))
+
+    if workers == 1:
+        for file_path in file_paths:
+            yield process_file_stage(file_path, header)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # map은 제출 순서대로 결과를 돌려주므로 병합 순서가 결정적임
+        yield from executor.map(process_file_stage, file_paths, repeat(header))
+
+def run_file_stages(file_paths, workers=1, header=None, cache=None):
+    """
+    여러 파일의 처리 단계를 실행
+
+    workers가 2 이상이면 프로세스 풀에서 병렬로 처리하고,
+    결과는 항상 입력 파일 순서대로 반환하여 통합 결과가 실행마다 같도록 합니다.
+    cache(IncrementalMergeCache)를 주면 바뀌지 않은 파일은 이전 결과를 재사용하고
+    새 파일이나 바뀐 파일만 처리합니다.
+
+    Args:
+        file_paths: 처리할 파일 경로 목록
+        workers: 동시에 실행할 프로세스 수 (1이면 현재 프로세스에서 순차 처리)
+        header: 시트를 읽을 때 헤더 행 번호
+        cache: 증분 통합 캐시 (None이면 모든 파일 처리)
+
+    Yields:
+        dict: process_file_stage 결과 (재사용한 결과는 cached가 True)
+    """
+    file_paths = list(file_paths)
+    if cache is None:
+        yield from _run_stages(file_paths, workers, header)
+        return
+
+    stage_key = f"advanced:header={header}"
+    reused = {}
+    for file_path in file_paths:
+        result = cache.get(file_path, stage_key)
+        if result is not None:
+            reused[file_path] = result
+
+    changed = [file_path for file_path in file_paths if file_path not in reused]
+    fresh = _run_stages(changed, workers, header)
+
+    for file_path in file_paths:
+        result = reused.get(file_path)
+        if result is not None:
+            # 첫 메시지는 파싱 결과이므로 재사용 안내로 교체 (시트별 안내는 유지)
+            result['messages'] = ["  ♻️ 변경 없음, 이전 처리 결과 사용"] + result['messages'][1:]
+            result['cached'] = True
+            yield result
+            continue
+
+        result = next(fresh)
+        if result['ok']:
+            # 호출한 쪽에서 결과를 수정하기 전에 저장
+            cache.put(file_path, stage_key, result)
+        result['cached'] = False
+        yield result
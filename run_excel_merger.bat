@@ -2,5 +2,5 @@
 title 엑셀 통합기 실행
 echo 🚀 엑셀 통합기를 실행합니다...
 echo.
-streamlit run excel_merger_web.py --server.port 8501
+streamlit run excel_merger_web.py --server.port 8501 --server.enableStaticServing true
 pause
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+통합 전 열 구성 맞추기
+파일마다 조금씩 다른 머리글(공백, 전각 문자, 같은 뜻의 다른 이름)을 하나의 열 구성으로 맞추고,
+각 데이터프레임을 그 구성과 열 타입으로 한 번씩 변환하여 통합 시 빈 열이 생기거나
+모든 열이 object로 바뀌는 것을 막습니다.
+"""
+
+import re
+import unicodedata
+import numpy as np
+import pandas as pd
+from pandas.api.types import (
+    is_bool_dtype,
+    is_datetime64_any_dtype,
+    is_float_dtype,
+    is_integer_dtype,
+    is_string_dtype,
+)
+
+# 같은 뜻으로 보는 머리글 (대표 이름: 후보 이름 목록)
+# 파일마다 표기만 다른 같은 열만 넣습니다. 수업정보 찾기용 후보(날짜/시작시간 등)처럼
+# 한 파일에 함께 있을 수 있는 이름은 넣지 않습니다.
+HEADER_SYNONYMS = {
+    '성명': ['이름', 'name'],
+    '학년': ['grade'],
+    '번호': ['no', 'no.'],
+    '비고': ['note', 'remarks'],
+}
+
+def normalize_header(name):
+    """머리글 정규화 (전각 문자를 반각으로, 앞뒤/연속 공백 정리). 문자열이 아니면 그대로 반환"""
+    if not isinstance(name, str):
+        return name
+    text = unicodedata.normalize('NFKC', name)
+    return re.sub(r'\s+', ' ', text).strip()
+
+def _header_key(name):
+    """머리글 비교 키 (공백 제거, 소문자)"""
+    if not isinstance(name, str):
+        return name
+    return re.sub(r'\s+', '', normalize_header(name)).lower()
+
+def _synonym_groups(synonyms):
+    """비교 키 → 대표 이름"""
+    groups = {}
+    for canonical, candidates in synonyms.items():
+        for candidate in [canonical] + list(candidates):
+            groups.setdefault(_header_key(candidate), canonical)
+    return groups
+
+def _target_dtype(dtypes, has_missing):
+    """
+    여러 파일에서 같은 열의 타입을 하나로 결정
+
+    열이 없는 파일이 있으면 정수/불리언은 결측값을 담을 수 있는 nullable 타입으로 정합니다.
+    """
+    first = dtypes[0]
+    same = all(dtype == first for dtype in dtypes)
+
+    if all(is_bool_dtype(dtype) for dtype in dtypes):
+        return 'boolean' if has_missing or not same else first
+    if all(is_integer_dtype(dtype) and not is_bool_dtype(dtype) for dtype in dtypes):
+        if same and not (has_missing and isinstance(first, np.dtype)):
+            return first
+        return 'Int64'
+    if all((is_integer_dtype(dtype) or is_float_dtype(dtype)) and not is_bool_dtype(dtype) for dtype in dtypes):
+        return first if same and isinstance(first, np.dtype) else np.dtype('float64')
+    if same:
+        return first
+    if all(is_datetime64_any_dtype(dtype) for dtype in dtypes):
+        return np.dtype('datetime64[ns]') if all(isinstance(dtype, np.dtype) for dtype in dtypes) else np.dtype(object)
+    if all(is_string_dtype(dtype) and dtype != object for dtype in dtypes):
+        # 저장 방식만 다른 pandas 문자열 타입
+        return first
+    return np.dtype(object)
+
+def header_names(column_lists, synonyms=None):
+    """
+    여러 파일의 머리글 목록으로 비교 키별 열 구성 이름 결정
+
+    같은 뜻의 머리글이 파일마다 다른 이름으로 쓰였을 때만 대표 이름으로 바꾸고
+    (모든 파일이 같은 이름을 쓰면 그대로 유지), 나머지는 정규화한 이름을 사용합니다.
+
+    Args:
+        column_lists: 파일마다의 머리글 목록
+        synonyms: 같은 뜻으로 보는 머리글 {대표 이름: [후보, ...]} (기본값 HEADER_SYNONYMS)
+
+    Returns:
+        dict: {비교 키: 열 구성 이름}
+    """
+    synonyms = HEADER_SYNONYMS if synonyms is None else synonyms
+    synonym_groups = _synonym_groups(synonyms)
+
+    # 비교 키별로 파일들이 쓴 이름 모으기 (같은 뜻 그룹은 그룹 단위로)
+    names_by_group = {}
+    for columns in column_lists:
+        for original in columns:
+            key = _header_key(original)
+            group = synonym_groups.get(key, key)
+            names_by_group.setdefault(group, {}).setdefault(key, normalize_header(original))
+
+    # 그룹 안에서 이름이 둘 이상일 때만 대표 이름으로 통일
+    key_names = {}
+    for group, names in names_by_group.items():
+        unify = len(names) > 1 and group in synonyms
+        for key, name in names.items():
+            key_names[key] = group if unify else name
+    return key_names
+
+def rename_headers(columns, key_names, report):
+    """
+    한 파일의 머리글 목록을 열 구성 이름 목록으로 변경
+
+    같은 파일의 두 열은 절대 합치지 않습니다. 바꿀 이름이 같은 파일의 다른 열과 겹치면
+    이름을 바꾸지 않고, 그래도 겹치면 뒤에 번호를 붙여 두 열을 모두 유지한 뒤 보고합니다.
+
+    Args:
+        columns: 원래 머리글 목록
+        key_names: header_names 결과
+        report: renamed/collisions를 기록할 보고 dict
+
+    Returns:
+        list: 원래 순서대로의 새 이름 목록 (중복 없음)
+    """
+    own_names = {normalize_header(original) for original in columns}
+    names = []
+    for original in columns:
+        normalized = normalize_header(original)
+        name = key_names.get(_header_key(original), normalized)
+
+        if name != normalized and (name in own_names or name in names):
+            report['collisions'].append({'column': str(original), 'conflicts_with': str(name), 'kept_as': str(normalized)})
+            name = normalized
+        if name in names:
+            conflict, number = name, 1
+            while name in names:
+                name = f"{conflict}.{number}"
+                number += 1
+            report['collisions'].append({'column': str(original), 'conflicts_with': str(conflict), 'kept_as': name})
+
+        if name != original:
+            report['renamed'].setdefault(str(original), str(name))
+        names.append(name)
+
+    return names
+
+def _rename_frame(df, key_names, report):
+    """한 데이터프레임의 열을 {열 구성 이름: 열} dict로 (rename_headers 규칙)"""
+    names = rename_headers(list(df.columns), key_names, report)
+    return {name: df.iloc[:, position] for position, name in enumerate(names)}
+
+def align_frames(frames, synonyms=None):
+    """
+    데이터프레임들을 하나의 열 구성으로 맞추기
+
+    같은 뜻의 머리글이 파일마다 다른 이름으로 쓰였을 때만 대표 이름으로 바꾸고
+    (모든 파일이 같은 이름을 쓰면 그대로 유지), 열마다 공통 타입을 정해 한 번만 변환합니다.
+
+    Args:
+        frames: 데이터프레임 목록
+        synonyms: 같은 뜻으로 보는 머리글 {대표 이름: [후보, ...]} (기본값 HEADER_SYNONYMS)
+
+    Returns:
+        tuple: (변환된 데이터프레임 목록, 보고 dict)
+               보고는 renamed({원래 이름: 바뀐 이름}), collisions(같은 파일에서 이름이 겹쳐 따로 둔 열 목록),
+               added(일부 파일에만 있는 열과 그 열이 없는 파일 수), columns(최종 열 수)
+    """
+    report = {'renamed': {}, 'collisions': [], 'added': {}, 'columns': 0}
+    key_names = header_names([df.columns for df in frames], synonyms)
+
+    renamed_frames = [_rename_frame(df, key_names, report) for df in frames]
+
+    # 열 구성: 처음 나온 순서대로
+    target_columns = []
+    seen = set()
+    for columns in renamed_frames:
+        for name in columns:
+            if name not in seen:
+                seen.add(name)
+                target_columns.append(name)
+
+    target_dtypes = {}
+    for name in target_columns:
+        present = [columns[name].dtype for columns in renamed_frames if name in columns]
+        missing = len(renamed_frames) - len(present)
+        if missing:
+            report['added'][str(name)] = missing
+        target_dtypes[name] = _target_dtype(present, missing > 0)
+
+    aligned = []
+    for df, columns in zip(frames, renamed_frames):
+        data = {}
+        for name in target_columns:
+            dtype = target_dtypes[name]
+            column = columns.get(name)
+            if column is None:
+                column = pd.Series(None, index=df.index, dtype=dtype)
+            elif column.dtype != dtype:
+                column = column.astype(dtype)
+            # 인덱스 정렬 없이 값 배열을 그대로 사용
+            data[name] = column.array
+        frame = pd.DataFrame(data, index=df.index, columns=target_columns)
+        frame.attrs = dict(df.attrs)
+        aligned.append(frame)
+
+    report['columns'] = len(target_columns)
+    return aligned, report
+
+def describe_alignment(report):
+    """열 구성 맞추기 결과 요약 문자열"""
+    parts = [f"열 {report['columns']}개"]
+    if report['renamed']:
+        parts.append(f"이름 변경 {len(report['renamed'])}개")
+    if report['collisions']:
+        parts.append(f"이름 겹침 {len(report['collisions'])}개")
+    if report['added']:
+        parts.append(f"일부 파일에만 있는 열 {len(report['added'])}개")
+    return ", ".join(parts)
+
+def alignment_lines(report):
+    """열 구성 맞추기 상세 문자열 목록"""
+    lines = [f"{original} → {name}" for original, name in report['renamed'].items()]
+    lines += [f"⚠️ {item['column']}: 같은 파일의 {item['conflicts_with']} 열과 겹쳐 {item['kept_as']}(으)로 유지"
+              for item in report['collisions']]
+    lines += [f"{name}: {missing}개 파일에 없음" for name, missing in report['added'].items()]
+    return lines
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+시트 데이터 변환
+행 단위 반복 대신 열 단위 벡터 연산으로 시트 데이터를 변환합니다.
+"""
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import (
+    is_bool_dtype,
+    is_datetime64_any_dtype,
+    is_numeric_dtype,
+    is_timedelta64_dtype,
+)
+
+# 취소 행을 판별하는 키워드
+CANCEL_KEYWORD = '취소'
+
+def _may_contain_text(series):
+    """문자열로 바꿨을 때 키워드를 포함할 수 있는 열인지 확인"""
+    return not (
+        is_bool_dtype(series)
+        or is_numeric_dtype(series)
+        or is_datetime64_any_dtype(series)
+        or is_timedelta64_dtype(series)
+    )
+
+def cancelled_row_mask(df, keyword=CANCEL_KEYWORD):
+    """
+    어느 열이든 키워드를 포함하는 행의 불리언 마스크
+
+    열마다 아직 취소로 판별되지 않은 값만 문자열로 바꿔 검사하므로
+    행×열 파이썬 반복 없이 동작합니다.
+
+    Args:
+        df: 검사할 데이터프레임
+        keyword: 찾을 문자열
+
+    Returns:
+        numpy.ndarray: 행별 취소 여부
+    """
+    mask = np.zeros(len(df), dtype=bool)
+
+    # 중복 열 이름이 있어도 안전하도록 위치 기준으로 열 접근
+    for position in range(df.shape[1]):
+        column = df.iloc[:, position]
+        if not _may_contain_text(column):
+            continue
+
+        candidates = column.notna().to_numpy() & ~mask
+        if not candidates.any():
+            continue
+
+        text = column[candidates].astype(str)
+        hits = text.str.contains(keyword, regex=False).to_numpy(dtype=bool)
+        mask[np.flatnonzero(candidates)[hits]] = True
+
+    return mask
+
+def split_cancelled_rows(df, keyword=CANCEL_KEYWORD):
+    """
+    일반 행과 취소 행으로 분리 (원본 열 타입 유지)
+
+    Args:
+        df: 분리할 데이터프레임
+        keyword: 취소 행 판별 문자열
+
+    Returns:
+        tuple: (일반 행 데이터프레임, 취소 행 데이터프레임), 해당 행이 없으면 빈 데이터프레임
+    """
+    mask = cancelled_row_mask(df, keyword)
+
+    if mask.all():
+        df_normal = pd.DataFrame()
+    else:
+        df_normal = df[~mask].reset_index(drop=True)
+
+    if mask.any():
+        df_cancelled = df[mask].reset_index(drop=True)
+    else:
+        df_cancelled = pd.DataFrame()
+
+    return df_normal, df_cancelled
+
+# 대기 번호 패턴 (예: '대기3' → '3')
+WAITLIST_PATTERN = r'대기(\d+)'
+
+def _as_text(series):
+    """값마다 str()을 적용한 것과 같은 문자열 시리즈 (결측값은 빈 문자열)"""
+    if series.dtype != object:
+        series = series.astype(object)
+    return series.astype(str).where(series.notna(), "")
+
+def rewrite_waitlist_status(df, status_col):
+    """
+    상태 열의 '대기N' 값을 'Applied (대기N)'으로 변경 (원본 데이터프레임 수정)
+
+    행마다 정규식을 실행하는 대신 str.extract로 한 번에 대기 번호를 추출합니다.
+
+    Args:
+        df: 대상 데이터프레임
+        status_col: 상태 열 이름
+
+    Returns:
+        DataFrame: 수정된 데이터프레임
+    """
+    status = df[status_col]
+    if not _may_contain_text(status):
+        return df
+
+    present = status.notna()
+    if not present.any():
+        return df
+
+    wait_numbers = status[present].astype(str).str.extract(WAITLIST_PATTERN, expand=False)
+    matched = wait_numbers.notna()
+    if not matched.any():
+        return df
+
+    df.loc[wait_numbers.index[matched], status_col] = "Applied (대기" + wait_numbers[matched] + ")"
+    return df
+
+def build_grade_class_number(df, grade_col, class_col, number_col):
+    """
+    '학년-반-번호' 조합 시리즈 생성
+
+    세 값이 모두 있으면 '학년-반-번호', 하나라도 비어 있으면 빈 문자열입니다.
+
+    Args:
+        df: 대상 데이터프레임
+        grade_col: 학년 열 이름
+        class_col: 반 열 이름
+        number_col: 번호 열 이름
+
+    Returns:
+        Series: 조합 문자열
+    """
+    grade = _as_text(df[grade_col])
+    class_num = _as_text(df[class_col])
+    number = _as_text(df[number_col])
+
+    complete = (grade != "") & (class_num != "") & (number != "")
+    combined = grade + "-" + class_num + "-" + number
+    return combined.where(complete, "").astype(object)
@@ -0,0 +1,514 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+디스크 분할 통합 (메모리보다 큰 통합용)
+파일별로 정리된 데이터를 모두 메모리에 모아 한 번에 합치는 대신, 파일마다 Parquet 조각으로 디스크에 기록하고
+모든 조각의 열 구성과 타입을 맞춘 뒤 조각 단위로 읽으면서 CSV/xlsx/Parquet/Feather 결과를 기록합니다.
+최대 메모리 사용량은 가장 큰 입력 파일 하나와 기록 배치 하나 정도로 유지됩니다.
+Parquet/Feather 결과는 열 타입(숫자, 날짜 등)을 문자열로 바꾸지 않고 그대로 저장합니다.
+"""
+
+import os
+import re
+import shutil
+import tempfile
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    # 디스크 분할 통합과 Parquet 저장 사용 불가 (설치: pip install pyarrow)
+    PYARROW_AVAILABLE = False
+
+from excel_output import StyledExcelWriter, write_dataframe, combine_sheet_frames
+from schema_alignment import header_names, rename_headers
+
+# 결과를 기록할 때 한 번에 메모리에 올리는 최대 행 수
+DEFAULT_BATCH_ROWS = 50000
+
+# 형식별 확장자
+RESULT_EXTENSIONS = {'csv': '.csv', 'xlsx': '.xlsx', 'parquet': '.parquet', 'feather': '.feather'}
+
+# Parquet/Feather 공통 압축 방식 (앞쪽이 기본값)
+COMPRESSIONS = ['zstd', 'lz4', 'none']
+
+# 시트별 파일로 저장할 때 취소 행을 표시하는 열 (취소선 대신)
+CANCELLED_FLAG_COLUMN = '취소여부'
+
+# 파일 이름에 쓸 수 없는 문자 (윈도우 기준, 제어 문자 포함)
+_INVALID_FILE_NAME_CHARS = re.compile(r'[\\/:*?"<>|\x00-\x1f]')
+
+# 윈도우에서 파일 이름으로 쓸 수 없는 장치 이름
+_RESERVED_FILE_NAMES = {'CON', 'PRN', 'AUX', 'NUL'} | {f"{prefix}{number}" for prefix in ('COM', 'LPT') for number in range(1, 10)}
+
+# 시트별 파일 이름 최대 길이 (확장자 제외)
+MAX_FILE_NAME_LENGTH = 120
+
+# Arrow가 그대로 저장할 수 있는 object 열의 값 종류 (pandas infer_dtype 기준)
+_ARROW_SAFE_OBJECT_KINDS = {
+    'string', 'empty', 'bytes', 'floating', 'integer', 'mixed-integer-float', 'decimal',
+    'boolean', 'datetime', 'datetime64', 'date', 'time', 'timedelta', 'timedelta64'
+}
+
+def _unique_column_names(columns):
+    """열 이름을 문자열로 바꾸고 중복 이름에는 _1, _2 ... 붙이기 (Parquet는 중복 열 불가)"""
+    names = []
+    seen = set()
+    for column in columns:
+        name = str(column)
+        candidate = name
+        counter = 1
+        while candidate in seen:
+            candidate = f"{name}_{counter}"
+            counter += 1
+        seen.add(candidate)
+        names.append(candidate)
+    return names
+
+def arrow_safe_frame(df):
+    """
+    Arrow/Parquet로 저장할 수 있도록 데이터프레임 정리
+
+    - 열 이름은 중복 없는 문자열로 변경
+    - 문자열과 숫자가 섞인 object 열은 값이 있는 셀만 문자열로 변환 (결측값 유지)
+    - 범주형 열은 원래 값으로 되돌림 (조각마다 범주가 달라도 타입이 맞도록)
+
+    숫자, 날짜 등 타입이 하나인 열은 그대로 유지됩니다.
+    """
+    safe = df.copy(deep=False)
+    safe.columns = _unique_column_names(df.columns)
+
+    for position in range(safe.shape[1]):
+        column = safe.iloc[:, position]
+
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            column = column.astype(column.cat.categories.dtype)
+            safe.isetitem(position, column)
+
+        if column.dtype != object:
+            continue
+
+        kind = pd.api.types.infer_dtype(column, skipna=True)
+        if kind in _ARROW_SAFE_OBJECT_KINDS:
+            continue
+
+        safe.isetitem(position, column.map(str, na_action='ignore'))
+
+    return safe
+
+def _normalize_type(arrow_type):
+    """비교용 타입 정규화 (large_string/dictionary 등을 기본 타입으로)"""
+    if pa.types.is_dictionary(arrow_type):
+        arrow_type = arrow_type.value_type
+    if pa.types.is_large_string(arrow_type):
+        return pa.string()
+    if pa.types.is_large_binary(arrow_type):
+        return pa.binary()
+    return arrow_type
+
+def unify_types(arrow_types):
+    """
+    여러 조각에서 같은 열의 타입을 하나로 결정
+
+    - 값이 있는 조각의 타입이 모두 같으면 그 타입
+    - 정수/실수가 섞이면 실수(float64), 정수끼리는 int64
+    - 날짜/시간끼리는 timestamp(us)
+    - 그 밖에 섞인 경우는 문자열
+    - 모든 조각에서 값이 없으면 null
+    """
+    types = []
+    for arrow_type in arrow_types:
+        arrow_type = _normalize_type(arrow_type)
+        if pa.types.is_null(arrow_type) or arrow_type in types:
+            continue
+        types.append(arrow_type)
+
+    if not types:
+        return pa.null()
+    if len(types) == 1:
+        return types[0]
+    if all(pa.types.is_integer(t) for t in types):
+        return pa.int64()
+    if all(pa.types.is_integer(t) or pa.types.is_floating(t) for t in types):
+        return pa.float64()
+    if all(pa.types.is_timestamp(t) and t.tz is None for t in types):
+        return pa.timestamp('us')
+    return pa.string()
+
+def compression_codec(fmt, compression):
+    """압축 방식 이름을 형식별 코덱 이름으로 변환 ('none'은 압축 안 함)"""
+    compression = compression or COMPRESSIONS[0]
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"지원하지 않는 압축 방식: {compression} (가능: {', '.join(COMPRESSIONS)})")
+    if compression == 'none':
+        return 'uncompressed' if fmt == 'feather' else None
+    return compression
+
+def _to_text_array(array):
+    """값마다 str()을 적용한 문자열 배열 (결측값 유지)"""
+    return pa.array([None if value is None else str(value) for value in array.to_pylist()],
+                    type=pa.string())
+
+def _conform_column(array, target_type):
+    """열 배열을 통합 타입으로 변환"""
+    if array.type == target_type:
+        return array
+    if pa.types.is_dictionary(array.type):
+        array = array.dictionary_decode()
+    if pa.types.is_string(target_type) and not (pa.types.is_string(array.type)
+                                                or pa.types.is_large_string(array.type)):
+        # 숫자/날짜를 문자열로 바꿀 때는 pandas의 str()과 같은 표기 사용
+        return _to_text_array(array)
+    return array.cast(target_type, safe=False)
+
+class SpillMerger:
+    def __init__(self, spill_dir=None, drop_empty_columns=True, batch_rows=DEFAULT_BATCH_ROWS, align_headers=True):
+        """
+        디스크 분할 통합기
+
+        DataFrame처럼 len(), columns, head()를 제공하므로 통합 결과 화면에서 그대로 사용할 수 있습니다.
+
+        Args:
+            spill_dir: Parquet 조각을 기록할 폴더 (None이면 임시 폴더 생성)
+            drop_empty_columns: 모든 파일에서 값이 없는 열을 결과에서 제외할지 여부
+            batch_rows: 결과 기록 시 배치당 최대 행 수
+            align_headers: 머리글을 메모리 통합(align_frames)과 같은 규칙으로 맞출지 여부
+                           (공백/전각 문자 정리, 파일마다 다르게 쓴 같은 뜻의 이름 통일)
+        """
+        if not PYARROW_AVAILABLE:
+            raise Exception("디스크 분할 통합에는 pyarrow가 필요합니다 (pip install pyarrow)")
+
+        self._owns_dir = spill_dir is None
+        self.spill_dir = spill_dir or tempfile.mkdtemp(prefix='excel_merge_spill_')
+        os.makedirs(self.spill_dir, exist_ok=True)
+
+        self.drop_empty_columns = drop_empty_columns
+        self.batch_rows = batch_rows
+        self.align_headers = align_headers
+        self.parts = []
+        self.total_rows = 0
+        self._part_rows = []
+        self._part_fields = []
+        self._part_sources = []
+        self._alignment = None
+        self._schema = None
+
+    def append(self, df):
+        """
+        정리된 데이터프레임 하나를 Parquet 조각으로 기록
+
+        Returns:
+            str: 기록된 조각 파일 경로 (빈 데이터프레임이면 None)
+        """
+        if df.empty:
+            return None
+
+        table = pa.Table.from_pandas(arrow_safe_frame(df), preserve_index=False)
+        part_path = os.path.join(self.spill_dir, f"part-{len(self.parts):05d}.parquet")
+        pq.write_table(table, part_path)
+
+        self.parts.append(part_path)
+        self._part_rows.append(table.num_rows)
+        self._part_fields.append([(field.name, field.type) for field in table.schema])
+        self.total_rows += table.num_rows
+        self._schema = None
+        return part_path
+
+    def checkpoint(self):
+        """현재까지 기록된 조각 수 (rollback에 전달하면 이후 조각을 되돌림)"""
+        return len(self.parts)
+
+    def rollback(self, checkpoint):
+        """
+        checkpoint 이후에 기록된 조각 삭제
+
+        한 파일을 여러 조각으로 나눠 기록하다 실패했을 때 그 파일의 일부 행만 남지 않도록 사용합니다.
+        """
+        while len(self.parts) > checkpoint:
+            part_path = self.parts.pop()
+            self.total_rows -= self._part_rows.pop()
+            self._part_fields.pop()
+            if os.path.exists(part_path):
+                os.remove(part_path)
+        self._schema = None
+
+    def _build_schema(self):
+        """
+        조각들의 머리글을 하나의 열 구성으로 맞추고 결과 스키마 생성
+
+        모든 조각의 머리글을 안 뒤에 정하므로 메모리 통합과 같은 열 구성이 됩니다.
+        같은 파일의 청크는 머리글이 같으므로 머리글 목록마다 한 번만 계산합니다.
+        """
+        alignment = {'renamed': {}, 'collisions': [], 'added': {}, 'columns': 0}
+        column_lists = list(dict.fromkeys(tuple(name for name, _ in fields) for fields in self._part_fields))
+        renamed = {}
+        if self.align_headers:
+            key_names = header_names(column_lists)
+            for columns in column_lists:
+                renamed[columns] = rename_headers(list(columns), key_names, alignment)
+
+        column_types = {}
+        self._part_sources = []
+        for fields in self._part_fields:
+            names = [name for name, _ in fields]
+            targets = renamed.get(tuple(names), names)
+            sources = {}
+            for (name, arrow_type), target in zip(fields, targets):
+                column_types.setdefault(target, []).append(arrow_type)
+                sources[target] = name
+            self._part_sources.append(sources)
+
+        schema_fields = []
+        for name, types in column_types.items():
+            unified = unify_types(types)
+            if self.drop_empty_columns and pa.types.is_null(unified):
+                continue
+            schema_fields.append(pa.field(name, unified))
+
+        alignment['columns'] = len(schema_fields)
+        self._alignment = alignment
+        self._schema = pa.schema(schema_fields)
+
+    @property
+    def schema(self):
+        """모든 조각의 열(처음 나온 순서)과 통합 타입으로 만든 결과 스키마"""
+        if self._schema is None:
+            self._build_schema()
+        return self._schema
+
+    @property
+    def alignment(self):
+        """머리글 맞추기 보고 (align_frames 보고와 같은 형식, added는 비어 있음)"""
+        if self._schema is None:
+            self._build_schema()
+        return self._alignment
+
+    @property
+    def columns(self):
+        """결과 열 이름 목록"""
+        return list(self.schema.names)
+
+    def __len__(self):
+        return self.total_rows
+
+    def _conform(self, batch, sources):
+        """조각의 배치를 결과 스키마에 맞춤 (sources: {결과 열 이름: 조각 열 이름}, 없는 열은 결측값)"""
+        arrays = []
+        for field in self.schema:
+            source = sources.get(field.name)
+            index = -1 if source is None else batch.schema.get_field_index(source)
+            if index < 0:
+                arrays.append(pa.nulls(batch.num_rows, type=field.type))
+            else:
+                arrays.append(_conform_column(batch.column(index), field.type))
+        return pa.Table.from_arrays(arrays, schema=self.schema)
+
+    def iter_tables(self):
+        """결과 스키마에 맞춘 Arrow 테이블을 배치 단위로 순회"""
+        self.schema  # 조각별 열 이름 대응(_part_sources)도 함께 계산
+        for part_path, sources in zip(self.parts, self._part_sources):
+            parquet_file = pq.ParquetFile(part_path)
+            for batch in parquet_file.iter_batches(batch_size=self.batch_rows):
+                yield self._conform(batch, sources)
+
+    def iter_frames(self):
+        """결과를 데이터프레임 배치 단위로 순회"""
+        for table in self.iter_tables():
+            yield table.to_pandas()
+
+    def head(self, n=5):
+        """앞쪽 n행 미리보기"""
+        frames = []
+        remaining = n
+        for frame in self.iter_frames():
+            frames.append(frame.head(remaining))
+            remaining -= len(frames[-1])
+            if remaining <= 0:
+                break
+
+        if not frames:
+            return pd.DataFrame(columns=self.columns)
+        return pd.concat(frames, ignore_index=True)
+
+    def write_csv(self, output_path, encoding='utf-8-sig'):
+        """배치 단위로 CSV 기록 (머리글과 BOM은 한 번만)"""
+        first = True
+        for frame in self.iter_frames():
+            frame.to_csv(output_path, index=False, header=first,
+                         mode='w' if first else 'a',
+                         encoding=encoding if first else encoding.replace('-sig', ''))
+            first = False
+
+        if first:
+            pd.DataFrame(columns=self.columns).to_csv(output_path, index=False, encoding=encoding)
+        return output_path
+
+    def write_parquet(self, output_path, compression=None):
+        """배치 단위로 Parquet 기록 (열 타입 유지)"""
+        codec = compression_codec('parquet', compression) or 'none'
+        with pq.ParquetWriter(output_path, self.schema, compression=codec) as writer:
+            for table in self.iter_tables():
+                writer.write_table(table)
+        return output_path
+
+    def write_feather(self, output_path, compression=None):
+        """배치 단위로 Feather(Arrow IPC 파일) 기록 (열 타입 유지)"""
+        codec = compression_codec('feather', compression)
+        options = pa.ipc.IpcWriteOptions(compression=None if codec == 'uncompressed' else codec)
+        with pa.ipc.new_file(output_path, self.schema, options=options) as writer:
+            for table in self.iter_tables():
+                writer.write_table(table)
+        return output_path
+
+    def write_xlsx(self, output_path, sheet_name='통합데이터', constant_memory=True):
+        """
+        배치 단위로 xlsx 기록 (기본은 쓰기 전용 모드)
+
+        엑셀 시트 행 한도를 넘으면 '시트명_2', '시트명_3' ... 시트로 이어서 기록합니다.
+        """
+        with StyledExcelWriter(output_path, constant_memory=constant_memory) as writer:
+            writer.add_sheet_chunks(sheet_name, self.columns, self.iter_frames())
+        return output_path
+
+    def cleanup(self):
+        """조각 파일 삭제 (직접 만든 임시 폴더는 폴더째 삭제)"""
+        if self._owns_dir:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+        else:
+            for part_path in self.parts:
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+        self.parts = []
+        self.total_rows = 0
+        self._part_rows = []
+        self._part_fields = []
+        self._part_sources = []
+        self._alignment = None
+        self._schema = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.cleanup()
+        return False
+
+def write_merged_result(data, output_path, fmt, constant_memory=False, compression=None):
+    """
+    통합 결과를 형식에 맞게 저장
+
+    Args:
+        data: 통합 결과 (DataFrame 또는 SpillMerger)
+        output_path: 저장할 파일 경로
+        fmt: 'csv', 'xlsx', 'parquet', 'feather'
+        constant_memory: xlsx를 쓰기 전용 모드로 저장할지 여부 (SpillMerger는 항상 쓰기 전용)
+        compression: Parquet/Feather 압축 방식 (COMPRESSIONS 중 하나, None이면 기본값)
+
+    Returns:
+        저장한 파일 경로
+    """
+    if fmt in ('parquet', 'feather') and not PYARROW_AVAILABLE:
+        raise Exception(f"{fmt} 저장에는 pyarrow가 필요합니다 (pip install pyarrow)")
+
+    if isinstance(data, SpillMerger):
+        # 디스크의 조각을 배치 단위로 읽으면서 기록
+        if fmt == 'csv':
+            return data.write_csv(output_path)
+        if fmt == 'parquet':
+            return data.write_parquet(output_path, compression)
+        if fmt == 'feather':
+            return data.write_feather(output_path, compression)
+        return data.write_xlsx(output_path)
+
+    if fmt == 'csv':
+        # 청크 단위로 기록하여 CSV 전체 문자열을 메모리에 만들지 않음
+        data.to_csv(output_path, index=False, encoding='utf-8-sig', chunksize=50000)
+    elif fmt == 'parquet':
+        arrow_safe_frame(data).to_parquet(output_path, index=False,
+                                          compression=compression_codec(fmt, compression))
+    elif fmt == 'feather':
+        # Feather는 기본 인덱스만 저장 가능
+        arrow_safe_frame(data).reset_index(drop=True).to_feather(output_path,
+                                                                 compression=compression_codec(fmt, compression))
+    else:
+        write_dataframe(output_path, data, '통합데이터', constant_memory=constant_memory)
+    return output_path
+
+def sheet_files_dir(output_path, fmt):
+    """시트별 파일을 저장할 폴더 경로 (예: 통합파일_고급.xlsx → 통합파일_고급_parquet)"""
+    return f"{os.path.splitext(output_path)[0]}_{fmt}"
+
+def safe_file_name(name, used_names):
+    """
+    시트명을 파일 이름으로 사용할 수 있게 정리하고 겹치지 않게 만들기
+
+    쓸 수 없는 문자(\\ / : * ? " < > |)는 '_'로 바꾸고 끝의 점과 공백을 제거합니다.
+    이미 사용한 이름(대소문자 구분 없음)이면 뒤에 _2, _3 ...을 붙입니다.
+
+    Args:
+        name: 시트명
+        used_names: 이미 사용한 이름 집합 (소문자, 새 이름을 추가함)
+
+    Returns:
+        str: 확장자 없는 파일 이름
+    """
+    cleaned = _INVALID_FILE_NAME_CHARS.sub('_', str(name)).strip()[:MAX_FILE_NAME_LENGTH].rstrip('. ')
+    if not cleaned:
+        cleaned = "Sheet"
+    if cleaned.split('.')[0].upper() in _RESERVED_FILE_NAMES:
+        cleaned = f"_{cleaned}"
+
+    unique, number = cleaned, 1
+    while unique.lower() in used_names:
+        number += 1
+        unique = f"{cleaned}_{number}"
+    used_names.add(unique.lower())
+    return unique
+
+def write_sheet_files(output_dir, sheets, fmt, compression=None, log=print, progress=None):
+    """
+    시트 목록을 시트마다 Parquet/Feather 파일 하나로 저장
+
+    취소 행은 일반 행 뒤에 붙이고 취소선 대신 '취소여부' 열(True/False)로 표시합니다.
+    파일 이름은 시트명에서 쓸 수 없는 문자를 바꾸고, 겹치면 번호를 붙여 서로 덮어쓰지 않게 합니다.
+
+    Args:
+        output_dir: 저장할 폴더 (없으면 생성)
+        sheets: [{'sheet_name', 'data', 'cancelled_data'}, ...]
+        fmt: 'parquet' 또는 'feather'
+        compression: 압축 방식
+        log: 진행 메시지를 출력할 함수
+        progress: 시트마다 (처리한 시트 수, 전체 시트 수)로 호출할 함수
+
+    Returns:
+        int: 저장된 파일 수
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    saved = 0
+    used_names = set()
+
+    for index, sheet in enumerate(sheets, 1):
+        sheet_name = sheet['sheet_name']
+        try:
+            combined, cancelled_start = combine_sheet_frames(sheet['data'], sheet.get('cancelled_data'))
+            combined = combined.reset_index(drop=True)
+            combined[CANCELLED_FLAG_COLUMN] = combined.index >= cancelled_start
+
+            file_name = safe_file_name(sheet_name, used_names)
+            file_path = os.path.join(output_dir, f"{file_name}{RESULT_EXTENSIONS[fmt]}")
+            write_merged_result(combined, file_path, fmt, compression=compression)
+            log(f"  📄 파일 생성: {os.path.basename(file_path)}")
+            saved += 1
+        except Exception as e:
+            log(f"❌ 파일 생성 실패: {sheet_name} - {e}")
+            continue
+        finally:
+            if progress is not None:
+                progress(index, len(sheets))
+
+    if saved == 0:
+        raise Exception("생성된 파일이 없습니다")
+    return saved
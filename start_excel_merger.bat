@@ -20,7 +20,7 @@ echo.
 start "" "excel_merger_launcher.html"
 
 echo [3/3] 서버 실행 중...
-streamlit run excel_merger_web.py --server.port 8501 --server.headless true --browser.gatherUsageStats false
+streamlit run excel_merger_web.py --server.port 8501 --server.headless true --browser.gatherUsageStats false --server.enableStaticServing true
 
 echo.
 echo ========================================
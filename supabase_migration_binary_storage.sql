@@ -0,0 +1,73 @@
+-- Supabase 마이그레이션: 바이너리 전송 방식 (binary transfer mode)
+-- 파일 원본 바이트는 Storage 버킷에 저장하고, 테이블 행에는 메타데이터(경로, 크기, 해시)만 저장합니다.
+-- 기존 Base64 행은 그대로 두므로 두 방식이 함께 동작합니다. 여러 번 실행해도 안전합니다.
+
+-- 1. excel_files: Storage 위치 열 추가, file_data는 선택 항목으로 변경
+ALTER TABLE excel_files ALTER COLUMN file_data DROP NOT NULL;
+ALTER TABLE excel_files ADD COLUMN IF NOT EXISTS storage_bucket VARCHAR(100);
+ALTER TABLE excel_files ADD COLUMN IF NOT EXISTS storage_path TEXT;
+ALTER TABLE excel_files ADD COLUMN IF NOT EXISTS content_sha256 CHAR(64);
+
+-- 파일 데이터는 둘 중 한 곳에는 있어야 함
+ALTER TABLE excel_files DROP CONSTRAINT IF EXISTS excel_files_data_location;
+ALTER TABLE excel_files ADD CONSTRAINT excel_files_data_location
+    CHECK (file_data IS NOT NULL OR storage_path IS NOT NULL);
+
+-- 2. process_excel: 결과 파일 Storage 위치 열 추가
+ALTER TABLE process_excel ADD COLUMN IF NOT EXISTS result_storage_bucket VARCHAR(100);
+ALTER TABLE process_excel ADD COLUMN IF NOT EXISTS result_storage_path TEXT;
+ALTER TABLE process_excel ADD COLUMN IF NOT EXISTS result_sha256 CHAR(64);
+
+-- 3. 인덱스 (같은 내용 파일 조회용)
+CREATE INDEX IF NOT EXISTS idx_excel_files_content_sha256 ON excel_files(content_sha256);
+
+-- 4. Storage 버킷 (비공개)
+INSERT INTO storage.buckets (id, name, public)
+VALUES ('excel-files', 'excel-files', false)
+ON CONFLICT (id) DO NOTHING;
+
+-- 5. Storage 접근 정책 (excel-files 버킷의 객체 읽기/쓰기/삭제)
+DROP POLICY IF EXISTS "Excel files bucket read" ON storage.objects;
+CREATE POLICY "Excel files bucket read" ON storage.objects
+    FOR SELECT TO anon, authenticated USING (bucket_id = 'excel-files');
+
+DROP POLICY IF EXISTS "Excel files bucket insert" ON storage.objects;
+CREATE POLICY "Excel files bucket insert" ON storage.objects
+    FOR INSERT TO anon, authenticated WITH CHECK (bucket_id = 'excel-files');
+
+DROP POLICY IF EXISTS "Excel files bucket update" ON storage.objects;
+CREATE POLICY "Excel files bucket update" ON storage.objects
+    FOR UPDATE TO anon, authenticated USING (bucket_id = 'excel-files');
+
+DROP POLICY IF EXISTS "Excel files bucket delete" ON storage.objects;
+CREATE POLICY "Excel files bucket delete" ON storage.objects
+    FOR DELETE TO anon, authenticated USING (bucket_id = 'excel-files');
+
+-- 6. 상태 조회 뷰에 저장 위치 표시
+CREATE OR REPLACE VIEW process_status_view AS
+SELECT
+    pe.id as process_id,
+    ef.filename,
+    ef.project_name,
+    pe.status,
+    pe.start_time,
+    pe.end_time,
+    CASE
+        WHEN pe.status = 'completed' THEN
+            EXTRACT(EPOCH FROM (pe.end_time - pe.start_time))::INTEGER
+        ELSE NULL
+    END as processing_time_seconds,
+    pm.total_rows,
+    pm.total_columns,
+    pm.processed_sheets,
+    CASE WHEN ef.storage_path IS NOT NULL THEN 'binary' ELSE 'base64' END as transfer_mode
+FROM process_excel pe
+JOIN excel_files ef ON pe.file_id = ef.id
+LEFT JOIN process_metadata pm ON pe.id = pm.process_id;
+
+-- 7. 완료 메시지
+DO $$
+BEGIN
+    RAISE NOTICE '바이너리 전송 방식 마이그레이션이 완료되었습니다!';
+    RAISE NOTICE 'supabase_config.json에 "transfer_mode": "binary"를 추가하면 사용할 수 있습니다.';
+END $$;
@@ -0,0 +1,71 @@
+-- Supabase 마이그레이션: 청크 이어 올리기 (chunked transfer mode)
+-- 큰 파일을 청크로 나눠 내용 해시를 이름으로 Storage에 저장하고, 받은 청크 목록을 excel_file_chunks 표에 기록합니다.
+-- 연결이 끊기면 기록된 청크는 건너뛰고 남은 청크만 다시 보냅니다.
+-- supabase_migration_binary_storage.sql(버킷, Storage 정책)을 먼저 실행하세요. 여러 번 실행해도 안전합니다.
+
+-- 1. excel_files: 청크 정보 열 추가
+ALTER TABLE excel_files ADD COLUMN IF NOT EXISTS chunk_size INTEGER;
+ALTER TABLE excel_files ADD COLUMN IF NOT EXISTS chunk_count INTEGER;
+
+-- 파일 데이터는 Base64 열, Storage 객체, 청크 목록 중 한 곳에는 있어야 함
+ALTER TABLE excel_files DROP CONSTRAINT IF EXISTS excel_files_data_location;
+ALTER TABLE excel_files ADD CONSTRAINT excel_files_data_location
+    CHECK (file_data IS NOT NULL OR storage_path IS NOT NULL OR chunk_count IS NOT NULL);
+
+-- 2. 청크 목록 테이블 (행이 있으면 서버가 받은 청크)
+CREATE TABLE IF NOT EXISTS excel_file_chunks (
+    id UUID DEFAULT gen_random_uuid() PRIMARY KEY,
+    file_id UUID REFERENCES excel_files(id) ON DELETE CASCADE,
+    chunk_index INTEGER NOT NULL,
+    sha256 CHAR(64) NOT NULL, -- 청크 내용 해시 (Storage 경로 chunks/<앞 2자리>/<해시>)
+    size INTEGER NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    UNIQUE (file_id, chunk_index)
+);
+
+-- 3. 인덱스 (이어 올릴 업로드 찾기, 이미 저장된 청크 찾기)
+CREATE INDEX IF NOT EXISTS idx_excel_files_content_sha256 ON excel_files(content_sha256);
+CREATE INDEX IF NOT EXISTS idx_excel_file_chunks_sha256 ON excel_file_chunks(sha256);
+
+-- 4. RLS: 청크 목록은 원본 파일 행에 접근할 수 있을 때만 접근 가능
+ALTER TABLE excel_file_chunks ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Users can access chunks of their own files" ON excel_file_chunks;
+CREATE POLICY "Users can access chunks of their own files" ON excel_file_chunks
+    FOR ALL USING (EXISTS (SELECT 1 FROM excel_files ef WHERE ef.id = excel_file_chunks.file_id))
+    WITH CHECK (EXISTS (SELECT 1 FROM excel_files ef WHERE ef.id = excel_file_chunks.file_id));
+
+GRANT ALL ON excel_file_chunks TO anon, authenticated;
+
+-- 5. 상태 조회 뷰에 전송 방식 표시 (청크 업로드는 storage_path가 없으므로 chunk_count로 구분)
+CREATE OR REPLACE VIEW process_status_view AS
+SELECT
+    pe.id as process_id,
+    ef.filename,
+    ef.project_name,
+    pe.status,
+    pe.start_time,
+    pe.end_time,
+    CASE
+        WHEN pe.status = 'completed' THEN
+            EXTRACT(EPOCH FROM (pe.end_time - pe.start_time))::INTEGER
+        ELSE NULL
+    END as processing_time_seconds,
+    pm.total_rows,
+    pm.total_columns,
+    pm.processed_sheets,
+    CASE
+        WHEN ef.chunk_count IS NOT NULL THEN 'chunked'
+        WHEN ef.storage_path IS NOT NULL THEN 'binary'
+        ELSE 'base64'
+    END as transfer_mode
+FROM process_excel pe
+JOIN excel_files ef ON pe.file_id = ef.id
+LEFT JOIN process_metadata pm ON pe.id = pm.process_id;
+
+-- 6. 완료 메시지
+DO $$
+BEGIN
+    RAISE NOTICE '청크 이어 올리기 마이그레이션이 완료되었습니다!';
+    RAISE NOTICE 'supabase_config.json에 "transfer_mode": "chunked"를 추가하면 사용할 수 있습니다.';
+END $$;
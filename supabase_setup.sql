@@ -6,12 +6,29 @@ CREATE TABLE IF NOT EXISTS excel_files (
     id UUID DEFAULT gen_random_uuid() PRIMARY KEY,
     filename VARCHAR(255) NOT NULL,
     file_size INTEGER NOT NULL,
-    file_data TEXT NOT NULL, -- Base64 인코딩된 파일 데이터
+    file_data TEXT, -- Base64 인코딩된 파일 데이터 (base64 전송 방식)
+    storage_bucket VARCHAR(100), -- 원본 바이트를 저장한 Storage 버킷 (binary 전송 방식)
+    storage_path TEXT, -- Storage 객체 경로 (binary 전송 방식)
+    content_sha256 CHAR(64), -- 원본 파일 SHA-256 (다운로드 검증용)
+    chunk_size INTEGER, -- 청크 크기 (chunked 전송 방식)
+    chunk_count INTEGER, -- 청크 수 (chunked 전송 방식, 청크 목록은 excel_file_chunks)
     project_name VARCHAR(100) DEFAULT 'default',
     upload_time TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     status VARCHAR(50) DEFAULT 'uploaded',
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    CONSTRAINT excel_files_data_location CHECK (file_data IS NOT NULL OR storage_path IS NOT NULL OR chunk_count IS NOT NULL)
+);
+
+-- 1-1. 청크 목록 테이블 (chunked 전송 방식, 행이 있으면 서버가 받은 청크)
+CREATE TABLE IF NOT EXISTS excel_file_chunks (
+    id UUID DEFAULT gen_random_uuid() PRIMARY KEY,
+    file_id UUID REFERENCES excel_files(id) ON DELETE CASCADE,
+    chunk_index INTEGER NOT NULL,
+    sha256 CHAR(64) NOT NULL, -- 청크 내용 해시 (Storage 경로 chunks/<앞 2자리>/<해시>)
+    size INTEGER NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    UNIQUE (file_id, chunk_index)
 );
 
 -- 2. 파일 처리 작업 테이블
@@ -23,6 +40,9 @@ CREATE TABLE IF NOT EXISTS process_excel (
     start_time TIMESTAMP WITH TIME ZONE,
     end_time TIMESTAMP WITH TIME ZONE,
     result_file_data TEXT, -- Base64 인코딩된 결과 파일
+    result_storage_bucket VARCHAR(100), -- 결과 파일을 저장한 Storage 버킷 (binary 전송 방식)
+    result_storage_path TEXT, -- 결과 파일 Storage 객체 경로 (binary 전송 방식)
+    result_sha256 CHAR(64), -- 결과 파일 SHA-256
     error_message TEXT,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
@@ -46,11 +66,14 @@ CREATE INDEX IF NOT EXISTS idx_excel_files_status ON excel_files(status);
 CREATE INDEX IF NOT EXISTS idx_process_excel_file_id ON process_excel(file_id);
 CREATE INDEX IF NOT EXISTS idx_process_excel_status ON process_excel(status);
 CREATE INDEX IF NOT EXISTS idx_process_metadata_process_id ON process_metadata(process_id);
+CREATE INDEX IF NOT EXISTS idx_excel_files_content_sha256 ON excel_files(content_sha256);
+CREATE INDEX IF NOT EXISTS idx_excel_file_chunks_sha256 ON excel_file_chunks(sha256);
 
 -- 5. RLS (Row Level Security) 정책 설정
 ALTER TABLE excel_files ENABLE ROW LEVEL SECURITY;
 ALTER TABLE process_excel ENABLE ROW LEVEL SECURITY;
 ALTER TABLE process_metadata ENABLE ROW LEVEL SECURITY;
+ALTER TABLE excel_file_chunks ENABLE ROW LEVEL SECURITY;
 
 -- 6. 기본 RLS 정책 (모든 사용자가 자신의 데이터만 접근 가능)
 CREATE POLICY "Users can view their own files" ON excel_files
@@ -65,6 +88,11 @@ CREATE POLICY "Users can update their own files" ON excel_files
 CREATE POLICY "Users can delete their own files" ON excel_files
     FOR DELETE USING (auth.uid()::text = project_name);
 
+-- 청크 목록은 원본 파일 행에 접근할 수 있을 때만 접근 가능
+CREATE POLICY "Users can access chunks of their own files" ON excel_file_chunks
+    FOR ALL USING (EXISTS (SELECT 1 FROM excel_files ef WHERE ef.id = excel_file_chunks.file_id))
+    WITH CHECK (EXISTS (SELECT 1 FROM excel_files ef WHERE ef.id = excel_file_chunks.file_id));
+
 -- 7. 함수 생성 (자동 업데이트 시간)
 CREATE OR REPLACE FUNCTION update_updated_at_column()
 RETURNS TRIGGER AS $$
@@ -99,7 +127,12 @@ SELECT
     END as processing_time_seconds,
     pm.total_rows,
     pm.total_columns,
-    pm.processed_sheets
+    pm.processed_sheets,
+    CASE
+        WHEN ef.chunk_count IS NOT NULL THEN 'chunked'
+        WHEN ef.storage_path IS NOT NULL THEN 'binary'
+        ELSE 'base64'
+    END as transfer_mode
 FROM process_excel pe
 JOIN excel_files ef ON pe.file_id = ef.id
 LEFT JOIN process_metadata pm ON pe.id = pm.process_id;
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+작업 스레드 → Tk 화면 이벤트 채널
+작업 스레드는 위젯을 직접 건드리지 않고 이벤트(로그, 진행률, 파일 상태, 알림창)를 큐에 넣기만 하고,
+Tk 메인 루프가 after()로 주기적으로 큐를 비우면서 모아서 화면에 반영합니다.
+로그는 한 번에 모아서 삽입하므로 로그가 수천 줄이어도 화면을 줄마다 다시 그리지 않습니다.
+"""
+
+import queue
+
+# 큐를 비우는 주기 (밀리초)
+DRAIN_INTERVAL_MS = 100
+
+# 한 번에 처리하는 최대 이벤트 수 (화면이 멈추지 않도록)
+MAX_BATCH_EVENTS = 1000
+
+class UiEventChannel:
+    def __init__(self, root, handlers, interval_ms=DRAIN_INTERVAL_MS, max_batch=MAX_BATCH_EVENTS):
+        """
+        이벤트 채널
+
+        Args:
+            root: Tk 루트 위젯 (after 예약에 사용)
+            handlers: {이벤트 종류: 처리 함수}
+                      'log' 처리 함수는 한 번에 모은 메시지 목록을 받고,
+                      나머지는 이벤트 내용(dict)을 키워드 인자로 받습니다.
+            interval_ms: 큐를 비우는 주기
+            max_batch: 한 번에 처리하는 최대 이벤트 수
+        """
+        self.root = root
+        self.handlers = handlers
+        self.interval_ms = interval_ms
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._running = False
+
+    def post(self, event, **payload):
+        """이벤트 추가 (어느 스레드에서든 호출 가능)"""
+        self._queue.put((event, payload))
+
+    def start(self):
+        """메인 루프에서 주기적으로 큐 비우기 시작"""
+        if not self._running:
+            self._running = True
+            self.root.after(self.interval_ms, self._drain)
+
+    def stop(self):
+        """큐 비우기 중지 (남은 이벤트는 처리하지 않음)"""
+        self._running = False
+
+    def _take_batch(self):
+        """큐에서 최대 max_batch개 이벤트 꺼내기"""
+        events = []
+        while len(events) < self.max_batch:
+            try:
+                events.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return events
+
+    def _dispatch(self, events):
+        """
+        이벤트 처리
+
+        연속된 로그는 한 번에 넘기고, 진행률은 연속된 것 중 마지막 값만 반영합니다.
+        """
+        pending_logs = []
+        pending_progress = None
+
+        def flush():
+            nonlocal pending_progress
+            if pending_logs:
+                self.handlers['log'](list(pending_logs))
+                pending_logs.clear()
+            if pending_progress is not None:
+                self.handlers['progress'](**pending_progress)
+                pending_progress = None
+
+        for event, payload in events:
+            if event == 'log':
+                pending_logs.append(payload['message'])
+            elif event == 'progress':
+                pending_progress = payload
+            else:
+                flush()
+                handler = self.handlers.get(event)
+                if handler is not None:
+                    handler(**payload)
+
+        flush()
+
+    def _drain(self):
+        """큐에 쌓인 이벤트를 모아서 처리한 뒤 다음 처리 예약"""
+        if not self._running:
+            return
+        try:
+            events = self._take_batch()
+            if events:
+                self._dispatch(events)
+        finally:
+            # 남은 이벤트가 많으면 바로 이어서 처리
+            delay = 1 if not self._queue.empty() else self.interval_ms
+            self.root.after(delay, self._drain)
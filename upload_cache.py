@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+업로드 파일 파싱 캐시
+파일 내용의 SHA-256 해시를 키로 파싱된 데이터프레임과 시트 목록을 보관하여
+같은 파일을 다시 읽을 때 파싱을 건너뜁니다. 메모리 한도를 넘으면 가장 오래 쓰지 않은 항목부터 제거합니다.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+# 기본 메모리 한도 (512MB)
+DEFAULT_CACHE_BYTES = 512 * 1024 * 1024
+
+def content_hash(data):
+    """파일 내용(bytes)의 SHA-256 해시 문자열"""
+    return hashlib.sha256(data).hexdigest()
+
+def upload_hash(uploaded_file):
+    """업로드 파일 객체의 내용 해시 (읽기 위치는 처음으로 되돌림)"""
+    if hasattr(uploaded_file, 'getvalue'):
+        return content_hash(uploaded_file.getvalue())
+
+    uploaded_file.seek(0)
+    data = uploaded_file.read()
+    uploaded_file.seek(0)
+    return content_hash(data)
+
+def estimate_size(value):
+    """캐시 항목의 대략적인 메모리 크기 (바이트)"""
+    if hasattr(value, 'memory_usage'):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, (list, tuple)):
+        return sum(len(str(item)) for item in value) + 64
+    return 64
+
+class ParsedUploadCache:
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES):
+        """
+        파싱 결과 LRU 캐시
+
+        Args:
+            max_bytes: 보관할 항목 크기 합계 한도 (바이트)
+        """
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _evict(self):
+        """한도를 넘는 동안 가장 오래 쓰지 않은 항목 제거"""
+        while self.current_bytes > self.max_bytes and self._entries:
+            _, (_, size) = self._entries.popitem(last=False)
+            self.current_bytes -= size
+            self.evictions += 1
+
+    def get(self, key):
+        """캐시된 값 반환 (없으면 None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        """값 저장 (한도보다 큰 값은 저장하지 않음)"""
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+            self._evict()
+
+    def get_or_load(self, key, loader, store=True):
+        """
+        캐시된 값을 반환하고, 없으면 loader()로 만들어 저장
+
+        Args:
+            key: 캐시 키
+            loader: 캐시에 없을 때 값을 만드는 함수
+            store: False면 캐시에 있는 값만 사용하고 새로 만든 값은 저장하지 않음
+
+        Returns:
+            tuple: (값, 캐시 적중 여부)
+        """
+        value = self.get(key)
+        if value is not None:
+            return value, True
+
+        value = loader()
+        if value is not None and store:
+            self.put(key, value)
+        return value, False
+
+    def get_frame(self, file_hash, sheet_name, mode, loader, store=True):
+        """
+        파싱된 데이터프레임 조회
+
+        반환값은 얕은 복사본이므로 열 추가/교체는 캐시에 영향을 주지 않습니다.
+
+        Args:
+            file_hash: 파일 내용 해시
+            sheet_name: 시트명 (None이면 첫 번째 시트)
+            mode: 읽기 방식 구분 (예: 'excel', 'streaming', 'csv')
+            loader: 캐시에 없을 때 데이터프레임을 읽는 함수
+            store: False면 조회만 하고 새로 읽은 데이터프레임은 보관하지 않음
+
+        Returns:
+            tuple: (데이터프레임, 캐시 적중 여부)
+        """
+        df, cached = self.get_or_load(('frame', file_hash, sheet_name, mode), loader, store=store)
+        return df.copy(deep=False), cached
+
+    def get_sheet_names(self, file_hash, loader):
+        """시트 목록 조회 (캐시에 없으면 loader()로 읽기)"""
+        sheet_names, _ = self.get_or_load(('sheets', file_hash), lambda: list(loader()))
+        return list(sheet_names)
+
+    def clear(self):
+        """모든 항목 제거"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def describe(self):
+        """캐시 상태 요약 문자열"""
+        return (f"캐시 {len(self._entries)}개 항목, {self.current_bytes / (1024 * 1024):.1f}MB / "
+                f"{self.max_bytes / (1024 * 1024):.0f}MB (적중 {self.hits}, 미적중 {self.misses}, "
+                f"제거 {self.evictions})")
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+폴더 감시 자동 통합
+작업 폴더를 주기적으로 확인하다가 엑셀 파일이 추가/변경/삭제되면
+쓰기가 끝나기를 기다렸다가(연속 저장은 한 번으로 묶음) 고급 통합을 증분 모드로 다시 실행합니다.
+이벤트마다 감지부터 통합 완료까지 걸린 시간을 감시 기록 파일에 남깁니다.
+"""
+
+import os
+import csv
+import glob
+import time
+import argparse
+import multiprocessing
+from datetime import datetime
+from excel2 import merge_excel_files_advanced
+from merge_cache import CACHE_DIR_NAME
+
+# 감시 대상 확장자
+WATCH_PATTERNS = ['*.xlsx', '*.xls']
+
+# 고급 통합 결과 파일
+OUTPUT_FILE = '통합파일_고급.xlsx'
+
+# 감시 기록 파일 (캐시 폴더 안)
+EVENT_LOG_NAME = 'watch_events.csv'
+
+EVENT_LOG_FIELDS = ['detected_at', 'files', 'settle_seconds', 'merge_seconds', 'latency_seconds', 'ok', 'skipped']
+
+def is_locked(file_path):
+    """다른 프로그램(엑셀 등)이 파일을 쓰고 있거나 열고 있는지 확인"""
+    try:
+        with open(file_path, 'r+b'):
+            return False
+    except PermissionError:
+        return True
+    except OSError:
+        # 확인하는 사이에 삭제/이동된 파일은 잠김으로 보지 않음
+        return False
+
+class FolderWatcher:
+    def __init__(self, folder_path, interval=2.0, debounce=3.0, workers=1, constant_memory=False, lock_timeout=30.0,
+                 log=print):
+        """
+        폴더 감시 자동 통합기
+
+        Args:
+            folder_path: 감시할 작업 폴더
+            interval: 폴더 확인 주기 (초)
+            debounce: 마지막 변경 후 이 시간 동안 변화가 없어야 통합 시작 (초)
+            workers: 파일별 처리 프로세스 수
+            constant_memory: 결과를 쓰기 전용 모드로 저장할지 여부
+            lock_timeout: 사용 중인 파일을 기다리는 최대 시간 (초, 지나면 그 파일을 빼고 통합)
+            log: 진행 메시지를 출력할 함수
+        """
+        self.folder_path = os.path.abspath(folder_path)
+        self.interval = interval
+        self.debounce = debounce
+        self.workers = workers
+        self.constant_memory = constant_memory
+        self.lock_timeout = lock_timeout
+        self.log = log
+        self.output_path = os.path.join(self.folder_path, OUTPUT_FILE)
+        self.event_log_path = os.path.join(self.folder_path, CACHE_DIR_NAME, EVENT_LOG_NAME)
+        self.events = []
+        self._state = {}
+        self._skipped = []
+
+    def find_class_info_file(self):
+        """수업 정보 파일 (파일명에 '수업정보'가 포함된 xlsx)"""
+        files = glob.glob(os.path.join(self.folder_path, "*수업정보*.xlsx"))
+        return files[0] if files else None
+
+    def snapshot(self):
+        """
+        감시 대상 파일의 크기/수정 시각
+
+        통합 결과 파일과 엑셀 임시 파일(~$)은 제외하고, 수업 정보 파일은 포함합니다.
+
+        Returns:
+            dict: {파일 경로: (크기, 수정 시각)}
+        """
+        state = {}
+        for pattern in WATCH_PATTERNS:
+            for file_path in glob.glob(os.path.join(self.folder_path, pattern)):
+                if os.path.abspath(file_path) == self.output_path:
+                    continue
+                if os.path.basename(file_path).startswith('~$'):
+                    continue
+                try:
+                    stat = os.stat(file_path)
+                except OSError:
+                    continue
+                state[file_path] = (stat.st_size, stat.st_mtime_ns)
+        return state
+
+    def changed_files(self, old_state, new_state):
+        """추가/변경/삭제된 파일 목록"""
+        return sorted(
+            path for path in set(old_state) | set(new_state)
+            if old_state.get(path) != new_state.get(path)
+        )
+
+    def wait_until_settled(self, state):
+        """
+        변경이 멈추고 잠긴 파일이 없을 때까지 대기 (연속된 저장을 한 번의 이벤트로 묶음)
+
+        엑셀에서 열어 둔 파일은 계속 잠겨 있을 수 있으므로 lock_timeout까지만 기다리고,
+        그래도 잠겨 있으면 그 파일을 건너뛴 파일로 돌려줍니다 (통합에서는 사용 중인 파일을 건너뜀).
+
+        Returns:
+            tuple: (안정된 상태, 대기 중 추가로 바뀐 파일 목록, 잠겨 있어 건너뛴 파일 목록)
+        """
+        extra = set()
+        last_change = time.monotonic()
+        locked_since = None
+
+        while True:
+            time.sleep(self.interval)
+            new_state = self.snapshot()
+            changed = self.changed_files(state, new_state)
+            if changed:
+                extra.update(changed)
+                state = new_state
+                last_change = time.monotonic()
+                continue
+
+            if time.monotonic() - last_change < self.debounce:
+                continue
+
+            locked = [path for path in state if is_locked(path)]
+            if locked:
+                # 잠김 대기는 변경으로 보지 않음 (last_change를 되돌리면 잠긴 파일이 있는 동안 영원히 대기)
+                locked_since = locked_since or time.monotonic()
+                if time.monotonic() - locked_since < self.lock_timeout:
+                    self.log(f"⏳ 사용 중인 파일 대기: {', '.join(os.path.basename(path) for path in locked)}")
+                    continue
+
+            return state, sorted(extra), sorted(locked)
+
+    def merge(self):
+        """고급 통합을 증분 모드로 실행"""
+        return merge_excel_files_advanced(
+            self.folder_path,
+            self.find_class_info_file(),
+            output_file=OUTPUT_FILE,
+            workers=self.workers,
+            constant_memory=self.constant_memory,
+            incremental=True
+        )
+
+    def record_event(self, event):
+        """이벤트 기록 (메모리 목록과 감시 기록 CSV)"""
+        self.events.append(event)
+        try:
+            os.makedirs(os.path.dirname(self.event_log_path), exist_ok=True)
+            write_header = not os.path.exists(self.event_log_path)
+            with open(self.event_log_path, 'a', newline='', encoding='utf-8-sig') as f:
+                writer = csv.DictWriter(f, fieldnames=EVENT_LOG_FIELDS)
+                if write_header:
+                    writer.writeheader()
+                writer.writerow(dict(event, files=';'.join(event['files']), skipped=';'.join(event['skipped'])))
+        except OSError as e:
+            self.log(f"⚠️ 감시 기록 저장 실패: {e}")
+
+    def handle_event(self, changed, detected):
+        """
+        변경 이벤트 하나 처리 (쓰기가 끝나기를 기다린 뒤 통합)
+
+        Args:
+            changed: 감지된 변경 파일 목록
+            detected: 감지 시각 (time.monotonic 기준)
+
+        Returns:
+            dict: 이벤트 기록
+        """
+        detected_at = datetime.now().isoformat(timespec='seconds')
+        self.log(f"\n🔔 변경 감지: {', '.join(os.path.basename(path) for path in changed)}")
+
+        self._state, extra, self._skipped = self.wait_until_settled(self._state)
+        files = sorted(set(changed) | set(extra))
+        settled = time.monotonic()
+        if self._skipped:
+            self.log(f"⚠️ {self.lock_timeout:g}초 넘게 사용 중인 파일은 빼고 통합 "
+                     f"(닫으면 다시 통합): {', '.join(os.path.basename(path) for path in self._skipped)}")
+
+        ok = self.merge()
+        done = time.monotonic()
+
+        event = {
+            'detected_at': detected_at,
+            'files': [os.path.basename(path) for path in files],
+            'settle_seconds': round(settled - detected, 3),
+            'merge_seconds': round(done - settled, 3),
+            'latency_seconds': round(done - detected, 3),
+            'ok': ok,
+            'skipped': [os.path.basename(path) for path in self._skipped]
+        }
+        self.record_event(event)
+        status = "✅ 통합 갱신" if ok else "❌ 통합 실패"
+        self.log(f"{status}: 파일 {len(files)}개, 대기 {event['settle_seconds']:.1f}초 + "
+                 f"통합 {event['merge_seconds']:.1f}초 = {event['latency_seconds']:.1f}초")
+        return event
+
+    def run(self, max_events=None):
+        """
+        감시 시작 (시작할 때 한 번 통합한 뒤 변경될 때마다 다시 통합)
+
+        Args:
+            max_events: 이 수만큼 이벤트를 처리하면 종료 (None이면 Ctrl+C까지 계속)
+        """
+        self.log(f"👀 폴더 감시 시작: {self.folder_path} (확인 주기 {self.interval}초, 대기 {self.debounce}초)")
+        self._state = self.snapshot()
+        if self._state:
+            self.handle_event(sorted(self._state), time.monotonic())
+
+        handled = 0
+        try:
+            while max_events is None or handled < max_events:
+                time.sleep(self.interval)
+                new_state = self.snapshot()
+                changed = self.changed_files(self._state, new_state)
+                # 잠겨 있어 빠졌던 파일이 닫히면 내용이 그대로여도 다시 통합
+                released = [path for path in self._skipped if path in new_state and not is_locked(path)]
+                changed = sorted(set(changed) | set(released))
+                if not changed:
+                    continue
+
+                detected = time.monotonic()
+                self._state = new_state
+                self.handle_event(changed, detected)
+                handled += 1
+        except KeyboardInterrupt:
+            self.log("\n🛑 폴더 감시 종료")
+
+        return self.events
+
+def parse_args():
+    """명령행 인자 처리"""
+    parser = argparse.ArgumentParser(description="폴더 감시 자동 통합 (고급 통합을 증분 모드로 반복 실행)")
+    parser.add_argument("folder", nargs="?", default=os.path.dirname(os.path.abspath(__file__)),
+                        help="감시할 작업 폴더 (기본값: 스크립트가 있는 폴더)")
+    parser.add_argument("--interval", type=float, default=2.0,
+                        help="폴더 확인 주기 (초, 기본값: 2)")
+    parser.add_argument("--debounce", type=float, default=3.0,
+                        help="마지막 변경 후 이 시간 동안 변화가 없으면 통합 시작 (초, 기본값: 3)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="파일별 처리에 사용할 프로세스 수 (기본값: 1)")
+    parser.add_argument("--lock-timeout", type=float, default=30.0,
+                        help="사용 중인 파일을 기다리는 최대 시간 (초, 지나면 그 파일을 빼고 통합, 기본값: 30)")
+    parser.add_argument("--constant-memory", action="store_true",
+                        help="결과 파일을 쓰기 전용 모드로 저장")
+    return parser.parse_args()
+
+def main():
+    """메인 실행 함수"""
+    args = parse_args()
+    print("=" * 70)
+    print("🚀 폴더 감시 자동 통합기")
+    print("📧 제작자: charmleader@gmail.com")
+    print("⏰ 실행 시간:", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+    print("💡 Ctrl+C로 종료합니다")
+    print("=" * 70)
+
+    watcher = FolderWatcher(args.folder, interval=args.interval, debounce=args.debounce,
+                            workers=args.workers, constant_memory=args.constant_memory,
+                            lock_timeout=args.lock_timeout)
+    events = watcher.run()
+
+    if events:
+        latencies = [event['latency_seconds'] for event in events]
+        print(f"📊 처리한 이벤트: {len(events)}개, 평균 지연 {sum(latencies) / len(latencies):.1f}초")
+
+if __name__ == "__main__":
+    # 실행파일(PyInstaller)에서 병렬 처리 프로세스를 띄우기 위해 필요
+    multiprocessing.freeze_support()
+    main()
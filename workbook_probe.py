@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+워크북 메타데이터 조회
+셀 데이터를 읽지 않고 시트 목록, 범위(dimension), 대략적인 행 수만 빠르게 확인합니다.
+xlsx는 zip 안의 workbook.xml과 각 시트 XML의 앞부분만 읽고, xls는 xlrd on_demand 모드로 시트 목록만 읽습니다.
+파일 앞부분의 시그니처로 실제 형식(zip/OLE2/HTML/CSV)을 판별하여 확장자와 다른 파일도 구분합니다.
+"""
+
+import io
+import re
+import time
+import zipfile
+import posixpath
+import xml.etree.ElementTree as ET
+
+# OLE2 복합 문서 시그니처 (구형 .xls)
+OLE2_SIGNATURE = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+
+# zip 시그니처 (xlsx)
+ZIP_SIGNATURE = b'PK\x03\x04'
+
+# 형식 판별에 사용하는 앞부분 바이트 수
+SNIFF_BYTES = 2048
+
+# HTML 표를 .xls로 저장한 파일에서 보이는 태그
+_HTML_MARKERS = (b'<!doctype html', b'<html', b'<table', b'<meta', b'<head')
+
+# 통합 문서가 아닌 형식(HTML/CSV)에 붙이는 시트명
+SINGLE_SHEET_NAME = 'Sheet1'
+
+# 시트 XML에서 범위를 찾을 때 읽는 최대 바이트 (범위는 sheetData보다 앞에 있음)
+DIMENSION_SCAN_BYTES = 64 * 1024
+
+_DIMENSION_PATTERN = re.compile(rb'<(?:\w+:)?dimension\b[^>]*\bref="([^"]+)"')
+_SHEET_DATA_PATTERN = re.compile(rb'<(?:\w+:)?sheetData\b')
+_CELL_PATTERN = re.compile(r'^\$?([A-Za-z]+)\$?(\d+)$')
+
+_REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+_PKG_REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+
+def _local_name(tag):
+    """네임스페이스를 뺀 태그 이름"""
+    return tag.rsplit('}', 1)[-1]
+
+def _column_index(letters):
+    """열 문자(A, B, ..., AA)를 1부터 시작하는 번호로 변환"""
+    index = 0
+    for letter in letters.upper():
+        index = index * 26 + (ord(letter) - ord('A') + 1)
+    return index
+
+def parse_dimension(ref):
+    """
+    범위 문자열(예: 'A1:K1000')을 행/열 수로 변환
+
+    Returns:
+        tuple: (행 수, 열 수), 해석할 수 없으면 (None, None)
+    """
+    if not ref:
+        return None, None
+
+    parts = ref.split(':')
+    first = _CELL_PATTERN.match(parts[0])
+    last = _CELL_PATTERN.match(parts[-1])
+    if not first or not last:
+        return None, None
+
+    rows = int(last.group(2)) - int(first.group(2)) + 1
+    columns = _column_index(last.group(1)) - _column_index(first.group(1)) + 1
+    return rows, columns
+
+def _read_source_head(source, size=8):
+    """파일 앞부분 바이트 (파일 객체는 읽기 위치를 되돌림)"""
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source[:size])
+    if hasattr(source, 'read'):
+        position = source.tell()
+        head = source.read(size)
+        source.seek(position)
+        return head
+    with open(source, 'rb') as f:
+        return f.read(size)
+
+def sniff_format(source):
+    """
+    파일 앞부분 바이트로 실제 형식 판별 (확장자는 보지 않음)
+
+    Args:
+        source: 파일 경로, 파일 객체 또는 bytes
+
+    Returns:
+        str: 'xlsx', 'xls', 'html', 'csv' 또는 'unknown'
+    """
+    head = _read_source_head(source, SNIFF_BYTES)
+
+    if head.startswith(OLE2_SIGNATURE):
+        return 'xls'
+    if head.startswith(ZIP_SIGNATURE):
+        return 'xlsx'
+    if not head:
+        return 'unknown'
+
+    # BOM과 앞쪽 공백을 제외하고 HTML 태그 확인 (HTML 표를 .xls로 저장한 파일)
+    text = head.lstrip(b'\xef\xbb\xbf').lstrip().lower()
+    if text.startswith(_HTML_MARKERS) or b'<table' in text:
+        return 'html'
+
+    # 널 바이트가 없는 텍스트는 CSV로 간주
+    if b'\x00' not in head:
+        return 'csv'
+    return 'unknown'
+
+def _as_zip_source(source):
+    """zipfile이 열 수 있는 형태로 변환"""
+    if isinstance(source, (bytes, bytearray)):
+        return io.BytesIO(source)
+    return source
+
+def _resolve_target(target):
+    """workbook.xml.rels의 대상 경로를 zip 내부 경로로 변환"""
+    if target.startswith('/'):
+        return target.lstrip('/')
+    return posixpath.normpath(posixpath.join('xl', target))
+
+def _scan_dimension(zf, part_name):
+    """시트 XML 앞부분에서 dimension ref 찾기 (sheetData를 만나면 중단)"""
+    try:
+        with zf.open(part_name) as f:
+            buffer = b''
+            while len(buffer) < DIMENSION_SCAN_BYTES:
+                chunk = f.read(4096)
+                if not chunk:
+                    break
+                buffer += chunk
+                match = _DIMENSION_PATTERN.search(buffer)
+                if match:
+                    return match.group(1).decode('ascii', 'ignore')
+                if _SHEET_DATA_PATTERN.search(buffer):
+                    break
+    except KeyError:
+        pass
+    return None
+
+def _probe_xlsx(source):
+    """xlsx zip 매니페스트에서 시트 정보 읽기"""
+    sheets = []
+    with zipfile.ZipFile(_as_zip_source(source)) as zf:
+        workbook = ET.fromstring(zf.read('xl/workbook.xml'))
+
+        targets = {}
+        try:
+            rels = ET.fromstring(zf.read('xl/_rels/workbook.xml.rels'))
+            for rel in rels.iter(f'{{{_PKG_REL_NS}}}Relationship'):
+                targets[rel.get('Id')] = _resolve_target(rel.get('Target', ''))
+        except KeyError:
+            pass
+
+        for element in workbook.iter():
+            if _local_name(element.tag) != 'sheet':
+                continue
+
+            part_name = targets.get(element.get(f'{{{_REL_NS}}}id'))
+            dimension = _scan_dimension(zf, part_name) if part_name else None
+            rows, columns = parse_dimension(dimension)
+
+            sheets.append({
+                'name': element.get('name'),
+                'state': element.get('state', 'visible'),
+                'dimension': dimension,
+                'rows': rows,
+                'columns': columns
+            })
+
+    return sheets
+
+def _probe_xls(source):
+    """xlrd on_demand 모드로 구형 xls 시트 목록 읽기 (시트 내용은 읽지 않음)"""
+    import xlrd
+
+    if isinstance(source, (bytes, bytearray)):
+        book = xlrd.open_workbook(file_contents=bytes(source), on_demand=True)
+    elif hasattr(source, 'read'):
+        position = source.tell()
+        source.seek(0)
+        book = xlrd.open_workbook(file_contents=source.read(), on_demand=True)
+        source.seek(position)
+    else:
+        book = xlrd.open_workbook(source, on_demand=True)
+
+    try:
+        return [
+            {'name': name, 'state': 'visible', 'dimension': None, 'rows': None, 'columns': None}
+            for name in book.sheet_names()
+        ]
+    finally:
+        book.release_resources()
+
+def probe_workbook(source):
+    """
+    워크북 메타데이터 조회
+
+    Args:
+        source: 파일 경로, 파일 객체 또는 bytes
+
+    Returns:
+        dict: format('xlsx'/'xls'/'html'/'csv'), sheets(시트별 name/state/dimension/rows/columns),
+              probe_seconds
+    """
+    start = time.perf_counter()
+    file_format = sniff_format(source)
+
+    if file_format == 'xls':
+        sheets = _probe_xls(source)
+    elif file_format == 'xlsx':
+        sheets = _probe_xlsx(source)
+    elif file_format in ('html', 'csv'):
+        # 시트 구분이 없는 형식은 시트 하나로 취급
+        sheets = [{'name': SINGLE_SHEET_NAME, 'state': 'visible', 'dimension': None, 'rows': None, 'columns': None}]
+    else:
+        raise ValueError("지원하지 않는 파일 형식입니다 (xlsx/xls/HTML/CSV 아님)")
+
+    return {
+        'format': file_format,
+        'sheets': sheets,
+        'probe_seconds': time.perf_counter() - start
+    }
+
+def list_sheet_names(source):
+    """워크북을 로드하지 않고 시트 이름 목록 반환"""
+    return [sheet['name'] for sheet in probe_workbook(source)['sheets']]
+
+def describe_probe(probe):
+    """조회 결과 요약 문자열 (예: '시트 3개, 약 1,200행')"""
+    sheets = probe['sheets']
+    rows = [sheet['rows'] for sheet in sheets if sheet['rows']]
+    summary = f"시트 {len(sheets)}개"
+    if rows:
+        summary += f", 약 {sum(rows):,}행"
+    return summary
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+워크북 리더
+엑셀 파일을 한 번만 파싱하여 모든 시트의 데이터프레임을 제공합니다.
+대용량 xlsx 파일은 읽기 전용 워크시트로 일정 크기의 청크 단위 스트리밍 읽기를 지원합니다.
+엔진을 차례로 시도하지 않고 파일 형식을 먼저 판별하여 맞는 엔진으로 바로 읽습니다.
+"""
+
+import os
+import time
+import pandas as pd
+import openpyxl
+from workbook_probe import sniff_format, SINGLE_SHEET_NAME
+from csv_reader import read_csv_file
+
+# 스트리밍 읽기 시 한 번에 메모리에 올리는 최대 행 수
+DEFAULT_CHUNK_ROWS = 10000
+
+# 이 크기 이상인 xlsx 파일은 자동으로 스트리밍 읽기 사용 (바이트)
+STREAMING_THRESHOLD_BYTES = 50 * 1024 * 1024
+
+# 형식별 pandas 엑셀 엔진
+FORMAT_ENGINES = {'xlsx': 'openpyxl', 'xls': 'xlrd'}
+
+def _rewind(source):
+    """파일 객체면 읽기 위치를 처음으로"""
+    if hasattr(source, 'seek'):
+        source.seek(0)
+
+def record_read(df, file_format, engine, seconds):
+    """읽기 형식/엔진/소요 시간을 데이터프레임 attrs에 기록"""
+    df.attrs['file_format'] = file_format
+    df.attrs['read_engine'] = engine
+    df.attrs['read_seconds'] = seconds
+    return df
+
+def describe_read(df):
+    """읽기 기록 요약 문자열 (예: 'xlsx/openpyxl 0.12초')"""
+    engine = df.attrs.get('read_engine')
+    if engine is None:
+        return "알 수 없음"
+    return f"{df.attrs.get('file_format')}/{engine} {df.attrs.get('read_seconds', 0):.2f}초"
+
+def _read_html_tables(source, header=0):
+    """HTML 표로 저장된 '가짜 xls' 파일의 표 목록 읽기 (lxml 또는 bs4+html5lib 필요)"""
+    _rewind(source)
+    try:
+        return pd.read_html(source, header=header)
+    except ImportError as e:
+        raise Exception(f"HTML 형식 파일을 읽으려면 lxml 패키지가 필요합니다: {e}")
+
+def read_sheet_auto(source, sheet_name=None, header=0, file_format=None):
+    """
+    파일 형식을 판별하여 맞는 엔진으로 시트 하나 읽기
+    
+    엔진을 차례로 시도하지 않으므로 파일을 한 번만 파싱합니다.
+    (xlsx는 스타일 정보 오류로 실패한 경우에만 읽기 전용 스트리밍으로 한 번 더 읽음)
+    읽은 형식, 엔진, 소요 시간은 df.attrs에 기록됩니다.
+    
+    Args:
+        source: 파일 경로 또는 파일 객체
+        sheet_name: 읽을 시트명 (None이면 첫 번째 시트, HTML/CSV는 무시)
+        header: 헤더로 사용할 행 번호 (None이면 헤더 없이 읽기)
+        file_format: 이미 판별한 형식 (None이면 판별)
+    
+    Returns:
+        DataFrame: 읽은 데이터 (attrs: file_format, read_engine, read_seconds)
+    """
+    file_format = file_format or sniff_format(source)
+    start = time.perf_counter()
+    
+    if file_format in FORMAT_ENGINES:
+        engine = FORMAT_ENGINES[file_format]
+        _rewind(source)
+        try:
+            df = pd.read_excel(source, sheet_name=sheet_name or 0, header=header, engine=engine)
+        except Exception as e:
+            if file_format != 'xlsx':
+                raise
+            # 스타일 정보 오류 등: 스타일을 읽지 않는 읽기 전용 모드로 재시도
+            engine = 'openpyxl-readonly'
+            try:
+                df = read_sheet_streaming(source, sheet_name, header=header is not None)
+            except Exception as e2:
+                raise Exception(f"xlsx 읽기 실패: openpyxl({e}), 읽기 전용({e2})")
+    elif file_format == 'html':
+        engine = 'html'
+        df = _read_html_tables(source, header)[0]
+    elif file_format == 'csv':
+        # 인코딩 판별 후 pyarrow 엔진(멀티스레드)으로 읽기
+        df, encoding, csv_engine = read_csv_file(source, header=header)
+        engine = f"{csv_engine}({encoding})"
+    else:
+        raise Exception("지원하지 않는 파일 형식입니다 (xlsx/xls/HTML/CSV 아님)")
+    
+    return record_read(df, file_format, engine, time.perf_counter() - start)
+
+class WorkbookReader:
+    def __init__(self, file_path, header=0, engine=None):
+        """
+        워크북 리더 초기화
+
+        Args:
+            file_path: 읽을 엑셀 파일 경로
+            header: 헤더로 사용할 행 번호 (None이면 헤더 없이 읽기)
+            engine: pandas 엑셀 엔진 (None이면 자동 선택)
+        """
+        self.file_path = file_path
+        self.header = header
+        self.engine = engine
+        self.sheets = {}
+        self.parse_seconds = None
+        self.file_format = None
+        self.engine_used = None
+
+    @property
+    def filename(self):
+        """파일명"""
+        return os.path.basename(self.file_path)
+
+    @property
+    def sheet_names(self):
+        """시트명 목록 (원본 순서 유지)"""
+        return list(self.sheets.keys())
+
+    def load(self):
+        """
+        워크북을 한 번만 열어서 모든 시트를 파싱
+
+        Returns:
+            WorkbookReader: 자기 자신 (체이닝용)
+        """
+        self.file_format = sniff_format(self.file_path)
+        start = time.perf_counter()
+        
+        if self.file_format in ('html', 'csv') and self.engine is None:
+            # 시트 구분이 없는 형식은 시트 하나로 읽기
+            df = read_sheet_auto(self.file_path, header=self.header, file_format=self.file_format)
+            self.sheets = {SINGLE_SHEET_NAME: df}
+            self.engine_used = df.attrs['read_engine']
+        else:
+            self.engine_used = self.engine or FORMAT_ENGINES.get(self.file_format)
+            # sheet_name=None: 파일을 한 번 열고 모든 시트를 한꺼번에 읽음
+            self.sheets = pd.read_excel(
+                self.file_path,
+                sheet_name=None,
+                header=self.header,
+                engine=self.engine_used
+            )
+        
+        self.parse_seconds = time.perf_counter() - start
+        for df in self.sheets.values():
+            record_read(df, self.file_format, self.engine_used, self.parse_seconds)
+        return self
+
+    def get_sheet(self, sheet_name):
+        """파싱된 시트 데이터프레임 반환"""
+        return self.sheets[sheet_name]
+
+    def iter_sheets(self):
+        """(시트명, 데이터프레임) 순회"""
+        for sheet_name, df in self.sheets.items():
+            yield sheet_name, df
+
+    def describe(self):
+        """파싱 결과 요약 문자열"""
+        if self.parse_seconds is None:
+            return f"{self.filename}: 아직 읽지 않음"
+        return (f"{self.filename}: {len(self.sheets)}개 시트, "
+                f"{self.file_format}/{self.engine_used} 파싱 {self.parse_seconds:.2f}초")
+
+def read_workbook(file_path, header=0, engine=None):
+    """
+    엑셀 파일을 한 번만 파싱하여 워크북 리더 반환
+
+    Args:
+        file_path: 읽을 엑셀 파일 경로
+        header: 헤더로 사용할 행 번호 (None이면 헤더 없이 읽기)
+        engine: pandas 엑셀 엔진
+
+    Returns:
+        WorkbookReader: 모든 시트가 로드된 리더
+    """
+    return WorkbookReader(file_path, header=header, engine=engine).load()
+
+def _rows_to_frame(rows, columns):
+    """행 튜플 목록을 데이터프레임으로 변환 (열 개수 맞춤)"""
+    if columns is None:
+        return pd.DataFrame(rows)
+    
+    width = len(columns)
+    # 읽기 전용 모드에서는 행마다 길이가 다를 수 있으므로 헤더 길이에 맞춤
+    fitted = [tuple(row[:width]) + (None,) * (width - len(row)) for row in rows]
+    return pd.DataFrame(fitted, columns=columns)
+
+def iter_sheet_chunks(source, sheet_name=None, chunk_size=DEFAULT_CHUNK_ROWS, header=True):
+    """
+    읽기 전용 워크시트로 시트를 청크 단위 스트리밍 읽기
+    
+    워크북 전체를 메모리에 올리지 않으므로 파일 크기와 관계없이
+    최대 메모리 사용량이 chunk_size 행 정도로 유지됩니다.
+    
+    Args:
+        source: 파일 경로 또는 파일 객체 (xlsx)
+        sheet_name: 읽을 시트명 (None이면 첫 번째 시트)
+        chunk_size: 청크당 최대 행 수
+        header: 첫 번째 행을 헤더로 사용할지 여부
+        
+    Yields:
+        DataFrame: 최대 chunk_size 행의 데이터프레임
+    """
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    
+    wb = openpyxl.load_workbook(source, read_only=True, data_only=True)
+    try:
+        if sheet_name and sheet_name in wb.sheetnames:
+            ws = wb[sheet_name]
+        else:
+            ws = wb.worksheets[0]
+        
+        # 시트 크기 정보가 없는 파일은 실제 행을 끝까지 읽도록 초기화
+        if ws.max_row is None or ws.max_column is None:
+            ws.reset_dimensions()
+        rows = ws.iter_rows(values_only=True)
+        
+        columns = None
+        if header:
+            first_row = next(rows, None)
+            if first_row is None:
+                return
+            columns = list(first_row)
+        
+        buffer = []
+        for row in rows:
+            buffer.append(row)
+            if len(buffer) >= chunk_size:
+                yield _rows_to_frame(buffer, columns)
+                buffer = []
+        
+        if buffer:
+            yield _rows_to_frame(buffer, columns)
+        elif columns is not None:
+            # 헤더만 있는 시트도 열 정보는 유지
+            yield pd.DataFrame(columns=columns)
+    finally:
+        wb.close()
+        if hasattr(source, 'seek'):
+            source.seek(0)
+
+def read_sheet_streaming(source, sheet_name=None, chunk_size=DEFAULT_CHUNK_ROWS, header=True):
+    """
+    스트리밍 방식으로 시트 전체를 읽어 데이터프레임 반환
+    
+    openpyxl 셀 객체를 전부 메모리에 올리는 대신 청크별 데이터프레임만 유지합니다.
+    """
+    chunks = list(iter_sheet_chunks(source, sheet_name, chunk_size, header))
+    if not chunks:
+        raise Exception("빈 워크시트")
+    
+    if len(chunks) == 1:
+        return chunks[0]
+    return pd.concat(chunks, ignore_index=True)
+
+def should_stream(file_size):
+    """파일 크기 기준 스트리밍 읽기 사용 여부"""
+    return file_size is not None and file_size >= STREAMING_THRESHOLD_BYTES
@@ -7,6 +7,13 @@ from datetime import datetime
 import shutil
 import stat
 import sys
+from workbook_reader import read_workbook, read_sheet_auto, describe_read
+from excel_output import StyledExcelWriter
+from workbook_probe import list_sheet_names, sniff_format
+from merge_cache import IncrementalMergeCache
+
+# 증분 통합 캐시에서 스마트 통합 결과를 구분하는 키
+SMART_STAGE_KEY = 'smart:workbook'
 
 def check_file_permissions(file_path):
     """파일 권한 확인"""
@@ -75,88 +82,14 @@ def safe_read_excel(file_path, sheet_name=None):
                 print(f"  ❌ 권한 수정 실패: {fix_msg}")
                 return None
         
-        # 2단계: Excel 파일 읽기 시도 (스타일 오류 방지)
+        # 2단계: 형식을 판별하여 맞는 엔진으로 한 번만 읽기
         try:
-            # openpyxl 엔진으로 읽기 (스타일 무시)
-            if sheet_name:
-                return pd.read_excel(file_path, sheet_name=sheet_name, engine='openpyxl')
-            else:
-                return pd.read_excel(file_path, engine='openpyxl')
-        except Exception as e1:
-            print(f"  ⚠️ openpyxl 오류: {e1}")
-            try:
-                # xlrd 엔진으로 재시도
-                if sheet_name:
-                    return pd.read_excel(file_path, sheet_name=sheet_name, engine='xlrd')
-                else:
-                    return pd.read_excel(file_path, engine='xlrd')
-            except Exception as e2:
-                print(f"  ⚠️ xlrd 오류: {e2}")
-                try:
-                    # 기본 엔진으로 재시도
-                    if sheet_name:
-                        return pd.read_excel(file_path, sheet_name=sheet_name, engine=None)
-                    else:
-                        return pd.read_excel(file_path, engine=None)
-                except Exception as e3:
-                    print(f"  ⚠️ 기본 엔진 오류: {e3}")
-                    # 수동으로 openpyxl로 읽기 (스타일 완전 무시)
-                    try:
-                        import openpyxl
-                        from io import BytesIO
-                        
-                        # 파일을 메모리로 읽기
-                        with open(file_path, 'rb') as f:
-                            file_bytes = f.read()
-                        
-                        # openpyxl로 워크북 열기 (스타일 무시)
-                        wb = openpyxl.load_workbook(BytesIO(file_bytes), data_only=True)
-                        
-                        if sheet_name and sheet_name in wb.sheetnames:
-                            ws = wb[sheet_name]
-                        else:
-                            ws = wb.active
-                        
-                        # 워크시트를 데이터프레임으로 변환
-                        data = []
-                        for row in ws.iter_rows(values_only=True):
-                            data.append(row)
-                        
-                        if data:
-                            # 첫 번째 행을 헤더로 사용
-                            if len(data) > 1:
-                                df = pd.DataFrame(data[1:], columns=data[0])
-                            else:
-                                df = pd.DataFrame(data)
-                            return df
-                        else:
-                            raise Exception("빈 워크시트")
-                    
-                    except Exception as e4:
-                        print(f"  ❌ 수동 읽기 실패: {e4}")
-                        # 마지막 시도: 파일을 복사해서 읽기
-                        try:
-                            import tempfile
-                            import shutil
-                            
-                            # 임시 파일로 복사
-                            with tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False) as temp_file:
-                                shutil.copy2(file_path, temp_file.name)
-                                temp_path = temp_file.name
-                            
-                            # 복사된 파일로 읽기
-                            if sheet_name:
-                                df = pd.read_excel(temp_path, sheet_name=sheet_name, engine='openpyxl')
-                            else:
-                                df = pd.read_excel(temp_path, engine='openpyxl')
-                            
-                            # 임시 파일 삭제
-                            os.unlink(temp_path)
-                            return df
-                            
-                        except Exception as e5:
-                            print(f"  ❌ 모든 읽기 방법 실패: {e5}")
-                            return None
+            df = read_sheet_auto(file_path, sheet_name)
+            print(f"  📖 {sheet_name or '첫 시트'}: {describe_read(df)}")
+            return df
+        except Exception as e:
+            print(f"  ❌ 읽기 실패 ({sniff_format(file_path)} 형식): {e}")
+            return None
     
     except Exception as e:
         print(f"  ❌ 파일 읽기 중 심각한 오류: {e}")
@@ -259,9 +192,28 @@ def clean_sheet_name(name):
     
     return cleaned
 
-def merge_excel_files_smart(folder_path, output_file='통합파일.xlsx'):
+def read_workbook_cached(file_path, cache=None):
+    """
+    워크북 파싱 (증분 통합 캐시가 있으면 바뀌지 않은 파일은 이전 파싱 결과 재사용)
+    
+    Returns:
+        tuple: (WorkbookReader, 캐시 재사용 여부)
+    """
+    if cache is not None:
+        reader = cache.get(file_path, SMART_STAGE_KEY)
+        if reader is not None:
+            return reader, True
+    
+    reader = read_workbook(file_path)
+    if cache is not None:
+        cache.put(file_path, SMART_STAGE_KEY, reader)
+    return reader, False
+
+def merge_excel_files_smart(folder_path, output_file='통합파일.xlsx', constant_memory=False, incremental=False):
     """
     폴더의 모든 엑셀 파일을 스마트하게 통합 (버전 관리 포함)
+    constant_memory면 결과를 쓰기 전용 모드로 저장 (메모리 사용량 일정)
+    incremental이면 바뀌지 않은 파일은 이전 파싱 결과를 재사용하고 결과 파일만 다시 생성
     """
     try:
         # 엑셀 파일들 찾기
@@ -299,8 +251,13 @@ def merge_excel_files_smart(folder_path, output_file='통합파일.xlsx'):
         # 최소 하나의 시트가 있는지 확인할 변수
         valid_sheets_found = False
         
+        if constant_memory:
+            print("💾 저메모리 저장 모드 (쓰기 전용)")
+        
+        cache = IncrementalMergeCache(folder_path) if incremental else None
+        
         # 엑셀 writer 객체 생성
-        with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
+        with StyledExcelWriter(output_path, constant_memory=constant_memory) as writer:
             processed_files = 0
             processed_sheets = 0
             
@@ -327,25 +284,24 @@ def merge_excel_files_smart(folder_path, output_file='통합파일.xlsx'):
                                 print(f"  ❌ 권한 수정 실패: {fix_msg}")
                                 continue
                         
-                        # 안전한 방법으로 시트 목록 가져오기
+                        # 워크북을 한 번만 파싱하여 모든 시트 가져오기
+                        reader = None
                         try:
-                            import openpyxl
-                            from io import BytesIO
-                            
-                            # 파일을 메모리로 읽기
-                            with open(file_path, 'rb') as f:
-                                file_bytes = f.read()
-                            
-                            # openpyxl로 워크북 열기 (스타일 무시)
-                            wb = openpyxl.load_workbook(BytesIO(file_bytes), data_only=True)
-                            sheet_names = wb.sheetnames
+                            reader, cached = read_workbook_cached(file_path, cache)
+                            sheet_names = reader.sheet_names
+                            if cached:
+                                print(f"  ♻️ 변경 없음, 이전 파싱 결과 사용: {len(sheet_names)}개 시트")
+                            else:
+                                print(f"  ⏱️ 파싱 완료: {len(sheet_names)}개 시트, "
+                                      f"{reader.file_format}/{reader.engine_used} {reader.parse_seconds:.2f}초")
                             
                         except Exception as e:
-                            print(f"  ⚠️ 시트 목록 읽기 오류: {e}")
-                            # 대안: pandas로 시트 목록 가져오기
+                            print(f"  ⚠️ 일괄 읽기 오류, 시트별 읽기로 전환: {e}")
+                            # 대안: 시트 목록만 가져와서 시트별로 안전하게 읽기
                             try:
-                                excel_data = pd.ExcelFile(file_path)
-                                sheet_names = excel_data.sheet_names
+                                # 워크북 매니페스트에서 시트 목록만 가져오기
+                                sheet_names = list_sheet_names(file_path)
+                                
                             except Exception as e2:
                                 print(f"  ❌ 시트 목록 읽기 실패: {e2}")
                                 continue
@@ -356,8 +312,11 @@ def merge_excel_files_smart(folder_path, output_file='통합파일.xlsx'):
                     
                     for sheet_name in sheet_names:
                         try:
-                            # 안전한 시트 읽기
-                            df = safe_read_excel(file_path, sheet_name)
+                            # 파싱된 시트 사용 (일괄 읽기 실패 시 안전한 시트 읽기)
+                            if reader is not None:
+                                df = reader.get_sheet(sheet_name)
+                            else:
+                                df = safe_read_excel(file_path, sheet_name)
                             if df is None:
                                 print(f"  ❌ 시트 읽기 실패: {sheet_name}")
                                 continue
@@ -393,12 +352,12 @@ def merge_excel_files_smart(folder_path, output_file='통합파일.xlsx'):
                             # 시트명 중복 방지
                             original_name = new_sheet_name
                             counter = 1
-                            while new_sheet_name in writer.sheets:
+                            while new_sheet_name in writer.sheet_names:
                                 new_sheet_name = f"{original_name}_{counter}"
                                 counter += 1
                             
                             # 엑셀 시트로 저장
-                            df.to_excel(writer, sheet_name=new_sheet_name, index=False)
+                            writer.add_sheet(new_sheet_name, df)
                             
                             print(f"  ✅ {sheet_name} → {new_sheet_name} ({len(df):,}행 {len(df.columns)}열)")
                             processed_sheets += 1
@@ -412,6 +371,10 @@ def merge_excel_files_smart(folder_path, output_file='통합파일.xlsx'):
                 except Exception as e:
                     print(f"  ❌ 파일 처리 오류: {filename} - {e}")
         
+        if cache is not None:
+            cache.save()
+            print(f"\n♻️ 증분 통합: {cache.describe()}")
+        
         print("\n" + "-" * 60)
         if processed_sheets > 0 and valid_sheets_found:
             print(f"✅ 통합 완료!")
@@ -443,6 +406,12 @@ def main():
         print("⏰ 실행 시간:", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
         print("=" * 70)
         
+        # 저메모리 저장 모드 (명령줄 옵션 --constant-memory)
+        constant_memory = '--constant-memory' in sys.argv[1:]
+        
+        # 증분 통합 (명령줄 옵션 --incremental, 바뀐 파일만 다시 파싱)
+        incremental = '--incremental' in sys.argv[1:]
+        
         # 현재 스크립트가 있는 폴더
         current_dir = os.path.dirname(os.path.abspath(__file__))
         print(f"📁 작업 폴더: {current_dir}")
@@ -473,7 +442,8 @@ def main():
             print(f"\n🎯 작업 시작! 엑셀 파일 {len(excel_files)}개 발견")
             
             # 파일 통합 실행
-            success = merge_excel_files_smart(current_dir, output_file)
+            success = merge_excel_files_smart(current_dir, output_file, constant_memory=constant_memory,
+                                              incremental=incremental)
             
             if success:
                 print(f"\n🎉 작업 완료!")